@@ -0,0 +1,49 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# lib 모듈은 서로를 평면(flat) 임포트하므로 lib 디렉터리를 경로에 추가합니다.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib"))
+
+from account_management import AccountManager, MIN_BCRYPT_ROUNDS, DEFAULT_BCRYPT_ROUNDS
+from storage import close_all_connections
+
+def measure(rounds, repeat):
+    """주어진 작업 비용으로 계정을 만든 뒤 로그인 시간을 repeat번 측정하여 초 단위 목록으로 반환합니다."""
+    manager = AccountManager(f"users_{rounds}.db", bcrypt_rounds=rounds)
+    manager.create_user("bench", "벤치마크", "password", "서울")
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        if manager.login("bench", "password") is None:
+            raise RuntimeError("벤치마크 계정 로그인에 실패했습니다.")
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="bcrypt 작업 비용별 로그인 지연 시간 측정")
+    parser.add_argument("--min-rounds", type=int, default=10, help=f"측정할 최소 작업 비용 (최소 {MIN_BCRYPT_ROUNDS})")
+    parser.add_argument("--max-rounds", type=int, default=14, help="측정할 최대 작업 비용")
+    parser.add_argument("--repeat", type=int, default=5, help="비용별 로그인 반복 횟수")
+    args = parser.parse_args()
+    if args.min_rounds < MIN_BCRYPT_ROUNDS or args.min_rounds > args.max_rounds:
+        parser.error("작업 비용 범위가 올바르지 않습니다.")
+
+    print(f"{'rounds':>6} {'median(ms)':>11} {'max(ms)':>9} {'logins/s':>9}")
+    with tempfile.TemporaryDirectory() as workdir:
+        # AccountManager는 현재 폴더에 메일함/설정 파일을 만들므로 임시 폴더로 이동해서 측정합니다. (run.py와 같은 방식)
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            for rounds in range(args.min_rounds, args.max_rounds + 1):
+                latencies = measure(rounds, args.repeat)
+                median = statistics.median(latencies)
+                marker = " (기본값)" if rounds == DEFAULT_BCRYPT_ROUNDS else ""
+                print(f"{rounds:>6} {median * 1000:>11.1f} {max(latencies) * 1000:>9.1f} {1 / median:>9.1f}{marker}")
+        finally:
+            close_all_connections()
+            os.chdir(cwd)
+    print("선택한 값은 auth_config.json의 bcrypt_rounds에 저장하세요. (다음 로그인 시 기존 해시가 자동으로 갱신됩니다)")
@@ -0,0 +1,40 @@
+import argparse
+import sys
+
+from harness import load_results
+
+def main():
+    parser = argparse.ArgumentParser(description="두 벤치마크 결과 파일의 p50/p95/p99를 비교합니다.")
+    parser.add_argument("baseline", help="기준 결과 파일 (이전 커밋)")
+    parser.add_argument("candidate", help="비교할 결과 파일 (새 커밋)")
+    parser.add_argument("--threshold", type=float, default=10.0, help="회귀로 표시할 p50 증가율(%%) (기본값: 10)")
+    args = parser.parse_args()
+
+    base_info, base = load_results(args.baseline)
+    cand_info, cand = load_results(args.candidate)
+    if base_info["options"].get("seed") != cand_info["options"].get("seed") or \
+            base_info["options"].get("scale") != cand_info["options"].get("scale"):
+        print("주의: 두 결과의 시드 또는 데이터 규모가 다릅니다.")
+    print(f"{base_info['commit']} -> {cand_info['commit']}")
+    print(f"{'benchmark':<72} {'p50':>16} {'p95':>16} {'p99':>16}")
+
+    regressions = 0
+    for key in sorted(set(base) & set(cand)):
+        cells = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            before, after = base[key][metric], cand[key][metric]
+            change = (after - before) / before * 100 if before else 0.0
+            cells.append(f"{after:>8.3f}({change:+6.1f}%)")
+        p50_change = (cand[key]["p50_ms"] - base[key]["p50_ms"]) / base[key]["p50_ms"] * 100 if base[key]["p50_ms"] else 0.0
+        marker = ""
+        if p50_change > args.threshold:
+            regressions += 1
+            marker = "  <- 느려짐"
+        print(f"{key:<72} {' '.join(cells)}{marker}")
+    for key in sorted(set(base) ^ set(cand)):
+        print(f"{key:<72} (한쪽 결과에만 있음)")
+    # 회귀가 있으면 0이 아닌 종료 코드를 반환하여 스크립트에서 확인할 수 있게 합니다.
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
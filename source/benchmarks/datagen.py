@@ -0,0 +1,52 @@
+import random
+from datetime import datetime
+
+from Analyze import CATEGORIES
+
+# 같은 시드로 실행하면 커밋이 달라도 같은 데이터로 측정합니다.
+DEFAULT_SEED = 42
+WORDS = ["프리미엄", "실속", "대용량", "미니", "클래식", "시그니처", "에코", "스마트", "데일리", "스페셜"]
+MAIL_PHRASES = ["재고 확인 부탁드립니다.", "입고 일정이 변경되었습니다.", "[자동 알림] 오늘의 지역 소식입니다.",
+                "발주서를 보내드립니다.", "가격 조정 안내", "회의 일정 공유드립니다."]
+# 메일 발송 시각을 만드는 기준 시각 (고정값이어야 결과가 재현됩니다)
+MAIL_EPOCH = int(datetime(2024, 1, 1).timestamp())
+
+def item_name(index):
+    """index번째 상품 이름입니다. 이름만으로 item_id를 다시 계산할 수 있도록 번호를 포함합니다."""
+    return f"{WORDS[index % len(WORDS)]} 상품-{index:07d}"
+
+def item_rows(rng, count, start=0):
+    """(name, quantity, price, cost, category) 튜플을 count개 만들어 반환하는 제너레이터입니다."""
+    for index in range(start, start + count):
+        price = rng.randrange(500, 200_000, 100)
+        yield item_name(index), rng.randint(0, 500), price, int(price * rng.uniform(0.4, 0.9)), rng.choice(CATEGORIES)
+
+def user_id(index):
+    return f"bench-user-{index:05d}"
+
+def mail_rows(rng, count, user_count, heavy_share=0.1):
+    """
+    mails 테이블에 바로 넣을 (sender_name, sender_id, receiver_id, message, timestamp, created_at, is_read) 튜플을 만듭니다.
+    받는 사람 0번(user_id(0))이 전체 메일의 heavy_share만큼을 받아 메일이 많은 사용자의 경우를 함께 측정할 수 있습니다.
+    발송 시각은 MAIL_EPOCH부터 순서대로 증가합니다.
+    """
+    created_at = MAIL_EPOCH
+    for _ in range(count):
+        created_at += rng.randint(0, 30)
+        receiver = 0 if rng.random() < heavy_share else rng.randrange(1, user_count)
+        sender = rng.randrange(user_count)
+        timestamp = datetime.fromtimestamp(created_at).strftime('%Y-%m-%d %H:%M:%S')
+        yield (f"사용자{sender}", user_id(sender), user_id(receiver), rng.choice(MAIL_PHRASES),
+               timestamp, created_at, 1 if rng.random() < 0.7 else 0)
+
+def weather_sample(rng):
+    """예측에 사용할 날씨 정보입니다. (get_kma_weather 반환 형식)"""
+    return {"온도": str(rng.randint(0, 35)), "is_raining": rng.random() < 0.3}
+
+def event_sample(rng):
+    """예측에 사용할 지역 소식입니다. (search_titles 반환 형식)"""
+    return {"축제": ["가을 축제"] if rng.random() < 0.3 else [], "공연": ["주말 공연"] if rng.random() < 0.2 else []}
+
+def make_rng(seed, name):
+    """벤치마크별로 독립된 난수 생성기를 만듭니다. (다른 벤치마크를 추가/제외해도 데이터가 바뀌지 않습니다)"""
+    return random.Random(f"{seed}:{name}")
@@ -0,0 +1,162 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+LIB_DIR = os.path.join(BENCHMARK_DIR, "..", "lib")
+FIXTURE_DIR = os.path.join(BENCHMARK_DIR, "fixtures")
+RESULTS_DIR = os.path.join(BENCHMARK_DIR, "results")
+
+# lib 모듈은 서로를 평면(flat) 임포트하므로 lib 디렉터리를 경로에 추가합니다.
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+def percentile(sorted_values, pct):
+    """정렬된 값 목록의 pct 백분위수를 선형 보간으로 계산합니다."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+class BenchmarkResult:
+    """벤치마크 하나의 측정 결과 (호출별 지연 시간과 호출당 작업 수)를 담는 클래스입니다."""
+    def __init__(self, name, params, latencies, ops_per_call=1):
+        self.name = name
+        self.params = params
+        self.latencies = sorted(latencies)
+        self.ops_per_call = ops_per_call
+
+    @property
+    def key(self):
+        """결과 비교에 쓰는 이름입니다. (예: inventory.update_item[rows=100000])"""
+        params = ",".join(f"{key}={value}" for key, value in sorted(self.params.items()))
+        return f"{self.name}[{params}]" if params else self.name
+
+    def to_dict(self):
+        total = sum(self.latencies)
+        return {
+            "name": self.name, "params": self.params, "calls": len(self.latencies), "ops_per_call": self.ops_per_call,
+            "p50_ms": percentile(self.latencies, 50) * 1000, "p95_ms": percentile(self.latencies, 95) * 1000,
+            "p99_ms": percentile(self.latencies, 99) * 1000, "mean_ms": total / len(self.latencies) * 1000,
+            "max_ms": self.latencies[-1] * 1000,
+            "ops_per_sec": len(self.latencies) * self.ops_per_call / total if total else 0.0,
+        }
+
+def measure(name, fn, repeat, warmup=1, params=None, setup=None, ops_per_call=1):
+    """
+    fn을 warmup번 실행한 뒤 repeat번 실행하며 호출별 시간을 잽니다.
+    setup이 주어지면 매 호출 직전에 (측정 시간 밖에서) 실행하고, 그 반환값을 fn의 인자로 넘깁니다.
+    """
+    def call():
+        if setup is None:
+            started = time.perf_counter(); fn()
+        else:
+            value = setup(); started = time.perf_counter(); fn(value)
+        return time.perf_counter() - started
+
+    for _ in range(warmup):
+        call()
+    result = BenchmarkResult(name, params or {}, [call() for _ in range(repeat)], ops_per_call)
+    print_result(result)
+    return result
+
+def print_header():
+    print(f"{'benchmark':<72} {'p50(ms)':>10} {'p95(ms)':>10} {'p99(ms)':>10} {'ops/s':>12}")
+
+def print_result(result):
+    data = result.to_dict()
+    print(f"{result.key:<72} {data['p50_ms']:>10.3f} {data['p95_ms']:>10.3f} {data['p99_ms']:>10.3f} {data['ops_per_sec']:>12.1f}")
+
+def git_commit():
+    """현재 커밋 해시를 반환합니다. (작업 트리에 변경이 있으면 '-dirty'를 붙입니다)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCHMARK_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BENCHMARK_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def save_results(results, options, path=None):
+    """측정 결과를 커밋/환경 정보와 함께 JSON 파일로 저장하고 경로를 반환합니다."""
+    commit = git_commit()
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json")
+    data = {
+        "commit": commit, "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(), "platform": platform.platform(), "cpu_count": os.cpu_count(),
+        "options": options, "results": [result.to_dict() for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+def load_results(path):
+    """저장된 결과 파일을 {벤치마크 키: 결과} 딕셔너리로 불러옵니다."""
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    results = {}
+    for entry in data["results"]:
+        results[BenchmarkResult(entry["name"], entry["params"], [0]).key] = entry
+    return data, results
+
+class StubHandler(BaseHTTPRequestHandler):
+    """경로별로 녹화된 응답(fixtures 폴더의 파일)을 그대로 돌려주는 요청 처리기입니다."""
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        fixture = self.server.routes.get(path)
+        if fixture is None:
+            self.send_error(404)
+            return
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body, content_type = fixture
+        self.server.hits += 1
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class StubServer(ThreadingHTTPServer):
+    """
+    외부 API 대신 사용하는 로컬 스텁 HTTP 서버입니다.
+    routes는 {경로: (fixture 파일 이름, Content-Type)}이며, latency(초)만큼 응답을 늦춰 네트워크 지연을 흉내낼 수 있습니다.
+    """
+    daemon_threads = True
+    protocol_version = "HTTP/1.1"
+
+    def __init__(self, routes, latency=0.0):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.routes = {}
+        for path, (fixture, content_type) in routes.items():
+            with open(os.path.join(FIXTURE_DIR, fixture), "rb") as f:
+                self.routes[path] = (f.read(), content_type)
+        self.latency = latency
+        self.hits = 0
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
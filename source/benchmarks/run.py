@@ -0,0 +1,63 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+import harness
+
+def parse_args(suite_names, scale_names):
+    parser = argparse.ArgumentParser(description="저장소/예측/스크래핑 경로 벤치마크")
+    parser.add_argument("suites", nargs="*", help=f"실행할 묶음 (기본값: 전체) {', '.join(suite_names)}")
+    parser.add_argument("--scale", choices=scale_names, default="full", help="데이터 규모 (기본값: full)")
+    parser.add_argument("--seed", type=int, default=None, help="데이터 생성 시드")
+    parser.add_argument("--repeat", type=int, default=200, help="빠른 작업의 측정 반복 횟수")
+    parser.add_argument("--login-repeat", type=int, default=20, help="로그인 측정 반복 횟수")
+    parser.add_argument("--bcrypt-rounds", type=int, default=None, help="로그인 측정에 쓸 bcrypt 작업 비용 (기본값: 설정값)")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="스텁 서버 응답 지연(ms)")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (기본값: results/<시각>-<커밋>.json)")
+    parser.add_argument("--workdir", help="데이터베이스/모델 파일을 만들 폴더 (지정하면 실행 후에도 남겨 둡니다)")
+    return parser.parse_args()
+
+def main():
+    # lib 모듈은 임포트 시 현재 폴더에 캐시/데이터베이스 파일을 만들므로, 작업 폴더로 이동한 뒤 불러옵니다.
+    suite_names = ["inventory", "mailbox", "login", "prediction", "scraping", "regions"]
+    args = parse_args(suite_names, ["quick", "full"])
+    unknown = [name for name in args.suites if name not in suite_names]
+    if unknown:
+        sys.exit(f"알 수 없는 벤치마크 묶음입니다: {', '.join(unknown)}")
+    output = os.path.abspath(args.output) if args.output else None
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix="inventory-bench-")
+    os.makedirs(workdir, exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from datagen import DEFAULT_SEED
+        from suites import SUITES, SCALES
+        from account_management import load_bcrypt_rounds
+        from storage import close_all_connections
+
+        args.seed = DEFAULT_SEED if args.seed is None else args.seed
+        args.scale_name, args.scale = args.scale, SCALES[args.scale]
+        args.bcrypt_rounds = args.bcrypt_rounds or load_bcrypt_rounds()
+        options = {"suites": args.suites or suite_names, "scale": args.scale_name, "seed": args.seed, "repeat": args.repeat,
+                   "login_repeat": args.login_repeat, "bcrypt_rounds": args.bcrypt_rounds, "stub_latency_ms": args.stub_latency}
+        print(f"작업 폴더: {workdir}, 규모: {args.scale_name}, 시드: {args.seed}")
+
+        results = []
+        try:
+            for name in options["suites"]:
+                print(f"\n[{name}]")
+                harness.print_header()
+                results += SUITES[name](args)
+        finally:
+            close_all_connections()
+        path = harness.save_results(results, options, output)
+        print(f"\n결과를 '{path}'에 저장했습니다. (비교: python compare.py <이전 결과> {path})")
+    finally:
+        os.chdir(cwd)
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import time
+
+from harness import measure, StubServer
+from datagen import (item_name, item_rows, user_id, mail_rows, weather_sample, event_sample, make_rng)
+
+from inventory import Inventory, Item, generate_item_id
+from mail_box import Mailbox
+from account_management import AccountManager
+from Analyze import CATEGORIES, DemandModel, train_model, load_prediction_table
+import Localinfo
+import weather
+from regions import RegionRegistry, get_registry, dfs_grid_conv_array
+
+# 데이터 규모별 설정
+# - quick: 변경 직후 빠르게 확인할 때
+# - full: 커밋 간 비교용 기준 측정 (인벤토리 1천/10만/100만 행, 메일 300만 건)
+SCALES = {
+    "quick": {"inventory_rows": [1_000, 100_000], "mail_rows": 200_000, "mail_users": 200, "train_repeat": 1},
+    "full": {"inventory_rows": [1_000, 100_000, 1_000_000], "mail_rows": 3_000_000, "mail_users": 2_000, "train_repeat": 3},
+}
+INSERT_BATCH_SIZE = 50_000
+NEWS_KEYWORDS = ["축제", "행사", "사고", "공연"]
+
+def _timed(label, fn):
+    started = time.perf_counter()
+    value = fn()
+    print(f"  ({label}: {time.perf_counter() - started:.1f}초)")
+    return value
+
+def inventory_suite(options):
+    """아이템 추가/수정과 전체 목록/키셋 페이지 조회를 행 수별로 측정합니다."""
+    results = []
+    for rows in options.scale["inventory_rows"]:
+        rng = make_rng(options.seed, f"inventory-{rows}")
+        inventory = Inventory(f"inventory_{rows}.db")
+        owner = user_id(0)
+        _timed(f"인벤토리 {rows:,}행 생성", lambda: inventory.bulk_upsert(owner, item_rows(rng, rows)))
+        params = {"rows": rows}
+
+        next_index = iter(range(rows, rows + options.repeat * 2))
+        results.append(measure("inventory.add_item", lambda item: inventory.add_item(owner, item), options.repeat, params=params,
+                               setup=lambda: Item(*next(item_rows(rng, 1, start=next(next_index))))))
+        results.append(measure("inventory.update_item",
+                               lambda item_id: inventory.update_item(owner, item_id, quantity=rng.randint(0, 500), price=rng.randrange(500, 200_000, 100)),
+                               options.repeat, params=params, setup=lambda: generate_item_id(item_name(rng.randrange(rows)))))
+        results.append(measure("inventory.list_items_page", lambda item_id: inventory.list_items_page(owner, item_id), options.repeat,
+                               params=params, setup=lambda: generate_item_id(item_name(rng.randrange(rows)))))
+        # 전체 목록은 행 수에 비례하므로 반복 횟수를 줄이고, 처리량은 초당 행 수로 기록합니다.
+        list_repeat = max(3, min(options.repeat, 1_000_000 // rows))
+        item_count = inventory.conn.execute("SELECT COUNT(*) FROM items WHERE owner_id = ?", (owner,)).fetchone()[0]
+        results.append(measure("inventory.list_items", lambda: inventory.list_items(owner), list_repeat,
+                               params=params, ops_per_call=item_count))
+        inventory.close()
+    return results
+
+def mailbox_suite(options):
+    """메일이 많은 사용자와 보통 사용자의 메일함 첫 페이지/깊은 페이지 조회와 메일 수 집계를 측정합니다."""
+    rows, users = options.scale["mail_rows"], options.scale["mail_users"]
+    rng = make_rng(options.seed, "mailbox")
+    mailbox = Mailbox(f"mailbox_{rows}.db")
+
+    def populate():
+        batch = []
+        with mailbox.transaction():
+            for row in mail_rows(rng, rows, users):
+                batch.append(row)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    mailbox.conn.executemany("INSERT INTO mails (sender_name, sender_id, receiver_id, message, timestamp, created_at, is_read) "
+                                             "VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+                    batch = []
+            mailbox.conn.executemany("INSERT INTO mails (sender_name, sender_id, receiver_id, message, timestamp, created_at, is_read) "
+                                     "VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+    _timed(f"메일 {rows:,}건 생성", populate)
+
+    results = []
+    for label, receiver in (("heavy", user_id(0)), ("typical", user_id(1))):
+        params = {"mails": rows, "user": label}
+        # 깊은 페이지: 받은 메일의 가운데쯤에서 시작하는 키셋 페이지
+        total, _ = mailbox.get_mail_counts(receiver)
+        middle = mailbox.conn.execute("SELECT created_at, id FROM mails WHERE receiver_id = ? ORDER BY created_at DESC, id DESC LIMIT 1 OFFSET ?",
+                                      (receiver, total // 2)).fetchone()
+        results.append(measure("mailbox.get_mails_for_user", lambda: mailbox.get_mails_for_user(receiver), options.repeat,
+                               params=dict(params, page="first")))
+        results.append(measure("mailbox.get_mails_for_user", lambda: mailbox.get_mails_for_user(receiver, before=middle), options.repeat,
+                               params=dict(params, page="middle")))
+        results.append(measure("mailbox.get_mails_for_user", lambda: mailbox.get_mails_for_user(receiver, include_body=False), options.repeat,
+                               params=dict(params, page="first", body="lazy")))
+        results.append(measure("mailbox.get_mail_counts", lambda: mailbox.get_mail_counts(receiver), options.repeat, params=params))
+    mailbox.close()
+    return results
+
+def login_suite(options):
+    """설정된 bcrypt 작업 비용으로 로그인(비밀번호 확인) 지연 시간을 측정합니다."""
+    manager = AccountManager("users_bench.db", bcrypt_rounds=options.bcrypt_rounds)
+    manager.create_user("bench", "벤치마크", "password", "서울")
+    return [measure("account.login", lambda: manager.login("bench", "password"), options.login_repeat,
+                    params={"rounds": options.bcrypt_rounds})]
+
+def prediction_suite(options):
+    """모델 훈련 시간과, 모델 직접 예측/예측 테이블 조회의 단건/일괄 지연 시간을 측정합니다."""
+    results = [measure("analyze.train_model", lambda: train_model(seed=options.seed), options.scale["train_repeat"], warmup=0)]
+    classifier, regressor, columns = train_model(seed=options.seed)
+    rng = make_rng(options.seed, "prediction")
+    contexts = [(weather_sample(rng), event_sample(rng)) for _ in range(64)]
+    next_context = iter(contexts * (options.repeat * 2 // len(contexts) + 2))
+
+    models = {"model": DemandModel(classifier, regressor, columns),
+              "table": DemandModel(classifier, regressor, columns, load_prediction_table(classifier, regressor, columns))}
+    for mode, model in models.items():
+        results.append(measure("analyze.predict_demand", lambda context: model.predict(CATEGORIES[0], *context), options.repeat,
+                               params={"mode": mode}, setup=lambda: next(next_context)))
+        results.append(measure("analyze.predict_demand_batch", lambda context: model.predict_batch(CATEGORIES, *context), options.repeat,
+                               params={"mode": mode, "categories": len(CATEGORIES)}, setup=lambda: next(next_context),
+                               ops_per_call=len(CATEGORIES)))
+    return results
+
+def scraping_suite(options):
+    """녹화된 응답을 돌려주는 로컬 스텁 서버로 뉴스 검색과 날씨 조회(캐시 미적중/적중)를 측정합니다."""
+    routes = {"/search.naver": ("naver_view.html", "text/html; charset=utf-8"),
+              "/getUltraSrtFcst": ("kma_ultra_srt_fcst.json", "application/json;charset=UTF-8")}
+    results = []
+    with StubServer(routes, latency=options.stub_latency / 1000) as stub:
+        # 외부 주소 대신 스텁 서버를 사용하고, 호스트별 속도 제한이 측정을 지배하지 않도록 풉니다.
+        Localinfo.NEWS_SEARCH_URL = stub.base_url + "/search.naver"
+        Localinfo.HOST_RATE_LIMIT = Localinfo.HOST_BURST = 1_000_000
+        weather.KMA_FORECAST_URL = stub.base_url + "/getUltraSrtFcst"
+        weather.KMA_API_KEY = "benchmark"
+        params = {"latency_ms": options.stub_latency}
+
+        results.append(measure("localinfo.search_titles", lambda _: Localinfo.search_titles("서울", NEWS_KEYWORDS), options.repeat,
+                               params=dict(params, cache="miss"), setup=lambda: Localinfo.get_news_cache().clear(), ops_per_call=len(NEWS_KEYWORDS)))
+        results.append(measure("localinfo.search_titles", lambda: Localinfo.search_titles("서울", NEWS_KEYWORDS), options.repeat,
+                               params=dict(params, cache="hit"), ops_per_call=len(NEWS_KEYWORDS)))
+        seoul = get_registry().get("서울")
+        lat, lon = seoul.lat, seoul.lon
+        results.append(measure("weather.get_kma_weather", lambda _: weather.get_kma_weather(lat, lon), options.repeat,
+                               params=dict(params, cache="miss"), setup=weather.weather_cache.clear))
+        results.append(measure("weather.get_kma_weather", lambda: weather.get_kma_weather(lat, lon), options.repeat,
+                               params=dict(params, cache="hit")))
+        results.append(measure("weather.get_region_weather", lambda: weather.get_region_weather("서울 종로구"), options.repeat,
+                               params=dict(params, cache="hit")))
+        if "error" in weather.get_kma_weather(lat, lon):
+            raise RuntimeError("스텁 서버의 날씨 응답을 처리하지 못했습니다.")
+    return results
+
+def regions_suite(options):
+    """전국 지역 목록의 격자 변환(벡터 연산), 좌표로 가장 가까운 지역 찾기, 지역 목록을 불러오는 시간(앱 시작 시 한 번)을 측정합니다."""
+    rng = make_rng(options.seed, "regions")
+    registry = get_registry()
+    points = [(rng.uniform(33.1, 38.6), rng.uniform(124.6, 131.0)) for _ in range(10_000)]
+    lats, lons = [lat for lat, _ in points], [lon for _, lon in points]
+    next_point = iter(points * (options.repeat * 2 // len(points) + 2))
+    return [
+        measure("regions.dfs_grid_conv_array", lambda: dfs_grid_conv_array(lats, lons), options.repeat,
+                params={"points": len(points)}, ops_per_call=len(points)),
+        measure("regions.nearest", lambda point: registry.nearest(*point), options.repeat,
+                params={"regions": len(registry)}, setup=lambda: next(next_point)),
+        measure("regions.load", RegionRegistry.load, options.repeat, params={"regions": len(registry)}),
+    ]
+
+SUITES = {
+    "inventory": inventory_suite,
+    "mailbox": mailbox_suite,
+    "login": login_suite,
+    "prediction": prediction_suite,
+    "scraping": scraping_suite,
+    "regions": regions_suite,
+}
@@ -0,0 +1,33 @@
+import argparse
+import os
+import sys
+
+# lib 모듈은 서로를 평면(flat) 임포트하므로 lib 디렉터리를 경로에 추가합니다. (benchmarks/harness.py와 같은 방식)
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib")
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+from inventory import Inventory
+from account_management import generate_user_id
+from bulk_io import import_items, export_items
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인벤토리 대량 가져오기/내보내기 (CSV, JSON Lines)")
+    parser.add_argument("command", choices=["import", "export"], help="가져오기(import) 또는 내보내기(export)")
+    parser.add_argument("username", help="인벤토리 소유자의 아이디")
+    parser.add_argument("path", help="가져올/내보낼 파일 경로 (.csv, .jsonl)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="파일 형식 (생략 시 확장자로 판단)")
+    parser.add_argument("--db", default="inventory.db", help="인벤토리 데이터베이스 경로")
+    args = parser.parse_args()
+
+    inventory = Inventory(args.db)
+    try:
+        owner_id = generate_user_id(args.username)
+        if args.command == "import":
+            result = import_items(inventory, owner_id, args.path, args.format)
+            print(f"가져오기 완료: {result}")
+        else:
+            result = export_items(inventory, owner_id, args.path, args.format)
+            print(f"내보내기 완료: {result}")
+    finally:
+        inventory.close()
@@ -1,88 +1,128 @@
 import pandas as pd
 import numpy as np
 import os
+import io
+import hashlib
 import joblib
+from concurrent.futures import ThreadPoolExecutor
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
 
+import metrics
+
 # --- 1. 설정 및 데이터 생성 ---
 
-# 모델 및 컬럼 정보 저장 경로 (분류/회귀 모델 분리)
+# 분류/회귀 모델과 컬럼 정보를 하나로 묶은 버전 관리 번들 (체크섬은 별도 파일에 저장)
+MODEL_BUNDLE_PATH = "demand_model.joblib"
+MODEL_BUNDLE_CHECKSUM_PATH = MODEL_BUNDLE_PATH + ".sha256"
+MODEL_BUNDLE_VERSION = 1
+# 이전 버전의 개별 저장 경로 (번들로 자동 이전됩니다)
 CLASSIFIER_PATH = "demand_classifier.joblib"
 REGRESSOR_PATH = "demand_regressor.joblib"
 COLUMNS_PATH = "model_columns.joblib"
+# 이산 특성 공간 전체에 대한 사전 계산 예측 테이블 (컴파일 모드)
+PREDICTION_TABLE_PATH = "prediction_table.joblib"
 CATEGORIES = ["문구", "생활용품", "전자기기", "음료", "식품", "기타"]
+TRAINING_SAMPLES = 2500
+
+SYNTHETIC_COLUMNS = ["temperature", "is_raining", "is_hot_wave", "has_festival", "has_concert", "category", "demand", "quantity_change"]
+DEFAULT_CHUNK_SIZE = 100_000
 
-def generate_synthetic_data(num_samples=2500):
+def _generate_synthetic_chunk(rng, num_samples):
+    """
+    가상 데이터 한 덩어리를 NumPy 벡터 연산으로 생성합니다.
+    카테고리별 규칙은 불리언 마스크로 표현되며, 샘플별 반복문을 사용하지 않습니다.
+    """
+    temp = rng.integers(0, 35, num_samples)
+    is_raining = rng.integers(0, 2, num_samples)
+    is_hot_wave = (temp >= 30).astype(np.int64)
+    has_festival = rng.integers(0, 2, num_samples)
+    has_concert = rng.integers(0, 2, num_samples)
+    category = rng.choice(np.array(CATEGORIES, dtype=object), num_samples)
+
+    # 수요 수준 및 변동 수량 기본값 (수요 보통, -2 ~ +2)
+    demand = np.full(num_samples, "수요 보통", dtype=object)
+    quantity_change = rng.integers(-2, 3, num_samples)
+
+    hot = is_hot_wave.astype(bool)
+    raining = is_raining.astype(bool)
+    has_event = (has_festival | has_concert).astype(bool)
+
+    def apply(mask, label, low, high):
+        count = int(mask.sum())
+        if count:
+            demand[mask] = label
+            quantity_change[mask] = rng.integers(low, high, count)
+
+    # 카테고리별 수요 변화 로직 (기존 분기와 동일한 조건/범위)
+    is_drink = category == "음료"
+    apply(is_drink & hot, "수요 증가", 15, 30)
+    apply(is_drink & ~hot & has_event, "수요 증가", 10, 25)
+
+    apply((category == "식품") & has_event, "수요 증가", 8, 20)
+
+    is_household = category == "생활용품"
+    apply(is_household & raining, "수요 증가", 5, 15) # 우산 등
+    # 폭염 시 야외 활동 감소로 일부 생활용품 수요 감소
+    apply(is_household & ~raining & hot & (rng.random(num_samples) > 0.6), "수요 감소", -10, -3)
+
+    # 비가 오면 문구류 수요 감소
+    apply((category == "문구") & raining, "수요 감소", -8, -1)
+
+    return pd.DataFrame({
+        "temperature": temp, "is_raining": is_raining, "is_hot_wave": is_hot_wave,
+        "has_festival": has_festival, "has_concert": has_concert, "category": category,
+        "demand": demand, "quantity_change": quantity_change,
+    }, columns=SYNTHETIC_COLUMNS)
+
+def iter_synthetic_data(num_samples=2500, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    가상 데이터를 chunk_size 행 단위의 DataFrame으로 나누어 생성합니다.
+    전체 데이터를 메모리에 올리지 않으므로 수백만 행도 일정한 메모리로 처리할 수 있습니다.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size는 0보다 커야 합니다.")
+    rng = np.random.default_rng(seed)
+    remaining = num_samples
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        yield _generate_synthetic_chunk(rng, size)
+        remaining -= size
+
+def generate_synthetic_data(num_samples=2500, seed=None):
     """
     수요 예측 모델 훈련을 위한 가상 데이터를 생성합니다.
     수요 수준(증가, 보통, 감소)과 함께 예상 변동 수량을 포함합니다.
     """
-    data = []
-    for _ in range(num_samples):
-        temp = np.random.randint(0, 35)
-        is_raining = np.random.choice([1, 0])
-        is_hot_wave = 1 if temp >= 30 else 0
-        has_festival = np.random.choice([1, 0])
-        has_concert = np.random.choice([1, 0])
-        category = np.random.choice(CATEGORIES)
-        
-        # 수요 수준 및 변동 수량 결정 로직 (감소 시나리오 강화)
-        demand = "수요 보통"
-        quantity_change = np.random.randint(-2, 3) # -2 ~ +2
-
-        # 카테고리별 수요 변화 로직
-        if category == "음료":
-            if is_hot_wave:
-                demand = "수요 증가"
-                quantity_change = np.random.randint(15, 30)
-            elif has_festival or has_concert:
-                demand = "수요 증가"
-                quantity_change = np.random.randint(10, 25)
-        elif category == "식품":
-            if has_festival or has_concert:
-                demand = "수요 증가"
-                quantity_change = np.random.randint(8, 20)
-        elif category == "생활용품":
-            if is_raining:
-                demand = "수요 증가" # 우산 등
-                quantity_change = np.random.randint(5, 15)
-            # 폭염 시 야외 활동 감소로 일부 생활용품 수요 감소
-            elif is_hot_wave and np.random.rand() > 0.6:
-                demand = "수요 감소"
-                quantity_change = np.random.randint(-10, -3)
-        elif category == "문구":
-            # 비가 오면 문구류 수요 감소
-            if is_raining:
-                demand = "수요 감소"
-                quantity_change = np.random.randint(-8, -1)
-
-        data.append([temp, is_raining, is_hot_wave, has_festival, has_concert, category, demand, quantity_change])
-
-    columns = ["temperature", "is_raining", "is_hot_wave", "has_festival", "has_concert", "category", "demand", "quantity_change"]
-    return pd.DataFrame(data, columns=columns)
+    return _generate_synthetic_chunk(np.random.default_rng(seed), num_samples)
 
 # --- 2. 모델 훈련 및 관리 ---
 
-def train_model():
+@metrics.timed("model.train")
+def train_model(num_samples=TRAINING_SAMPLES, seed=None, df=None):
     """
     분류(Classifier)와 회귀(Regressor) 모델을 각각 훈련하고 파일로 저장합니다.
+    df가 주어지면 가상 데이터 대신 해당 데이터(SYNTHETIC_COLUMNS 형식)로 훈련합니다.
     """
     print("수요 예측 모델 훈련을 시작합니다 (분류/회귀)...")
     
-    df = generate_synthetic_data()
+    if df is None:
+        df = generate_synthetic_data(num_samples, seed=seed)
     df_encoded = pd.get_dummies(df, columns=['category'], drop_first=True)
     
     X = df_encoded.drop(['demand', 'quantity_change'], axis=1)
     y_class = df_encoded['demand']
     y_quant = df_encoded['quantity_change']
     
+    # 실데이터에서는 일부 수요 수준의 표본이 매우 적을 수 있으므로, 가능한 경우에만 층화 추출합니다.
+    stratify = y_class if y_class.value_counts().min() >= 2 else None
     X_train, X_test, y_class_train, y_class_test, y_quant_train, y_quant_test = train_test_split(
-        X, y_class, y_quant, test_size=0.2, random_state=42, stratify=y_class
+        X, y_class, y_quant, test_size=0.2, random_state=42, stratify=stratify
     )
     
     # 1. 분류 모델 훈련 ('수요 감소'에 가중치 부여)
     class_weights = {'수요 감소': 3, '수요 보통': 1, '수요 증가': 1.2}
+    class_weights = {label: weight for label, weight in class_weights.items() if label in set(y_class_train)}
     classifier = RandomForestClassifier(n_estimators=100, random_state=42, class_weight=class_weights)
     classifier.fit(X_train, y_class_train)
     print(f"분류 모델 정확도: {classifier.score(X_test, y_class_test):.2f}")
@@ -93,64 +133,296 @@ def train_model():
     print(f"회귀 모델 R^2 점수: {regressor.score(X_test, y_quant_test):.2f}")
 
     # 모델 및 컬럼 저장
-    joblib.dump(classifier, CLASSIFIER_PATH)
-    joblib.dump(regressor, REGRESSOR_PATH)
-    joblib.dump(X.columns.tolist(), COLUMNS_PATH)
+    save_model_bundle(classifier, regressor, X.columns.tolist())
     
-    print(f"모델이 '{CLASSIFIER_PATH}'와 '{REGRESSOR_PATH}'에 저장되었습니다.")
+    print(f"모델이 '{MODEL_BUNDLE_PATH}'에 저장되었습니다.")
     return classifier, regressor, X.columns.tolist()
 
-def load_model_and_columns():
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def save_model_bundle(classifier, regressor, columns, path=MODEL_BUNDLE_PATH):
     """
-    저장된 분류기와 회귀 모델을 불러옵니다. 파일이 없으면 새로 훈련합니다.
+    분류기, 회귀 모델, 컬럼 목록을 하나의 버전 관리 번들로 저장하고 체크섬을 기록합니다.
+    메모리 매핑 로딩이 가능하도록 압축 없이 저장합니다.
+    """
+    bundle = {"version": MODEL_BUNDLE_VERSION, "classifier": classifier, "regressor": regressor, "columns": list(columns)}
+    tmp_path = path + ".tmp"
+    joblib.dump(bundle, tmp_path)
+    checksum = _file_sha256(tmp_path)
+    os.replace(tmp_path, path)
+    with open(path + ".sha256", 'w') as f:
+        f.write(checksum)
+    # 모델이 바뀌었으므로 이전 예측 테이블은 무효화합니다.
+    if os.path.exists(PREDICTION_TABLE_PATH):
+        os.remove(PREDICTION_TABLE_PATH)
+
+def load_model_bundle(path=MODEL_BUNDLE_PATH, mmap=False):
+    """
+    모델 번들을 한 번에 읽어 (분류기, 회귀 모델, 컬럼) 튜플을 반환합니다.
+    체크섬이나 버전이 맞지 않으면 ValueError를 발생시킵니다.
+    mmap=True이면 모델 내부 배열을 읽기 전용 메모리 매핑으로 불러옵니다.
     """
-    if not all(os.path.exists(p) for p in [CLASSIFIER_PATH, REGRESSOR_PATH, COLUMNS_PATH]):
-        print("저장된 모델을 찾을 수 없습니다.")
-        return train_model()
+    with open(path + ".sha256", 'r') as f:
+        expected = f.read().strip()
+
+    if mmap:
+        if _file_sha256(path) != expected:
+            raise ValueError("모델 번들의 체크섬이 일치하지 않습니다.")
+        bundle = joblib.load(path, mmap_mode='r')
     else:
-        print(f"저장된 모델들을 불러옵니다.")
+        with open(path, 'rb') as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != expected:
+            raise ValueError("모델 번들의 체크섬이 일치하지 않습니다.")
+        bundle = joblib.load(io.BytesIO(data))
+
+    if bundle.get("version") != MODEL_BUNDLE_VERSION:
+        raise ValueError(f"지원하지 않는 모델 번들 버전입니다: {bundle.get('version')}")
+    return bundle["classifier"], bundle["regressor"], bundle["columns"]
+
+def load_model_and_columns(mmap=False):
+    """
+    저장된 분류기와 회귀 모델을 불러옵니다. 파일이 없으면 새로 훈련합니다.
+    이전 버전의 개별 파일만 있다면 번들로 변환하여 저장합니다.
+    """
+    if os.path.exists(MODEL_BUNDLE_PATH) and os.path.exists(MODEL_BUNDLE_CHECKSUM_PATH):
+        try:
+            print("저장된 모델 번들을 불러옵니다.")
+            return load_model_bundle(MODEL_BUNDLE_PATH, mmap=mmap)
+        except Exception as e:
+            print(f"모델 번들을 불러오는 중 오류 발생: {e}")
+            return train_model()
+
+    if all(os.path.exists(p) for p in [CLASSIFIER_PATH, REGRESSOR_PATH, COLUMNS_PATH]):
+        print("이전 형식의 모델 파일을 번들로 변환합니다.")
         classifier = joblib.load(CLASSIFIER_PATH)
         regressor = joblib.load(REGRESSOR_PATH)
         columns = joblib.load(COLUMNS_PATH)
+        save_model_bundle(classifier, regressor, columns)
         return classifier, regressor, columns
 
+    print("저장된 모델을 찾을 수 없습니다.")
+    return train_model()
+
 # --- 3. 수요 예측 ---
 
-def predict_demand(category, weather_data, event_data, classifier, regressor, model_columns):
-    """
-    현재 정보를 기반으로 수요 변화 확률과 예상 변동 수량을 예측합니다.
-    """
-    # 1. 입력 데이터로부터 특성(Feature) 추출
+FEATURE_COLUMNS = ["temperature", "is_raining", "is_hot_wave", "has_festival", "has_concert"]
+CATEGORY_PREFIX = "category_"
+
+def _extract_context_features(weather_data, event_data):
+    """날씨/행사 정보에서 카테고리를 제외한 공통 특성 값을 추출합니다."""
     temp = float(weather_data.get('온도', 0))
     is_raining = 1 if weather_data.get('is_raining', False) else 0
     is_hot_wave = 1 if temp >= 30 else 0
     has_festival = 1 if event_data.get('축제') else 0
     has_concert = 1 if event_data.get('공연') else 0
+    return [temp, is_raining, is_hot_wave, has_festival, has_concert]
 
-    # 2. DataFrame 생성 및 인코딩
-    input_df = pd.DataFrame([[temp, is_raining, is_hot_wave, has_festival, has_concert, category]],
-                              columns=["temperature", "is_raining", "is_hot_wave", "has_festival", "has_concert", "category"])
-    input_encoded = pd.get_dummies(input_df)
-    final_df = input_encoded.reindex(columns=model_columns, fill_value=0)
-    
-    # 3. 예측 수행
-    # 3.1. 확률 예측
-    probabilities = classifier.predict_proba(final_df)[0]
-    class_order = classifier.classes_
-    
-    # 3.2. 수량 예측
-    quantity_prediction = regressor.predict(final_df)[0]
-    
-    # 4. 결과 포맷팅
-    highest_prob_index = np.argmax(probabilities)
-    predicted_class = class_order[highest_prob_index]
-    predicted_prob = probabilities[highest_prob_index]
-    
+def _encode_features(features, categories, model_columns):
+    """
+    공통 특성 배열(N x 5)과 카테고리 목록을 model_columns 순서의 DataFrame으로 인코딩합니다.
+    pd.get_dummies 대신 카테고리를 해당 원-핫 컬럼 위치에 직접 기록합니다.
+    """
+    column_index = {col: i for i, col in enumerate(model_columns)}
+    matrix = np.zeros((len(categories), len(model_columns)), dtype=float)
+
+    features = np.broadcast_to(np.asarray(features, dtype=float), (len(categories), len(FEATURE_COLUMNS)))
+    for j, col in enumerate(FEATURE_COLUMNS):
+        if col in column_index:
+            matrix[:, column_index[col]] = features[:, j]
+
+    # 훈련 시 drop_first로 제외된 카테고리나 미지의 카테고리는 모두 0으로 남습니다.
+    category_cols = np.array([column_index.get(f"{CATEGORY_PREFIX}{c}", -1) for c in categories], dtype=int)
+    rows = np.nonzero(category_cols >= 0)[0]
+    matrix[rows, category_cols[rows]] = 1
+
+    return pd.DataFrame(matrix, columns=model_columns)
+
+def demand_context(weather_data, event_data):
+    """재고 이력 기록용으로 날씨/행사 정보를 모델 특성 이름의 dict로 변환합니다."""
+    temp, is_raining, _, has_festival, has_concert = _extract_context_features(weather_data, event_data)
+    return {"temperature": temp, "is_raining": is_raining, "has_festival": has_festival, "has_concert": has_concert}
+
+def build_feature_matrix(categories, weather_data, event_data, model_columns):
+    """N개 항목의 특성 행렬을 model_columns 순서에 맞춰 한 번에 생성합니다."""
+    return _encode_features(_extract_context_features(weather_data, event_data), list(categories), model_columns)
+
+def _predict_features(features, classifier, regressor):
+    """인코딩된 특성 행렬에 대해 (예측 클래스, 확률, 변동 수량) 배열을 반환합니다."""
+    probabilities = classifier.predict_proba(features)
+    quantities = regressor.predict(features)
+    best = np.argmax(probabilities, axis=1)
+    best_probs = probabilities[np.arange(len(best)), best]
+    return classifier.classes_[best], best_probs, quantities
+
+def predict_demand_batch(categories, weather_data, event_data, classifier, regressor, model_columns, table=None):
+    """
+    여러 항목의 수요를 분류기/회귀 모델 각각 한 번의 호출로 예측합니다.
+    table(PredictionTable)이 주어지면 테이블에 있는 조합은 조회로 처리하고 나머지만 모델로 예측합니다.
+
+    Returns:
+        list: 항목별 {'class': 예측 수요 수준, 'probability': 확률, 'quantity': 예상 변동 수량} 딕셔너리
+    """
+    categories = list(categories)
+    if not categories:
+        return []
+
+    with metrics.span("model.predict"):
+        results = table.lookup_batch(categories, weather_data, event_data) if table is not None else [None] * len(categories)
+        misses = [i for i, result in enumerate(results) if result is None]
+        if misses:
+            features = build_feature_matrix([categories[i] for i in misses], weather_data, event_data, model_columns)
+            classes, probs, quantities = _predict_features(features, classifier, regressor)
+            for i, c, p, q in zip(misses, classes, probs, quantities):
+                results[i] = {"class": str(c), "probability": float(p), "quantity": float(q)}
+    if metrics.ENABLED:
+        metrics.inc("predictions_total", len(categories) - len(misses), source="table")
+        metrics.inc("predictions_total", len(misses), source="model")
+    return results
+
+def format_prediction(result):
+    """예측 결과 딕셔너리를 화면 표시용 문자열로 변환합니다."""
     # 확률을 10% 단위로 반올림
-    prob_percent = round(predicted_prob * 10) * 10
-    
+    prob_percent = round(result["probability"] * 10) * 10
     # 수량 포맷팅
-    quantity_str = f"{round(quantity_prediction):+d}개" # + 또는 - 부호 포함
-    
-    return f"{prob_percent}% 확률로 {predicted_class} ({quantity_str} 예상)"
+    quantity_str = f"{round(result['quantity']):+d}개" # + 또는 - 부호 포함
+    return f"{prob_percent}% 확률로 {result['class']} ({quantity_str} 예상)"
+
+def predict_demand(category, weather_data, event_data, classifier, regressor, model_columns, table=None):
+    """
+    현재 정보를 기반으로 수요 변화 확률과 예상 변동 수량을 예측합니다.
+    """
+    result = predict_demand_batch([category], weather_data, event_data, classifier, regressor, model_columns, table=table)[0]
+    return format_prediction(result)
 
+# --- 4. 예측 테이블 (컴파일 모드) ---
+
+# 훈련 데이터의 정수 기온 범위와 이진 특성 전체 조합을 미리 계산합니다.
+TABLE_TEMPERATURES = np.arange(0, 36)
+
+def _artifact_fingerprint():
+    """모델 파일의 수정 시각/크기로 테이블 무효화 여부를 판단하기 위한 지문을 만듭니다."""
+    fingerprint = []
+    for path in [MODEL_BUNDLE_PATH, MODEL_BUNDLE_CHECKSUM_PATH]:
+        stat = os.stat(path) if os.path.exists(path) else None
+        fingerprint.append((path, stat.st_mtime_ns, stat.st_size) if stat else (path, None, None))
+    return fingerprint
+
+class PredictionTable:
+    """
+    이산 특성 공간(기온 x 강수 x 축제 x 공연 x 카테고리) 전체에 대한 예측 결과 테이블입니다.
+    한 번 계산해두면 이후 예측은 랜덤 포레스트 순회 없이 배열 조회로 처리됩니다.
+    """
+    def __init__(self, classes, class_index, probability, quantity, fingerprint=None):
+        self.classes = np.asarray(classes)
+        self.class_index = class_index
+        self.probability = probability
+        self.quantity = quantity
+        self.fingerprint = fingerprint
+        self.category_index = {c: i for i, c in enumerate(CATEGORIES)}
+
+    @classmethod
+    def build(cls, classifier, regressor, model_columns, fingerprint=None):
+        """모든 조합에 대해 분류기/회귀 모델을 한 번씩만 평가하여 테이블을 만듭니다."""
+        temp, rain, festival, concert, category = np.meshgrid(
+            TABLE_TEMPERATURES, [0, 1], [0, 1], [0, 1], np.arange(len(CATEGORIES)), indexing='ij')
+        shape = temp.shape
+        temp = temp.ravel()
+        features = np.column_stack([temp, rain.ravel(), (temp >= 30).astype(int), festival.ravel(), concert.ravel()])
+        categories = [CATEGORIES[i] for i in category.ravel()]
+
+        encoded = _encode_features(features, categories, model_columns)
+        probabilities = classifier.predict_proba(encoded)
+        best = np.argmax(probabilities, axis=1)
+        probability = probabilities[np.arange(len(best)), best]
+        quantity = regressor.predict(encoded)
+
+        return cls(classifier.classes_, best.reshape(shape), probability.reshape(shape),
+                   quantity.reshape(shape), fingerprint)
+
+    def lookup_batch(self, categories, weather_data, event_data):
+        """
+        테이블에서 항목별 예측 결과를 조회합니다.
+        기온이 정수 격자 밖이거나 알 수 없는 카테고리인 항목은 None을 반환하여 실시간 모델로 넘깁니다.
+        """
+        temp, is_raining, _, has_festival, has_concert = _extract_context_features(weather_data, event_data)
+        t = int(temp) - int(TABLE_TEMPERATURES[0])
+        if temp != int(temp) or not 0 <= t < len(TABLE_TEMPERATURES):
+            return [None] * len(categories)
+
+        results = []
+        for category in categories:
+            c = self.category_index.get(category)
+            if c is None:
+                results.append(None)
+                continue
+            key = (t, is_raining, has_festival, has_concert, c)
+            results.append({"class": str(self.classes[self.class_index[key]]),
+                            "probability": float(self.probability[key]),
+                            "quantity": float(self.quantity[key])})
+        return results
+
+    def save(self, path=PREDICTION_TABLE_PATH):
+        joblib.dump({"classes": self.classes, "class_index": self.class_index, "probability": self.probability,
+                     "quantity": self.quantity, "fingerprint": self.fingerprint}, path)
+
+    @classmethod
+    def load(cls, path=PREDICTION_TABLE_PATH):
+        data = joblib.load(path)
+        return cls(data["classes"], data["class_index"], data["probability"], data["quantity"], data["fingerprint"])
+
+def load_prediction_table(classifier, regressor, model_columns, path=PREDICTION_TABLE_PATH):
+    """
+    저장된 예측 테이블을 불러옵니다. 테이블이 없거나 모델 파일이 바뀌었다면 새로 계산하여 저장합니다.
+    """
+    fingerprint = _artifact_fingerprint()
+    if os.path.exists(path):
+        try:
+            table = PredictionTable.load(path)
+            if table.fingerprint == fingerprint:
+                print("저장된 예측 테이블을 불러옵니다.")
+                return table
+        except Exception as e:
+            print(f"예측 테이블을 불러오는 중 오류 발생: {e}")
+
+    print("예측 테이블을 새로 계산합니다...")
+    table = PredictionTable.build(classifier, regressor, model_columns, fingerprint)
+    table.save(path)
+    return table
+
+# --- 5. 백그라운드 로딩 ---
+
+class DemandModel:
+    """불러온 분류기/회귀 모델/컬럼 정보와 (선택적) 예측 테이블을 함께 보관합니다."""
+    def __init__(self, classifier, regressor, model_columns, table=None):
+        self.classifier = classifier
+        self.regressor = regressor
+        self.model_columns = model_columns
+        self.table = table
+
+    def predict(self, category, weather_data, event_data):
+        return predict_demand(category, weather_data, event_data, self.classifier, self.regressor, self.model_columns, table=self.table)
+
+    def predict_batch(self, categories, weather_data, event_data):
+        return predict_demand_batch(categories, weather_data, event_data, self.classifier, self.regressor, self.model_columns, table=self.table)
+
+# 모델 로딩/훈련 전용 워커 (한 번에 하나의 작업만 수행)
+_model_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-loader")
+
+@metrics.timed("model.load")
+def _load_demand_model(compiled, mmap):
+    classifier, regressor, columns = load_model_and_columns(mmap=mmap)
+    table = load_prediction_table(classifier, regressor, columns) if compiled else None
+    return DemandModel(classifier, regressor, columns, table)
+
+def load_model_async(compiled=False, mmap=False):
+    """
+    모델 로딩(필요하면 훈련 포함)을 백그라운드 워커에서 시작하고 Future를 반환합니다.
+    예측이 실제로 필요한 시점에 future.result()로 완료를 기다리면 됩니다.
+    """
+    return _model_loader.submit(_load_demand_model, compiled, mmap)
@@ -1,55 +1,180 @@
 import requests
 from bs4 import BeautifulSoup
 import urllib.parse
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 
-def search_titles(region: str, keywords: list) -> dict:
+from cache import TTLCache, SingleFlight
+import http_client
+import metrics
+
+# 호스트별 허용 요청 속도 (초당 요청 수)와 순간 허용량. 기존의 0.5초 고정 지연과 같은 평균 속도입니다.
+HOST_RATE_LIMIT = 2.0
+HOST_BURST = 2
+# 요청 하나가 (속도 제한 대기 시간을 포함해) 끝나야 하는 최대 시간(초). 요청마다 작업이 시작될 때부터 셉니다.
+REQUEST_DEADLINE = 15.0
+REQUEST_TIMEOUT = 10
+MAX_WORKERS = 8
+# (지역, 키워드)별 검색 결과 캐시. UI와 타이머 스레드가 함께 사용하며 재시작 후에도 유지됩니다. (처음 사용할 때 만듭니다)
+NEWS_CACHE_TTL = 1800
+NEWS_CACHE_SIZE = 512
+NEWS_CACHE_DB_PATH = "news_cache.db"
+
+# 일부 웹사이트는 자동화된 요청을 차단하므로, 실제 브라우저처럼 보이게 헤더를 설정합니다.
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+}
+# 네이버 검색 주소 (벤치마크에서는 로컬 스텁 서버 주소로 바꿔서 사용합니다)
+NEWS_SEARCH_URL = "https://search.naver.com/search.naver"
+ERROR_TITLES = ["오류: 관련 소식을 불러오는 데 실패했습니다."]
+
+class TokenBucket:
     """
-    네이버 검색을 통해 특정 지역과 키워드에 맞는 최신 게시글 제목을 스크래핑합니다.
+    호스트별 요청 속도를 제한하는 토큰 버킷입니다.
+    rate만큼 초당 토큰이 채워지며, 요청마다 토큰 하나를 소비합니다.
+    토큰이 없으면 다음 토큰을 미리 예약하고 그 시각까지 기다리므로, 먼저 온 요청이 먼저 처리됩니다.
+    (여러 스레드가 깨어날 때마다 토큰을 다투다 일부 요청만 계속 밀리는 일이 없습니다)
+    """
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
 
-    Args:
-        region (str): 검색할 지역 (예: "서울")
-        keywords (list): 검색할 키워드 목록 (예: ["축제", "사고"])
+    def acquire(self, deadline):
+        """토큰을 얻을 때까지 기다립니다. deadline(time.monotonic 기준)까지 얻을 수 없으면 기다리지 않고 False를 반환합니다."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # 앞서 예약된 토큰만큼 음수가 될 수 있으며, 그만큼 더 기다려야 합니다.
+            wait = max(0.0, (1 - self.tokens) / self.rate)
+            if now + wait > deadline:
+                return False
+            self.tokens -= 1
+        if wait:
+            time.sleep(wait)
+        return True
 
-    Returns:
-        dict: 키워드를 key로, 제목 리스트를 value로 갖는 딕셔너리
+_buckets = {}
+_buckets_lock = threading.Lock()
+_fetch_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="news-fetch")
+_news_cache = None
+_news_cache_lock = threading.Lock()
+_news_flight = SingleFlight()
+
+def get_news_cache():
+    """검색 결과 캐시를 반환합니다. (처음 호출할 때 NEWS_CACHE_DB_PATH에 캐시 파일을 엽니다)"""
+    global _news_cache
+    with _news_cache_lock:
+        if _news_cache is None:
+            _news_cache = TTLCache(NEWS_CACHE_TTL, maxsize=NEWS_CACHE_SIZE, db_path=NEWS_CACHE_DB_PATH, table="news_cache")
+        return _news_cache
+
+def _bucket_for(url):
+    host = urllib.parse.urlsplit(url).netloc
+    with _buckets_lock:
+        if host not in _buckets:
+            _buckets[host] = TokenBucket(HOST_RATE_LIMIT, HOST_BURST)
+        return _buckets[host]
+
+def is_error(titles):
+    """검색에 실패한 결과(ERROR_TITLES)인지 확인합니다."""
+    return titles == ERROR_TITLES
+
+def _fetch_titles(region, keyword, timeout):
+    """
+    지역/키워드 한 쌍의 검색 결과 제목을 가져옵니다. (작업 스레드에서 실행됨)
+    기한은 이 요청이 속도 제한 대기를 시작할 때부터 timeout초이므로, 앞선 요청이 많아도 각 요청은 같은 시간을 받습니다.
     """
-    # 일부 웹사이트는 자동화된 요청을 차단하므로, 실제 브라우저처럼 보이게 헤더를 설정합니다.
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-    }
-    result = {}
-
-    for keyword in keywords:
-        # 한글 검색어가 URL에 포함될 수 있도록 인코딩합니다.
-        query = urllib.parse.quote_plus(f"{region} {keyword}")
-        # 'view' 탭을 사용하여 블로그, 카페 등 최신 정보를 우선 검색합니다.
-        url = f"https://search.naver.com/search.naver?where=view&query={query}"
-        
-        try:
-            # 웹페이지에 GET 요청을 보냅니다.
-            res = requests.get(url, headers=headers, timeout=10)
+    deadline = time.monotonic() + timeout
+    # 한글 검색어가 URL에 포함될 수 있도록 인코딩합니다.
+    query = urllib.parse.quote_plus(f"{region} {keyword}")
+    # 'view' 탭을 사용하여 블로그, 카페 등 최신 정보를 우선 검색합니다.
+    url = f"{NEWS_SEARCH_URL}?where=view&query={query}"
+
+    # 네이버의 과도한 요청 차단을 피하기 위해 호스트별 속도 제한을 따릅니다.
+    if not _bucket_for(url).acquire(deadline):
+        print(f"Error fetching data for {keyword}: 요청 대기 시간 초과")
+        return list(ERROR_TITLES)
+
+    try:
+        # 공용 클라이언트로 연결을 재사용하며, 재시도를 포함해 남은 기한 안에서만 응답을 기다립니다.
+        with metrics.span("news.fetch"):
+            res = http_client.get_client().get(url, headers=HEADERS, timeout=REQUEST_TIMEOUT, deadline=deadline)
             res.raise_for_status()  # 요청이 실패하면 예외를 발생시킵니다.
-            
+
+        titles = []
+        with metrics.span("news.parse"):
             # BeautifulSoup을 사용하여 HTML을 파싱합니다.
             soup = BeautifulSoup(res.text, "html.parser")
 
-            titles = []
             # view 탭의 제목은 'title_link' 클래스를 가진 a 태그에 주로 포함됩니다.
             for a_tag in soup.select("a.title_link"):
                 title = a_tag.get_text()
                 if title:
                     titles.append(title.strip())
-            
-            # 중복을 제거하고 최대 5개의 결과만 저장합니다.
-            result[keyword] = list(set(titles))[:5]
-            
-            # 네이버의 과도한 요청 차단을 피하기 위해 각 키워드 검색 사이에 약간의 지연을 줍니다.
-            time.sleep(0.5)
-
-        except requests.exceptions.RequestException as e:
-            # 네트워크 오류 발생 시 해당 키워드는 빈 결과로 처리합니다.
-            print(f"Error fetching data for {keyword}: {e}")
-            result[keyword] = ["오류: 관련 소식을 불러오는 데 실패했습니다."]
-            
-    return result
\ No newline at end of file
+
+        # 중복을 제거하고 최대 5개의 결과만 저장합니다.
+        return list(set(titles))[:5]
+
+    except requests.exceptions.RequestException as e:
+        # 네트워크 오류 발생 시 해당 키워드는 빈 결과로 처리합니다.
+        print(f"Error fetching data for {keyword}: {e}")
+        return list(ERROR_TITLES)
+
+def _fetch_and_cache(region, keyword, timeout):
+    titles = _fetch_titles(region, keyword, timeout)
+    # 오류 결과는 캐시하지 않아 다음 요청에서 다시 시도합니다.
+    if not is_error(titles):
+        get_news_cache().set((region, keyword), titles)
+    return titles
+
+def search_titles_multi(regions: list, keywords: list, deadline: float = REQUEST_DEADLINE, use_cache: bool = True) -> dict:
+    """
+    여러 지역과 키워드의 모든 조합을 동시에 스크래핑합니다.
+    전체 소요 시간은 키워드 x 지역 수가 아니라 호스트별 속도 제한에 따라 결정됩니다.
+    캐시에 남아 있는 (지역, 키워드) 결과는 다시 요청하지 않으며, 다른 스레드가 같은 쌍을 수집 중이면 그 결과를 함께 받습니다.
+
+    Args:
+        regions (list): 검색할 지역 목록 (예: ["서울", "대구"])
+        keywords (list): 검색할 키워드 목록 (예: ["축제", "사고"])
+        deadline (float): 각 요청이 (속도 제한 대기 시간을 포함해) 끝나야 하는 시간(초). 요청마다 따로 적용됩니다.
+        use_cache (bool): False이면 캐시를 무시하고 새로 수집합니다.
+
+    Returns:
+        dict: {지역: {키워드: 제목 리스트}} 형태의 딕셔너리
+    """
+    news_cache = get_news_cache()
+    result = {region: {} for region in regions}
+    futures = {}
+    for region in regions:
+        for keyword in keywords:
+            cached = news_cache.get((region, keyword)) if use_cache else None
+            metrics.inc("news_cache_total", result="miss" if cached is None else "hit")
+            if cached is not None:
+                result[region][keyword] = cached
+            else:
+                key = (region, keyword)
+                futures[key] = _fetch_pool.submit(_news_flight.do, key, lambda key=key: _fetch_and_cache(*key, deadline))
+
+    for (region, keyword), future in futures.items():
+        result[region][keyword] = future.result()
+
+    # 호출자가 요청한 키워드 순서를 유지합니다.
+    return {region: {keyword: result[region][keyword] for keyword in keywords} for region in regions}
+
+def search_titles(region: str, keywords: list) -> dict:
+    """
+    네이버 검색을 통해 특정 지역과 키워드에 맞는 최신 게시글 제목을 스크래핑합니다.
+
+    Args:
+        region (str): 검색할 지역 (예: "서울")
+        keywords (list): 검색할 키워드 목록 (예: ["축제", "사고"])
+
+    Returns:
+        dict: 키워드를 key로, 제목 리스트를 value로 갖는 딕셔너리
+    """
+    return search_titles_multi([region], keywords)[region]
@@ -1,9 +1,40 @@
-import sqlite3
 import hashlib
+import json
+import os
+import threading
 import bcrypt
+from storage import ManagedDatabase
 # Mailbox 클래스를 임포트합니다.
 from mail_box import Mailbox
 
+AUTH_CONFIG_FILE = "auth_config.json"
+# bcrypt 작업 비용(2^rounds 반복). 1 올릴 때마다 해시/로그인 시간이 약 두 배가 됩니다.
+# benchmarks/bcrypt_cost.py로 이 장비에서의 비용별 로그인 지연 시간을 확인한 뒤 정하세요.
+DEFAULT_BCRYPT_ROUNDS = 12
+MIN_BCRYPT_ROUNDS = 4
+MAX_BCRYPT_ROUNDS = 31
+
+def load_bcrypt_rounds():
+    """설정 파일에서 bcrypt 작업 비용을 불러옵니다. 없으면 기본값을 반환합니다."""
+    rounds = DEFAULT_BCRYPT_ROUNDS
+    if os.path.exists(AUTH_CONFIG_FILE):
+        with open(AUTH_CONFIG_FILE, 'r') as f:
+            rounds = json.load(f).get("bcrypt_rounds", DEFAULT_BCRYPT_ROUNDS)
+    if not isinstance(rounds, int) or not MIN_BCRYPT_ROUNDS <= rounds <= MAX_BCRYPT_ROUNDS:
+        raise ValueError(f"bcrypt_rounds는 {MIN_BCRYPT_ROUNDS}~{MAX_BCRYPT_ROUNDS} 사이의 정수여야 합니다: {rounds}")
+    return rounds
+
+def hash_rounds(password_hash):
+    """bcrypt 해시 문자열('$2b$12$...')에 기록된 작업 비용을 반환합니다."""
+    try:
+        return int(password_hash.split('$')[2])
+    except (IndexError, ValueError):
+        return None
+
+def generate_user_id(username):
+    """아이디를 SHA256으로 해싱하여 사용자 고유 ID로 사용합니다."""
+    return hashlib.sha256(username.encode()).hexdigest()
+
 class User:
     """사용자 정보를 담는 데이터 클래스입니다."""
     def __init__(self, user_id, username, name, password_hash, location):
@@ -17,16 +48,105 @@ class User:
     def get_id(self): return self.id
     def get_location(self): return self.location
 
-class AccountManager:
+def user_label(user_row):
+    """목록/선택 상자에 표시하는 '이름 (아이디)' 문자열을 반환합니다."""
+    _, name, username, _ = user_row
+    return f"{name} ({username})"
+
+class UserDirectory:
+    """
+    사용자 목록을 메모리에 보관하고 id, 아이디(username), 지역별로 색인하는 클래스입니다.
+    사용자 행은 get_all_users와 같은 (id, name, username, location) 튜플입니다.
+    AccountManager가 처음 한 번만 데이터베이스에서 불러오고, 이후 계정 생성/삭제 시 함께 갱신(write-through)합니다.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.by_id = {}
+        self.by_username = {}
+        self.by_location = {}
+        self.by_label = {}
+
+    def load(self, fetch_rows):
+        """
+        아직 불러오지 않았으면 fetch_rows()로 읽은 사용자 행으로 색인을 만듭니다.
+        조회부터 loaded 설정까지 잠금을 쥐고 있으므로, 그동안 커밋된 계정 생성/삭제는 잠금이 풀린 뒤 add/remove로 반영됩니다.
+        """
+        with self.lock:
+            if self.loaded:
+                return
+            self.by_id, self.by_username, self.by_location, self.by_label = {}, {}, {}, {}
+            for row in fetch_rows():
+                self._add(tuple(row))
+            self.loaded = True
+
+    def _add(self, row):
+        user_id, _, username, location = row
+        self.by_id[user_id] = row
+        self.by_username[username] = row
+        self.by_location.setdefault(location, {})[user_id] = row
+        self.by_label[user_label(row)] = row
+
+    def add(self, row):
+        """커밋된 새 사용자를 반영합니다. 아직 불러오지 않았다면 나중에 load가 데이터베이스에서 읽으므로 무시합니다."""
+        with self.lock:
+            if self.loaded:
+                self._add(tuple(row))
+
+    def remove(self, username):
+        with self.lock:
+            row = self.by_username.pop(username, None)
+            if row:
+                user_id, _, _, location = row
+                del self.by_id[user_id]
+                self.by_label.pop(user_label(row), None)
+                users = self.by_location.get(location, {})
+                users.pop(user_id, None)
+                if not users:
+                    self.by_location.pop(location, None)
+
+    def invalidate(self):
+        with self.lock:
+            self.loaded = False
+
+    def get(self, user_id):
+        return self.by_id.get(user_id)
+
+    def get_by_username(self, username):
+        return self.by_username.get(username)
+
+    def all(self, exclude_user_ids=()):
+        with self.lock:
+            return [row for user_id, row in self.by_id.items() if user_id not in exclude_user_ids]
+
+    def labels(self, exclude_user_ids=()):
+        """{'이름 (아이디)': 사용자 행} 딕셔너리를 반환합니다."""
+        with self.lock:
+            return {label: row for label, row in self.by_label.items() if row[0] not in exclude_user_ids}
+
+    def users_by_location(self, exclude_user_ids=()):
+        """{지역: [사용자 행, ...]} 딕셔너리를 반환합니다."""
+        with self.lock:
+            grouped = {}
+            for location, users in self.by_location.items():
+                rows = [row for user_id, row in users.items() if user_id not in exclude_user_ids]
+                if rows:
+                    grouped[location] = rows
+            return grouped
+
+class AccountManager(ManagedDatabase):
     """사용자 계정 데이터베이스 관리를 담당하는 클래스입니다."""
-    def __init__(self, db_path="users.db"):
-        self.conn = sqlite3.connect(db_path)
-        self.cursor = self.conn.cursor()
+    def __init__(self, db_path="users.db", bcrypt_rounds=None):
+        self.db_path = db_path
+        self.bcrypt_rounds = bcrypt_rounds or load_bcrypt_rounds()
         
-        # Mailbox 인스턴스를 생성합니다.
+        # Mailbox 인스턴스를 생성합니다. (연결은 공용 연결 관리자에서 공유됩니다)
         self.mailbox = Mailbox()
 
-        self._create_user_table()
+        # 최초 실행 시 _create_user_table에서 admin 계정을 만들며 admin_ids와 directory를 사용합니다.
+        self.admin_ids = set()
+        self.directory = UserDirectory()
+        self._ensure_schema(self._create_user_table)
         # admin_ids는 is_admin에서 사용되므로 로드합니다.
         self._load_admin_ids()
 
@@ -36,7 +156,7 @@ class AccountManager:
                 id TEXT PRIMARY KEY, username TEXT UNIQUE NOT NULL,
                 name TEXT NOT NULL, password TEXT NOT NULL, location TEXT NOT NULL 
             )''')
-        self.conn.commit()
+        self._commit()
         # 'admin' 계정이 없으면 생성합니다.
         self.cursor.execute("SELECT * FROM users WHERE username='admin'")
         if not self.cursor.fetchone():
@@ -47,10 +167,10 @@ class AccountManager:
         self.admin_ids = {row[0] for row in self.cursor.fetchall()}
 
     def _hash_password(self, password):
-        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=self.bcrypt_rounds))
     
     def _generate_id(self, username):
-        return hashlib.sha256(username.encode()).hexdigest()
+        return generate_user_id(username)
     
     def login(self, username, password):
         self.cursor.execute("SELECT id, username, name, password, location FROM users WHERE username = ?", (username,))
@@ -58,9 +178,19 @@ class AccountManager:
         if row:
             user_id, db_username, name, stored_hash_str, location = row
             if bcrypt.checkpw(password.encode('utf-8'), stored_hash_str.encode('utf-8')):
+                if hash_rounds(stored_hash_str) != self.bcrypt_rounds:
+                    stored_hash_str = self._rehash_password(user_id, password)
                 return User(user_id, db_username, name, stored_hash_str, location)
         return None
 
+    def _rehash_password(self, user_id, password):
+        """설정된 작업 비용이 바뀌었으면 로그인에 성공한 비밀번호로 해시를 다시 만들어 저장합니다."""
+        new_hash = self._hash_password(password).decode('utf-8')
+        self.cursor.execute("UPDATE users SET password = ? WHERE id = ?", (new_hash, user_id))
+        self._commit()
+        print(f"비밀번호 해시를 작업 비용 {self.bcrypt_rounds}(으)로 다시 저장했습니다.")
+        return new_hash
+
     def is_admin(self, user):
         return user.get_id() in self.admin_ids if user else False
 
@@ -74,35 +204,52 @@ class AccountManager:
         
         self.cursor.execute("INSERT INTO users (id, username, name, password, location) VALUES (?, ?, ?, ?, ?)",
                             (new_id, username, name, hashed_pw, location))
-        self.conn.commit()
+        self._commit()
         
         if username == 'admin': self.admin_ids.add(new_id)
+        self.directory.add((new_id, name, username, location))
         return True
 
     def delete_user(self, username):
         if username == 'admin':
             raise ValueError("초기 관리자 계정은 삭제할 수 없습니다.")
         self.cursor.execute("DELETE FROM users WHERE username = ?", (username,))
-        self.conn.commit()
-        return self.cursor.rowcount > 0
+        self._commit()
+        deleted = self.cursor.rowcount > 0
+        if deleted: self.directory.remove(username)
+        return deleted
+
+    def get_directory(self):
+        """
+        사용자 디렉터리를 반환합니다. 처음 호출될 때 한 번만 데이터베이스에서 불러옵니다.
+        (다른 프로세스에서 바뀐 계정은 directory.invalidate() 후 다시 불러와야 반영됩니다)
+        """
+        if not self.directory.loaded:
+            self.directory.load(lambda: self.cursor.execute("SELECT id, name, username, location FROM users").fetchall())
+        return self.directory
+
+    def _excluded_ids(self, exclude_user_id=None):
+        excluded = set(self.admin_ids)
+        if exclude_user_id:
+            excluded.add(exclude_user_id)
+        return excluded
 
     def get_all_users(self, exclude_user_id=None):
         """
-        모든 사용자 목록을 반환합니다.
+        모든 사용자 목록을 (id, name, username, location) 튜플 목록으로 반환합니다. (데이터베이스를 읽지 않습니다)
         - exclude_user_id: 제공된 user_id를 가진 사용자는 목록에서 제외됩니다.
         - 'admin' 사용자는 항상 제외됩니다.
         """
-        # *** 수정된 부분: 쿼리 로직을 명확하게 수정합니다. ***
-        query = "SELECT id, name, username, location FROM users WHERE username != ?"
-        params = ['admin']
+        return self.get_directory().all(self._excluded_ids(exclude_user_id))
 
-        if exclude_user_id:
-            query += " AND id != ?"
-            params.append(exclude_user_id)
-            
-        self.cursor.execute(query, params)
-        return self.cursor.fetchall()
+    def get_user_choices(self, exclude_user_id=None):
+        """선택 상자용 {'이름 (아이디)': 사용자 행} 딕셔너리를 반환합니다. ('admin'은 항상 제외)"""
+        return self.get_directory().labels(self._excluded_ids(exclude_user_id))
+
+    def users_by_location(self, exclude_user_id=None):
+        """지역별 사용자 목록 {지역: [사용자 행, ...]}을 반환합니다. ('admin'은 항상 제외)"""
+        return self.get_directory().users_by_location(self._excluded_ids(exclude_user_id))
 
     def close_connection(self):
-        self.conn.close()
+        self.close()
         self.mailbox.close()
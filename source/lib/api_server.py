@@ -0,0 +1,319 @@
+import json
+import re
+import secrets
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from cache import TTLCache
+from inventory import Inventory, Item, INVENTORY_PAGE_SIZE, generate_item_id
+from mail_box import MAIL_PAGE_SIZE
+from Analyze import format_prediction
+import metrics
+from storage import get_connection_manager
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+# keep-alive 연결이 요청 없이 유지되는 최대 시간(초). 이 시간이 지나면 연결을 닫고 처리 스레드도 끝납니다.
+KEEP_ALIVE_TIMEOUT = 15
+# 로그인 토큰의 유효 시간(초)과 동시에 유지하는 최대 세션 수
+TOKEN_TTL = 8 * 3600
+MAX_SESSIONS = 1024
+MAX_BODY_BYTES = 1024 * 1024
+MAX_PAGE_LIMIT = 1000
+
+class ApiError(Exception):
+    """HTTP 상태 코드와 함께 클라이언트에 돌려줄 오류입니다."""
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def _page_limit(query, default):
+    try:
+        limit = int(query.get("limit", [default])[0])
+    except ValueError:
+        raise ValueError("limit은 숫자여야 합니다.")
+    return max(1, min(limit, MAX_PAGE_LIMIT))
+
+def _item_dict(item):
+    return {"name": item.name, "item_id": item.item_id, "quantity": item.quantity,
+            "price": item.price, "cost": item.cost, "category": item.category}
+
+def _mail_dict(mail):
+    data = {"id": mail.mail_id, "sender_name": mail.sender_name, "sender_id": mail.sender_id,
+            "timestamp": mail.timestamp, "created_at": mail.created_at, "is_read": mail.is_read}
+    if mail.message is not None:
+        data["message"] = mail.message
+    return data
+
+class ApiHandler(BaseHTTPRequestHandler):
+    """
+    로컬 JSON API 요청 처리기입니다. 모든 요청/응답 본문은 JSON이며,
+    로그인 후 받은 토큰을 'Authorization: Bearer <토큰>' 헤더로 보내야 합니다.
+
+    POST   /api/login                 {"username", "password"} -> {"token", "user"}
+    POST   /api/logout
+    GET    /api/me
+    GET    /api/health                모델 준비 여부와 예약 작업 상태 (토큰 불필요)
+    POST   /api/jobs/<name>/run       예약 작업을 즉시 한 번 실행 (관리자만, 예약된 다음 실행 시각은 그대로)
+    GET    /metrics                   Prometheus 텍스트 형식 성능 지표 (계측이 켜져 있을 때만, 토큰 불필요)
+    GET    /api/inventory             ?after=<item_id>&limit=&user=<아이디(관리자만)>
+    POST   /api/inventory             {"name", "quantity", "price", "cost", "category"}
+    PUT    /api/inventory/<item_id>   변경할 필드만 전달 (name을 바꾸면 item_id도 바뀝니다)
+    DELETE /api/inventory/<item_id>
+    GET    /api/mail                  ?before=<created_at>:<id>&limit= (본문 제외, 안 읽은 메일 수 포함)
+    GET    /api/mail/<id>             본문 포함, 읽음으로 표시
+    POST   /api/mail                  {"to": 받는 사람 아이디, "message"}
+    POST   /api/predict               {"categories": [...]} 사용자 지역의 현재 날씨/소식으로 예측
+    """
+    ROUTES = [
+        ("POST", r"/api/login", "login"),
+        ("POST", r"/api/logout", "logout"),
+        ("GET", r"/api/me", "me"),
+        ("GET", r"/api/health", "health"),
+        ("POST", r"/api/jobs/(?P<name>\w+)/run", "run_job"),
+        ("GET", r"/api/inventory", "list_items"),
+        ("POST", r"/api/inventory", "add_item"),
+        ("PUT", r"/api/inventory/(?P<item_id>[0-9a-f]+)", "update_item"),
+        ("DELETE", r"/api/inventory/(?P<item_id>[0-9a-f]+)", "delete_item"),
+        ("GET", r"/api/mail", "list_mail"),
+        ("GET", r"/api/mail/(?P<mail_id>\d+)", "read_mail"),
+        ("POST", r"/api/mail", "send_mail"),
+        ("POST", r"/api/predict", "predict"),
+        ("GET", r"/metrics", "prometheus_metrics"),
+    ]
+    PUBLIC = {"login", "health", "prometheus_metrics"}
+    protocol_version = "HTTP/1.1"
+    timeout = KEEP_ALIVE_TIMEOUT
+
+    def do_GET(self): self._dispatch("GET")
+    def do_POST(self): self._dispatch("POST")
+    def do_PUT(self): self._dispatch("PUT")
+    def do_DELETE(self): self._dispatch("DELETE")
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def log_message(self, format, *args):
+        print(f"[API] {self.address_string()} {format % args}")
+
+    def _dispatch(self, method):
+        try:
+            self._handle(method)
+        finally:
+            # keep-alive 연결이 요청 사이에 스레드별 DB 연결을 붙잡고 있으면 연결 한도(MAX_CONNECTIONS_PER_DB)가 금방 차므로,
+            # 요청이 끝날 때마다 이 스레드의 연결을 돌려줍니다.
+            get_connection_manager().release_thread()
+
+    def _handle(self, method):
+        url = urlsplit(self.path)
+        self.query = parse_qs(url.query)
+        try:
+            for route_method, pattern, name in self.ROUTES:
+                match = re.fullmatch(pattern, url.path)
+                if match and route_method == method:
+                    self.user = None if name in self.PUBLIC else self._authenticate()
+                    with metrics.span("api", route=name):
+                        status, data = getattr(self, name)(**match.groupdict())
+                    break
+            else:
+                raise ApiError(404, "요청한 API가 없습니다.")
+            if isinstance(data, str):
+                self._send(status, data.encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8")
+                return
+        except ApiError as e:
+            status, data = e.status, {"error": str(e)}
+        except ValueError as e:
+            status, data = 400, {"error": str(e)}
+        except Exception as e:
+            print(f"API 요청 처리 중 오류 발생: {e}")
+            status, data = 500, {"error": "서버 내부 오류가 발생했습니다."}
+        self._send_json(status, data)
+
+    def _send_json(self, status, data):
+        # 예측 결과의 numpy 숫자 등은 파이썬 기본 타입으로 바꿔서 직렬화합니다.
+        body = json.dumps(data, ensure_ascii=False, default=lambda value: value.item() if hasattr(value, "item") else str(value)).encode("utf-8")
+        self._send(status, body, "application/json; charset=utf-8")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "요청 본문이 너무 큽니다.")
+        if not length:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            raise ValueError("요청 본문이 올바른 JSON이 아닙니다.")
+        if not isinstance(data, dict):
+            raise ValueError("요청 본문은 JSON 객체여야 합니다.")
+        return data
+
+    def _token(self):
+        header = self.headers.get("Authorization", "")
+        return header[len("Bearer "):].strip() if header.startswith("Bearer ") else None
+
+    def _authenticate(self):
+        token = self._token()
+        user = self.server.sessions.get(token) if token else None
+        if user is None:
+            raise ApiError(401, "로그인이 필요합니다.")
+        return user
+
+    def _user_dict(self, user):
+        return {"id": user.get_id(), "username": user.get_username(), "name": user.get_name(),
+                "location": user.get_location(), "is_admin": self.service.account_manager.is_admin(user)}
+
+    def _inventory(self):
+        location = self.user.get_location()
+        return Inventory(context_provider=lambda: self.service.demand_contexts.get(location))
+
+    # --- 인증 ---
+    def login(self):
+        data = self._read_json()
+        user = self.service.account_manager.login(str(data.get("username", "")), str(data.get("password", "")))
+        if user is None:
+            raise ApiError(401, "아이디 또는 비밀번호가 잘못되었습니다.")
+        token = secrets.token_urlsafe(32)
+        self.server.sessions.set(token, user)
+        return 200, {"token": token, "user": self._user_dict(user)}
+
+    def logout(self):
+        self.server.sessions.invalidate(self._token())
+        return 200, {"ok": True}
+
+    def me(self):
+        return 200, self._user_dict(self.user)
+
+    def health(self):
+        return 200, {"model_ready": self.service.model_ready(), "jobs": self.service.scheduler.stats()}
+
+    def run_job(self, name):
+        if not self.service.account_manager.is_admin(self.user):
+            raise ApiError(403, "예약 작업은 관리자만 실행할 수 있습니다.")
+        if name not in self.service.scheduler.jobs:
+            raise ApiError(404, f"'{name}' 작업이 없습니다.")
+        if not self.service.scheduler.run_now(name):
+            raise ApiError(409, f"'{name}' 작업이 이미 실행 중이거나 스케줄러가 멈춰 있습니다.")
+        return 202, {"started": True}
+
+    def prometheus_metrics(self):
+        if not metrics.ENABLED:
+            raise ApiError(404, "성능 지표 수집이 꺼져 있습니다.")
+        return 200, metrics.REGISTRY.render_prometheus()
+
+    # --- 인벤토리 ---
+    def list_items(self):
+        owner_id = self.user.get_id()
+        username = self.query.get("user", [None])[0]
+        if username and username != self.user.get_username():
+            if not self.service.account_manager.is_admin(self.user):
+                raise ApiError(403, "다른 사용자의 인벤토리는 관리자만 조회할 수 있습니다.")
+            row = self.service.account_manager.get_directory().get_by_username(username)
+            if row is None:
+                raise ApiError(404, f"'{username}' 사용자가 없습니다.")
+            owner_id = row[0]
+        limit = _page_limit(self.query, INVENTORY_PAGE_SIZE)
+        items = self._inventory().list_items_page(owner_id, self.query.get("after", [None])[0], limit)
+        return 200, {"items": [_item_dict(item) for item in items],
+                     "next": items[-1].item_id if len(items) == limit else None}
+
+    def add_item(self):
+        data = self._read_json()
+        try:
+            item = Item(str(data.get("name", "")).strip(), int(data["quantity"]), int(data["price"]),
+                        int(data["cost"]), data.get("category") or "기타")
+        except (KeyError, TypeError):
+            raise ValueError("name, quantity, price, cost 값이 필요하며 수량, 가격, 원가는 숫자여야 합니다.")
+        self._inventory().add_item(self.user.get_id(), item)
+        return 201, _item_dict(item)
+
+    def update_item(self, item_id):
+        data = self._read_json()
+        changes = {}
+        try:
+            for key in ("quantity", "price", "cost"):
+                if key in data:
+                    changes[key] = int(data[key])
+        except (TypeError, ValueError):
+            raise ValueError("수량, 가격, 원가는 숫자여야 합니다.")
+        if data.get("category"):
+            changes["category"] = str(data["category"])
+        if data.get("name"):
+            changes.update(name=str(data["name"]).strip(), item_id=generate_item_id(str(data["name"]).strip()))
+        if not changes:
+            raise ValueError("변경할 값이 없습니다.")
+        inventory = self._inventory()
+        if inventory.get_item(self.user.get_id(), item_id) is None:
+            raise ApiError(404, "아이템을 찾을 수 없습니다.")
+        inventory.update_item(self.user.get_id(), item_id, **changes)
+        return 200, {"item_id": changes.get("item_id", item_id)}
+
+    def delete_item(self, item_id):
+        self._inventory().delete_item(self.user.get_id(), item_id)
+        return 200, {"ok": True}
+
+    # --- 메일 ---
+    def list_mail(self):
+        before = self.query.get("before", [None])[0]
+        if before:
+            try:
+                created_at, mail_id = (int(value) for value in before.split(":", 1))
+            except ValueError:
+                raise ValueError("before는 '<created_at>:<id>' 형식이어야 합니다.")
+            before = (created_at, mail_id)
+        limit = _page_limit(self.query, MAIL_PAGE_SIZE)
+        mailbox = self.service.account_manager.mailbox
+        mails = mailbox.get_mails_for_user(self.user.get_id(), before=before, limit=limit, include_body=False)
+        total, unread = mailbox.get_mail_counts(self.user.get_id())
+        next_key = "%d:%d" % mails[-1].page_key if len(mails) == limit else None
+        return 200, {"mails": [_mail_dict(mail) for mail in mails], "next": next_key, "total": total, "unread": unread}
+
+    def read_mail(self, mail_id):
+        mailbox = self.service.account_manager.mailbox
+        mail = mailbox.get_mail(int(mail_id))
+        if mail is None or mail.receiver_id != self.user.get_id():
+            raise ApiError(404, "메일을 찾을 수 없습니다.")
+        if not mail.is_read:
+            mailbox.mark_read(mail.mail_id)
+            mail.is_read = True
+        return 200, _mail_dict(mail)
+
+    def send_mail(self):
+        data = self._read_json()
+        receiver = self.service.account_manager.get_directory().get_by_username(str(data.get("to", "")))
+        if receiver is None:
+            raise ApiError(404, "받는 사람을 찾을 수 없습니다.")
+        self.service.account_manager.mailbox.send_mail(self.user.get_name(), self.user.get_id(), receiver[0], str(data.get("message", "")).strip())
+        return 201, {"ok": True}
+
+    # --- 수요 예측 ---
+    def predict(self):
+        categories = self._read_json().get("categories")
+        if not isinstance(categories, list) or not categories or not all(isinstance(c, str) for c in categories):
+            raise ValueError("categories는 카테고리 문자열 목록이어야 합니다.")
+        results = self.service.predict_demand(self.user.get_location(), categories)
+        return 200, {"location": self.user.get_location(),
+                     "predictions": [dict(result, category=category, text=format_prediction(result))
+                                     for category, result in zip(categories, results)]}
+
+class ApiServer(ThreadingHTTPServer):
+    """
+    클라이언트 연결마다 스레드 하나로 요청을 처리하는 HTTP 서버입니다.
+    keep-alive 연결은 그 연결의 스레드를 요청 사이에 재사용하며, DB 연결은 요청이 끝날 때마다 연결 관리자에 돌려줍니다.
+    열린 연결이 많아도 다른 클라이언트의 요청이 기다리지 않습니다. (요청 없이 열린 연결은 KEEP_ALIVE_TIMEOUT 후 닫힘)
+    모든 요청이 같은 AppService(모델, 연결 관리자, 사용자 디렉터리)를 공유합니다.
+    """
+    daemon_threads = True
+
+    def __init__(self, service, host=API_HOST, port=API_PORT):
+        super().__init__((host, port), ApiHandler)
+        self.service = service
+        self.sessions = TTLCache(ttl=TOKEN_TTL, maxsize=MAX_SESSIONS)
@@ -0,0 +1,69 @@
+import csv
+import json
+import os
+import time
+
+# 가져오기/내보내기 파일의 컬럼 (item_id는 이름으로부터 계산되므로 가져올 때는 무시합니다)
+EXPORT_COLUMNS = ["name", "item_id", "quantity", "price", "cost", "category"]
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+class BulkResult:
+    """대량 가져오기/내보내기 결과 (처리 행 수와 소요 시간)를 담는 클래스입니다."""
+    def __init__(self, rows, seconds):
+        self.rows = rows
+        self.seconds = seconds
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+    def __str__(self):
+        return f"{self.rows}행, {self.seconds:.2f}초 ({self.rows_per_second:,.0f}행/초)"
+
+def detect_format(path, fmt=None):
+    """확장자로 파일 형식(csv/jsonl)을 판단합니다."""
+    fmt = fmt or FORMATS.get(os.path.splitext(path)[1].lower())
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {path} (csv, jsonl만 지원)")
+    return fmt
+
+def _to_row(record, line_no):
+    try:
+        return (str(record["name"]).strip(), int(record["quantity"]), int(record["price"]),
+                int(record["cost"]), (record.get("category") or "기타").strip())
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"{line_no}번째 행의 형식이 올바르지 않습니다: {e}")
+
+def read_items(path, fmt=None):
+    """CSV 또는 JSON Lines 파일에서 (name, quantity, price, cost, category) 튜플을 한 행씩 읽습니다."""
+    fmt = detect_format(path, fmt)
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if fmt == "csv":
+            for line_no, record in enumerate(csv.DictReader(f), 2):
+                yield _to_row(record, line_no)
+        else:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield _to_row(json.loads(line), line_no)
+
+def import_items(inventory, owner_id, path, fmt=None):
+    """파일의 아이템을 하나의 트랜잭션으로 일괄 저장(upsert)하고 BulkResult를 반환합니다."""
+    started = time.perf_counter()
+    rows = inventory.bulk_upsert(owner_id, read_items(path, fmt))
+    return BulkResult(rows, time.perf_counter() - started)
+
+def export_items(inventory, owner_id, path, fmt=None):
+    """사용자의 아이템을 페이지 단위로 읽어 CSV 또는 JSON Lines 파일로 내보내고 BulkResult를 반환합니다."""
+    fmt = detect_format(path, fmt)
+    started, rows = time.perf_counter(), 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_COLUMNS)
+        for item in inventory.iter_items(owner_id):
+            if writer:
+                writer.writerow(item.to_tuple())
+            else:
+                f.write(json.dumps(dict(zip(EXPORT_COLUMNS, item.to_tuple())), ensure_ascii=False) + "\n")
+            rows += 1
+    return BulkResult(rows, time.perf_counter() - started)
@@ -0,0 +1,117 @@
+import threading
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from storage import connect
+
+class TTLCache:
+    """
+    만료 시간(TTL)과 LRU 제거 정책을 가진 스레드 안전 캐시입니다.
+    db_path를 지정하면 작은 SQLite 테이블에도 기록하여 재시작 후나 다른 인스턴스와도 결과를 공유합니다.
+    (SQLite에 저장하는 키와 값은 JSON으로 직렬화할 수 있어야 합니다.)
+    """
+    def __init__(self, ttl, maxsize=256, db_path=None, table="cache_entries"):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.table = table
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.conn = None
+        if db_path:
+            self.conn = connect(db_path, check_same_thread=False)
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)")
+            self.conn.commit()
+
+    @staticmethod
+    def _db_key(key):
+        return json.dumps(list(key) if isinstance(key, tuple) else key, ensure_ascii=False)
+
+    def _remember(self, key, value, expires_at):
+        self.entries[key] = (expires_at, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get(self, key, default=None):
+        """만료되지 않은 값을 반환합니다. 없으면 default를 반환합니다."""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > now:
+                self.entries.move_to_end(key)
+                return entry[1]
+            if entry:
+                del self.entries[key]
+            if self.conn is None:
+                return default
+
+            row = self.conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (self._db_key(key),)).fetchone()
+            if not row or row[1] <= now:
+                return default
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            return value
+
+    def set(self, key, value, ttl=None, expires_at=None):
+        """값을 저장합니다. expires_at(time.time 기준)이 주어지면 ttl 대신 해당 시각에 만료됩니다."""
+        if expires_at is None:
+            expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self.lock:
+            self._remember(key, value, expires_at)
+            if self.conn is not None:
+                self.conn.execute(f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                                  (self._db_key(key), json.dumps(value, ensure_ascii=False), expires_at))
+                # 만료된 항목도 함께 정리합니다.
+                self.conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (time.time(),))
+                self.conn.commit()
+
+    def invalidate(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+            if self.conn is not None:
+                self.conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (self._db_key(key),))
+                self.conn.commit()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            if self.conn is not None:
+                self.conn.execute(f"DELETE FROM {self.table}")
+                self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+class SingleFlight:
+    """
+    같은 키에 대한 동시 요청을 하나로 합칩니다.
+    먼저 도착한 호출만 실제로 함수를 실행하고, 나머지는 그 결과(또는 예외)를 함께 받습니다.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+
+    def do(self, key, fn):
+        with self.lock:
+            future = self.calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self.calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                del self.calls[key]
+        return future.result()
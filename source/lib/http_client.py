@@ -0,0 +1,146 @@
+import random
+import threading
+import time
+import urllib.parse
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+
+# 기본 연결 풀/재시도 설정
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 8
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_BASE = 0.5
+DEFAULT_BACKOFF_MAX = 8.0
+DEFAULT_TIMEOUT = 10
+
+class HostStats:
+    """호스트별 요청 수, 재시도 수, 실패 수와 지연 시간 통계를 보관합니다."""
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def to_dict(self):
+        avg = self.total_latency / self.requests if self.requests else 0.0
+        return {"requests": self.requests, "retries": self.retries, "failures": self.failures,
+                "avg_latency": avg, "max_latency": self.max_latency}
+
+class HttpClient:
+    """
+    호스트별로 연결을 재사용(keep-alive)하는 공용 HTTP 클라이언트입니다.
+    5xx 응답과 타임아웃/연결 오류는 지터가 포함된 지수 백오프로 재시도하며,
+    호출별 지연 시간과 재시도 통계를 호스트 단위로 기록합니다.
+    """
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE,
+                 backoff_max=DEFAULT_BACKOFF_MAX, timeout=DEFAULT_TIMEOUT):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.sessions = {}
+        self.host_stats = {}
+        self.lock = threading.Lock()
+
+    def _session_for(self, host):
+        with self.lock:
+            session = self.sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # 재시도는 아래에서 직접 처리하므로 어댑터 자체의 재시도는 끕니다.
+                adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self.sessions[host] = session
+                self.host_stats[host] = HostStats()
+            return session
+
+    def _backoff(self, attempt):
+        """전체 지터(full jitter) 방식의 지수 백오프 대기 시간을 계산합니다."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _record(self, host, latency, retries, failed):
+        if metrics.ENABLED:
+            metrics.observe("http_request_seconds", latency, host=host)
+            metrics.inc("http_requests_total", host=host, result="error" if failed else "ok")
+            if retries:
+                metrics.inc("http_retries_total", retries, host=host)
+        with self.lock:
+            stats = self.host_stats[host]
+            stats.requests += 1
+            stats.retries += retries
+            stats.failures += 1 if failed else 0
+            stats.total_latency += latency
+            stats.max_latency = max(stats.max_latency, latency)
+
+    def get(self, url, params=None, headers=None, timeout=None, deadline=None):
+        """
+        GET 요청을 보냅니다. deadline(time.monotonic 기준)이 주어지면 재시도와 타임아웃이 그 시각을 넘지 않습니다.
+        재시도 후에도 5xx이면 마지막 응답을 반환하고, 네트워크 오류가 계속되면 마지막 예외를 발생시킵니다.
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        session = self._session_for(host)
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            request_timeout = timeout
+            if deadline is not None:
+                request_timeout = max(0.1, min(timeout, deadline - time.monotonic()))
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=request_timeout)
+                error = None
+                retryable = response.status_code >= 500
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                response, error, retryable = None, e, True
+            except requests.exceptions.RequestException:
+                self._record(host, time.monotonic() - started, attempt, True)
+                raise
+
+            wait = self._backoff(attempt) if retryable and attempt < self.max_retries else None
+            if wait is not None and deadline is not None and time.monotonic() + wait >= deadline:
+                wait = None
+            if wait is None:
+                self._record(host, time.monotonic() - started, attempt, error is not None or retryable)
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(wait)
+            attempt += 1
+
+    def stats(self):
+        """호스트별 통계의 스냅샷을 반환합니다."""
+        with self.lock:
+            return {host: stats.to_dict() for host, stats in self.host_stats.items()}
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """모든 외부 요청이 함께 사용하는 공용 HttpClient를 반환합니다."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+def configure(**kwargs):
+    """공용 HttpClient를 새 설정(풀 크기, 재시도 횟수 등)으로 교체합니다."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = HttpClient(**kwargs)
+        return _client
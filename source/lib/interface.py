@@ -2,86 +2,85 @@
 
 import tkinter as tk
 from tkinter import ttk, scrolledtext
-from tkinter import messagebox
-import hashlib
-import requests
+from tkinter import messagebox, filedialog
 import json
-import math
-from datetime import datetime, timedelta
-import threading
+from datetime import datetime
+import bisect
 
-from inventory import Inventory, Item
-from account_management import AccountManager
+from inventory import Inventory, Item, INVENTORY_PAGE_SIZE, generate_item_id
+from bulk_io import import_items, export_items
 from Localinfo import search_titles
-from mail_box import Mailbox
-from Analyze import load_model_and_columns, predict_demand
-from timer import Timer
+from mail_box import Mailbox, MAIL_PAGE_SIZE
+from Analyze import format_prediction
+from tk_executor import TkExecutor
+from weather import get_region_weather
+from regions import get_registry
+from service import AppService
 
 # --- 1. 설정 부분 ---
-KMA_API_KEY = "여기에 api key가 필요" 
-CITY_COORDINATES = {
-    "서울": {"lat": 37.5665, "lon": 126.9780},
-    "대구": {"lat": 35.8714, "lon": 128.6014}
-}
 CATEGORIES = ["문구", "생활용품", "전자기기", "음료", "식품", "기타"]
 NEWS_KEYWORDS = ["축제", "행사", "사고", "정전", "공연", "폭염", "미세먼지"]
 
-
 # --- 2. 헬퍼 함수 ---
-def dfs_grid_conv(lat, lon):
-    RE = 6371.00877; GRID = 5.0; SLAT1 = 30.0; SLAT2 = 60.0; OLON = 126.0; OLAT = 38.0; XO = 43; YO = 136
-    DEGRAD = math.pi / 180.0; re = RE / GRID; slat1 = SLAT1 * DEGRAD; slat2 = SLAT2 * DEGRAD
-    olon = OLON * DEGRAD; olat = OLAT * DEGRAD; sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
-    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn); sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
-    sf = (math.pow(sf, sn) * math.cos(slat1)) / sn; ro = math.tan(math.pi * 0.25 + olat * 0.5)
-    ro = (re * sf) / math.pow(ro, sn); ra = math.tan(math.pi * 0.25 + lat * DEGRAD * 0.5)
-    ra = (re * sf) / math.pow(ra, sn); theta = lon * DEGRAD - olon
-    if theta > math.pi: theta -= 2.0 * math.pi
-    if theta < -math.pi: theta += 2.0 * math.pi
-    theta *= sn; x = math.floor(ra * math.sin(theta) + XO + 0.5); y = math.floor(ro - ra * math.cos(theta) + YO + 0.5)
-    return int(x), int(y)
-
-def get_kma_weather(lat, lon):
-    if not KMA_API_KEY or '여기에' in KMA_API_KEY: return {"error": "기상청 API 키를 설정해주세요."}
-    nx, ny = dfs_grid_conv(lat, lon); now = datetime.now() - timedelta(hours=1)
-    base_date = now.strftime('%Y%m%d'); base_time = now.strftime('%H00')
-    api_url = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst"
-    params = {"serviceKey": KMA_API_KEY, "pageNo": "1", "numOfRows": "100", "dataType": "JSON",
-              "base_date": base_date, "base_time": base_time, "nx": str(nx), "ny": str(ny)}
-    try:
-        response = requests.get(api_url, params=params, timeout=10); response.raise_for_status()
-        data = response.json()
-        if data['response']['header']['resultCode'] != '00': return {"error": f"API 오류: {data['response']['header']['resultMsg']}"}
-        items = data['response']['body']['items']['item']; weather_info = {}
-        category_map = {'T1H': '온도', 'RN1': '강수량', 'REH': '습도', 'PTY': '강수형태'}
-        pty_map = {'0': '없음', '1': '비', '2': '비/눈', '3': '눈', '5': '빗방울', '6': '빗방울눈날림', '7': '눈날림'}
-        for item in items:
-            cat, value = item['category'], item.get('fcstValue')
-            if cat in category_map and value:
-                weather_info[category_map[cat]] = pty_map.get(value, value) if cat == 'PTY' else value
-        weather_info['is_raining'] = weather_info.get('강수형태', '없음') in ['비', '비/눈', '빗방울', '빗방울눈날림']
-        return weather_info
-    except Exception as e: return {"error": f"날씨 정보 처리 중 오류: {e}"}
+# 날씨 관련 헬퍼(격자 좌표 변환, 기상청 API 호출과 캐시)는 weather.py,
+# 화면과 무관한 백엔드 기능(모델, 예약 작업, 자동 알림)은 service.py에 있습니다.
 
 # --- 3. 메인 애플리케이션 클래스 ---
 class MainApp:
-    def __init__(self, master):
+    """Tk 화면입니다. 실제 기능은 공유 백엔드(AppService)를 사용하며, 같은 서비스를 API 서버와 함께 쓸 수 있습니다."""
+    def __init__(self, master, service=None):
         self.master = master
         self.master.protocol("WM_DELETE_WINDOW", self._on_closing)
-        self.account_manager = AccountManager()
+        self.owns_service = service is None
+        self.service = service or AppService()
+        self.account_manager = self.service.account_manager
+        self.scheduler = self.service.scheduler
         self.logged_in_user = None
-        self.classifier, self.regressor, self.model_columns = load_model_and_columns()
-        
-        self.news_timer = Timer(callback=self.send_periodic_news)
-        self.news_timer.start()
+        self.retrain_process = None
+        # 네트워크/bcrypt/대량 DB 작업은 백그라운드에서 실행하고 결과만 UI 스레드에서 처리합니다.
+        self.executor = TkExecutor(master)
+        # 자동 알림 메일이 발송되면 메인 메뉴의 안 읽은 메일 수 표시를 UI 스레드에서 갱신합니다.
+        self.service.mail_listeners.append(lambda: self.executor.call_in_ui(self.update_mail_badge))
+        if self.owns_service: self.service.start()
 
         self.show_login_screen()
 
     def _on_closing(self):
-        self.news_timer.stop()
-        self.account_manager.close_connection()
+        self.executor.close()
+        if self.owns_service: self.service.close()
         self.master.destroy()
 
+    def get_demand_model(self):
+        """(작업 스레드에서 호출) 모델 로딩이 끝날 때까지 기다린 뒤 DemandModel을 반환합니다."""
+        return self.service.get_demand_model()
+
+    def remember_demand_context(self, location, weather_data=None, event_data=None):
+        self.service.remember_demand_context(location, weather_data, event_data)
+
+    def start_retraining(self):
+        process = self.service.start_retraining()
+        if process is None:
+            messagebox.showinfo("알림", "이미 재학습이 진행 중입니다.", parent=self.master); return
+        self.retrain_process = process
+        messagebox.showinfo("알림", "실제 재고 이력으로 수요 예측 모델 재학습을 시작합니다.", parent=self.master)
+        self.master.after(1000, self._poll_retraining)
+
+    def _poll_retraining(self):
+        if self.retrain_process.is_alive():
+            self.master.after(1000, self._poll_retraining); return
+        if self.retrain_process.exitcode == 0:
+            self.service.reload_model()
+
+    def show_scheduler_stats(self):
+        lines = []
+        for name, stats in self.scheduler.stats().items():
+            next_run = datetime.fromtimestamp(stats["next_run"]).strftime('%m-%d %H:%M:%S') if stats["next_run"] else "-"
+            lines.append(f"[{name}] {stats['schedule']} / 다음 실행 {next_run}{' (실행 중)' if stats['running'] else ''}\n"
+                         f"  실행 {stats['runs']}회, 실패 {stats['failures']}회, 건너뜀 {stats['skipped']}회, "
+                         f"평균 {stats['avg_duration']:.1f}초, 최근 {stats['last_duration']:.1f}초"
+                         + (f"\n  최근 오류: {stats['last_error']}" if stats["last_error"] else ""))
+        messagebox.showinfo("예약 작업 상태", "\n\n".join(lines), parent=self.master)
+
     def clear_screen(self):
         for widget in self.master.winfo_children(): widget.destroy()
         
@@ -95,10 +94,21 @@ class MainApp:
         username_entry = tk.Entry(self.master); username_entry.pack(pady=5)
         tk.Label(self.master, text="비밀번호").pack()
         password_entry = tk.Entry(self.master, show="*"); password_entry.pack(pady=5)
-        tk.Button(self.master, text="Login", command=lambda: self.handle_login(username_entry.get(), password_entry.get())).pack(pady=20)
+        self.login_button = tk.Button(self.master, text="Login", command=lambda: self.handle_login(username_entry.get(), password_entry.get()))
+        self.login_button.pack(pady=20)
         
     def handle_login(self, username, password):
-        user = self.account_manager.login(username, password)
+        """비밀번호 검증(bcrypt)은 작업 스레드에서 실행하고, 결과는 UI 스레드에서 처리합니다."""
+        self.login_button.config(state=tk.DISABLED, text="로그인 중...")
+        self.executor.submit(self.account_manager.login, username, password, owner=self.login_button,
+                             on_success=self._finish_login, on_error=self._login_failed)
+
+    def _login_failed(self, error):
+        self.login_button.config(state=tk.NORMAL, text="Login")
+        messagebox.showerror("로그인 실패", f"로그인 중 오류가 발생했습니다: {error}")
+
+    def _finish_login(self, user):
+        self.login_button.config(state=tk.NORMAL, text="Login")
         if user: 
             self.logged_in_user = user
             self.show_main_menu()
@@ -109,24 +119,27 @@ class MainApp:
         self.clear_screen(); self.master.title("메인 메뉴")
         header_frame = tk.Frame(self.master); header_frame.pack(fill='x', padx=10, pady=5)
         tk.Label(header_frame, text=f"{self.logged_in_user.get_name()}님, 환영합니다.", font=("Arial", 12)).pack(side="left")
-        tk.Button(header_frame, text="메일함 📬", command=self.open_mailbox_window).pack(side="right")
+        self.mail_button = tk.Button(header_frame, text="메일함 📬", command=self.open_mailbox_window); self.mail_button.pack(side="right")
+        self.update_mail_badge()
 
         is_admin = self.account_manager.is_admin(self.logged_in_user)
         menu_frame = tk.Frame(self.master); menu_frame.pack(pady=10, padx=20, fill="x")
 
         if is_admin:
-            self.master.geometry("450x550")
+            self.master.geometry("450x600")
             weather_frame = tk.LabelFrame(menu_frame, text=f"'{self.logged_in_user.get_location()}' 날씨 정보", padx=10, pady=10); weather_frame.pack(pady=10, fill="x")
             self.update_weather_display(weather_frame, self.logged_in_user.get_location())
             
             timer_frame = tk.LabelFrame(menu_frame, text="자동 뉴스 알림 간격 설정 (초)", padx=10, pady=5); timer_frame.pack(pady=10, fill="x")
-            self.interval_entry = tk.Entry(timer_frame); self.interval_entry.insert(0, str(self.news_timer.get_interval()))
+            self.interval_entry = tk.Entry(timer_frame); self.interval_entry.insert(0, str(self.scheduler.get_interval("news")))
             self.interval_entry.pack(side="left", expand=True, fill="x", padx=5)
             tk.Button(timer_frame, text="저장", command=self.save_timer_interval).pack(side="left")
 
             tk.Button(menu_frame, text="사용자 인벤토리 조회", command=self.show_user_selection_for_inventory).pack(pady=5, fill="x")
             tk.Button(menu_frame, text="계정 생성", command=self.show_create_account_popup).pack(pady=5, fill="x")
             tk.Button(menu_frame, text="계정 삭제", command=self.show_delete_account_popup).pack(pady=5, fill="x")
+            tk.Button(menu_frame, text="수요 예측 모델 재학습", command=self.start_retraining).pack(pady=5, fill="x")
+            tk.Button(menu_frame, text="예약 작업 상태", command=self.show_scheduler_stats).pack(pady=5, fill="x")
         else:
             self.master.geometry("400x300")
             tk.Button(menu_frame, text="내 인벤토리 보기", command=self.open_my_inventory).pack(pady=5, fill="x", ipady=4)
@@ -140,72 +153,20 @@ class MainApp:
             interval = int(self.interval_entry.get())
             if interval < 60:
                 messagebox.showwarning("경고", "최소 간격은 60초입니다.", parent=self.master); return
-            self.news_timer.set_interval(interval)
+            self.scheduler.set_interval("news", interval)
             messagebox.showinfo("성공", f"자동 알림 간격이 {interval}초로 설정되었습니다.", parent=self.master)
         except ValueError:
             messagebox.showerror("오류", "간격은 숫자로만 입력해주세요.", parent=self.master)
 
-    def send_periodic_news(self):
-        """(스레드에서 실행됨) 주기적으로 모든 사용자의 지역 소식을 수집하여 메일로 보냅니다."""
-        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 자동 뉴스 알림 작업을 실행합니다.")
-        
-        # *** 수정된 부분 시작 ***
-        # 1. 모든 지역의 뉴스를 미리 한 번만 스크래핑하여 캐시에 저장합니다.
-        news_cache = {}
-        for location in CITY_COORDINATES.keys():
-            print(f"'{location}' 지역의 뉴스를 수집합니다...")
-            news_cache[location] = search_titles(location, ["축제", "행사", "사고", "공연"])
-        print("모든 지역의 뉴스 수집 완료.")
-
-        thread_local_am = None
-        try:
-            thread_local_am = AccountManager() 
-            users_to_notify = thread_local_am.get_all_users()
-            
-            # 2. 각 사용자에게 맞는 캐시된 뉴스를 전송합니다.
-            for user_id, name, username, location in users_to_notify:
-                if location not in news_cache:
-                    continue
-                
-                news_results = news_cache[location]
-                
-                message_body = f"'{location}' 지역의 최신 소식을 자동으로 알려드립니다.\n\n"
-                has_news = False
-                
-                for keyword, titles in news_results.items():
-                    if titles:
-                        has_news = True
-                        message_body += f"📌 {keyword} 관련 소식\n"
-                        for i, title in enumerate(titles[:3], 1):
-                            message_body += f"  - {title}\n"
-                        message_body += "\n"
-                
-                if has_news:
-                    try:
-                        thread_local_am.mailbox.send_mail(
-                            sender_name="자동 알림봇", sender_id="system-notifier",
-                            receiver_id=user_id, message=message_body
-                        )
-                        print(f"'{name}'({username})님에게 지역 소식 메일을 전송했습니다.")
-                    except Exception as e:
-                        print(f"'{name}'님에게 메일 전송 중 오류 발생: {e}")
-        except Exception as e:
-            print(f"자동 뉴스 알림 작업 중 오류 발생: {e}")
-        finally:
-            if thread_local_am:
-                thread_local_am.close_connection()
-                print("스레드 전용 데이터베이스 연결을 닫았습니다.")
-        # *** 수정된 부분 끝 ***
-        
-        print("자동 뉴스 알림 작업을 완료했습니다.")
-
     def update_weather_display(self, frame, location):
+        """날씨는 백그라운드에서 받아오고, 받는 동안에는 로딩 문구를 표시합니다. (frame이 닫히면 취소)"""
         for widget in frame.winfo_children(): widget.destroy()
         loading_label = tk.Label(frame, text="날씨 정보 로딩 중..."); loading_label.pack()
-        self.master.update_idletasks()
-        coords = CITY_COORDINATES.get(location)
-        if not coords: loading_label.config(text=f"'{location}'에 대한 좌표 정보가 없습니다.", fg="red"); return
-        weather = get_kma_weather(coords['lat'], coords['lon'])
+        if location not in get_registry(): loading_label.config(text=f"'{location}'에 대한 좌표 정보가 없습니다.", fg="red"); return
+        self.executor.submit(get_region_weather, location, owner=frame,
+                             on_success=lambda weather: self._show_weather(frame, location, loading_label, weather))
+    def _show_weather(self, frame, location, loading_label, weather):
+        self.remember_demand_context(location, weather_data=weather)
         loading_label.destroy()
         if 'error' in weather: tk.Label(frame, text=weather['error'], fg="red").pack()
         else:
@@ -222,19 +183,19 @@ class MainApp:
         tk.Button(frame, text="닫기", command=popup.destroy, width=10).pack(side="bottom", pady=10)
     def open_my_inventory(self): self.open_inventory_window(self.logged_in_user.get_id(), self.logged_in_user.get_name(), self, read_only=False)
     def open_inventory_window(self, user_id, user_name, main_app, read_only=False):
-        inv = Inventory(); inventory_window = tk.Toplevel(self.master); inventory_window.title("인벤토리 관리"); inventory_window.geometry("800x500")
+        location = self.logged_in_user.get_location()
+        inv = Inventory(context_provider=lambda: self.service.demand_contexts.get(location)); inventory_window = tk.Toplevel(self.master); inventory_window.title("인벤토리 관리"); inventory_window.geometry("800x500")
         InventoryUI(inventory_window, inv, user_id, user_name, main_app, read_only=read_only)
     def show_user_selection_for_inventory(self):
         view_window = tk.Toplevel(self.master); view_window.title("사용자 선택"); view_window.geometry("300x400")
         tk.Label(view_window, text="인벤토리를 조회할 사용자를 선택하세요.").pack(pady=10)
         listbox = tk.Listbox(view_window); listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
-        all_users = self.account_manager.get_all_users()
-        user_map = {f"{name} ({username})": (user_id, name) for user_id, name, username, location in all_users}
+        user_map = self.account_manager.get_user_choices()
         for display_text in user_map.keys(): listbox.insert(tk.END, display_text)
         def on_view():
             try:
                 selected_text = listbox.get(listbox.curselection())
-                user_id, user_name = user_map[selected_text]
+                user_id, user_name, _, _ = user_map[selected_text]
                 self.open_inventory_window(user_id, user_name, self, True); view_window.destroy()
             except tk.TclError: messagebox.showwarning("선택 없음", "조회할 사용자를 선택하세요.", parent=view_window)
         tk.Button(view_window, text="선택한 사용자 인벤토리 조회", command=on_view).pack(pady=10)
@@ -244,9 +205,9 @@ class MainApp:
         text_area = scrolledtext.ScrolledText(popup, wrap=tk.WORD, font=("Arial", 10)); text_area.pack(expand=True, fill='both', padx=10, pady=5)
         text_area.insert(tk.END, "최신 소식을 불러오는 중입니다..."); text_area.config(state='disabled')
         text_area.tag_config('bold', font=('Arial', 12, 'bold'))
-        threading.Thread(target=self.scrape_and_display_news, args=(location, text_area), daemon=True).start()
-    def scrape_and_display_news(self, location, text_area):
-        results = search_titles(location, NEWS_KEYWORDS)
+        self.executor.submit(search_titles, location, NEWS_KEYWORDS, owner=popup,
+                             on_success=lambda results: self.display_news(location, text_area, results))
+    def display_news(self, location, text_area, results):
         text_area.config(state='normal'); text_area.delete('1.0', tk.END)
         for keyword, titles in results.items():
             text_area.insert(tk.END, f"\n📌 {location} + {keyword} 관련 소식\n", 'bold')
@@ -260,34 +221,51 @@ class MainApp:
         for i, (text, entry) in enumerate(fields.items()):
             tk.Label(popup, text=text).grid(row=i, column=0, padx=10, pady=5, sticky="w"); entry.grid(row=i, column=1, padx=10, pady=5)
         tk.Label(popup, text="지역").grid(row=len(fields), column=0, padx=10, pady=5, sticky="w")
-        location_combobox = ttk.Combobox(popup, values=list(CITY_COORDINATES.keys()), state="readonly"); location_combobox.grid(row=len(fields), column=1, padx=10, pady=5)
-        if location_combobox['values']: location_combobox.current(0)
+        # 시·도를 먼저 고르면 두 번째 목록에 그 시·도와 소속 시·군·구만 보여 줍니다.
+        registry = get_registry()
+        sido_combobox = ttk.Combobox(popup, values=registry.sidos(), state="readonly"); sido_combobox.grid(row=len(fields), column=1, padx=10, pady=5)
+        location_combobox = ttk.Combobox(popup, state="readonly"); location_combobox.grid(row=len(fields) + 1, column=1, padx=10, pady=5)
+        def on_sido_selected(event=None):
+            location_combobox.config(values=registry.districts(sido_combobox.get())); location_combobox.current(0)
+        sido_combobox.bind("<<ComboboxSelected>>", on_sido_selected)
+        if sido_combobox['values']: sido_combobox.current(0); on_sido_selected()
         def on_submit():
             try:
                 location = location_combobox.get()
                 if not location: messagebox.showerror("오류", "지역을 선택해주세요.", parent=popup); return
-                self.account_manager.create_user(fields["아이디"].get(), fields["이름"].get(), fields["비밀번호"].get(), location)
-                messagebox.showinfo("성공", "계정이 성공적으로 생성되었습니다.", parent=popup); popup.destroy()
+                # 비밀번호 해시(bcrypt)는 시간이 걸리므로 백그라운드에서 생성합니다.
+                submit_button.config(state=tk.DISABLED)
+                def on_error(e):
+                    submit_button.config(state=tk.NORMAL); messagebox.showerror("오류", str(e), parent=popup)
+                def on_created(_):
+                    messagebox.showinfo("성공", "계정이 성공적으로 생성되었습니다.", parent=popup); popup.destroy()
+                self.executor.submit(self.account_manager.create_user, fields["아이디"].get(), fields["이름"].get(), fields["비밀번호"].get(), location,
+                                     owner=popup, on_success=on_created, on_error=on_error)
             except ValueError as e: messagebox.showerror("오류", str(e), parent=popup)
-        tk.Button(popup, text="생성", command=on_submit).grid(row=len(fields) + 1, columnspan=2, pady=10)
+        submit_button = tk.Button(popup, text="생성", command=on_submit); submit_button.grid(row=len(fields) + 2, columnspan=2, pady=10)
     def show_delete_account_popup(self):
         popup = tk.Toplevel(self.master); popup.title("계정 삭제"); listbox = tk.Listbox(popup); listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        users = self.account_manager.get_all_users()
-        for _, name, username, _ in users: 
-            listbox.insert(tk.END, f"{name} ({username})")
+        user_map = self.account_manager.get_user_choices()
+        for display_text in user_map.keys(): 
+            listbox.insert(tk.END, display_text)
         def on_delete():
             try:
                 selected = listbox.get(listbox.curselection())
-                username = selected[selected.rfind("(") + 1:-1]
+                username = user_map[selected][2]
                 if messagebox.askyesno("확인", f"'{username}' 계정을 정말 삭제하시겠습니까?", parent=popup):
                     self.account_manager.delete_user(username)
                     messagebox.showinfo("성공", "계정이 삭제되었습니다.", parent=popup); popup.destroy()
             except tk.TclError: messagebox.showwarning("선택 없음", "삭제할 계정을 선택하세요.", parent=popup)
             except ValueError as e: messagebox.showerror("오류", str(e), parent=popup)
         tk.Button(popup, text="선택한 계정 삭제", command=on_delete).pack(pady=5)
+    def update_mail_badge(self):
+        """메인 메뉴의 메일함 버튼에 안 읽은 메일 수를 표시합니다. (카운터 테이블 조회 한 번)"""
+        if not self.logged_in_user or not getattr(self, "mail_button", None) or not self.mail_button.winfo_exists(): return
+        _, unread = self.account_manager.mailbox.get_mail_counts(self.logged_in_user.get_id())
+        self.mail_button.config(text=f"메일함 📬 ({unread})" if unread else "메일함 📬")
     def open_mailbox_window(self):
         mailbox_window = tk.Toplevel(self.master); mailbox_window.title(f"{self.logged_in_user.get_name()}님의 메일함"); mailbox_window.geometry("700x500")
-        MailboxUI(mailbox_window, self.account_manager, self.logged_in_user)
+        MailboxUI(mailbox_window, self.account_manager, self.logged_in_user, on_change=self.update_mail_badge)
 
 # --- 4. 인벤토리 UI 클래스 ---
 class InventoryUI:
@@ -306,7 +284,10 @@ class InventoryUI:
             tk.Button(btn_frame, text="➕ 추가", command=self.add_item_popup).pack(side=tk.LEFT, padx=5)
             tk.Button(btn_frame, text="✏️ 수정", command=self.edit_item_popup).pack(side=tk.LEFT, padx=5)
             tk.Button(btn_frame, text="❌ 삭제", command=self.delete_item).pack(side=tk.LEFT, padx=5)
+            tk.Button(btn_frame, text="📥 가져오기", command=self.import_items_popup).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="📤 내보내기", command=self.export_items_popup).pack(side=tk.LEFT, padx=5)
         tk.Button(btn_frame, text="📈 수요 예측", command=self.run_demand_prediction).pack(side=tk.LEFT, padx=10)
+        tk.Button(btn_frame, text="📊 전체 예측", command=self.run_batch_demand_prediction).pack(side=tk.LEFT, padx=5)
         tk.Frame(btn_frame).pack(side=tk.LEFT, expand=True)
         columns = ("name", "item_id", "quantity", "price", "cost", "category")
         self.tree = ttk.Treeview(self.frame, columns=columns, show="headings")
@@ -315,35 +296,128 @@ class InventoryUI:
         self.tree.column("name", width=120, anchor=tk.W); self.tree.column("item_id", width=130, anchor=tk.W)
         self.tree.column("quantity", width=60, anchor=tk.E); self.tree.column("price", width=90, anchor=tk.E)
         self.tree.column("cost", width=90, anchor=tk.E); self.tree.column("category", width=100, anchor=tk.W)
-        self.tree.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=10, pady=5)
+        # 스크롤이 끝에 가까워지면 다음 페이지를 불러옵니다. (전체 목록을 한 번에 불러오지 않음)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll); self.scrollbar.pack(side=tk.RIGHT, fill="y", pady=5)
+        self.tree.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=(10, 0), pady=5)
         self.refresh_inventory()
+    def _on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.has_more_items and float(last) >= 0.95 and not self.page_load_pending:
+            self.page_load_pending = True; self.tree.after_idle(self.load_next_page)
+    def load_next_page(self):
+        """다음 페이지(INVENTORY_PAGE_SIZE개)를 키셋 페이지네이션으로 불러와 목록 끝에 추가합니다."""
+        self.page_load_pending = False
+        if not self.has_more_items: return
+        page = self.inventory.list_items_page(self.user_id, self.last_item_id, INVENTORY_PAGE_SIZE)
+        for item in page: self._insert_row(item.to_tuple())
+        if page: self.last_item_id = page[-1].item_id
+        self.has_more_items = len(page) == INVENTORY_PAGE_SIZE
+    # Treeview 행의 iid로 item_id를 사용하고, 화면의 값은 self.rows에 원본 타입 그대로 보관합니다.
+    def _insert_row(self, values):
+        item_id = values[1]
+        index = bisect.bisect_left(self.row_order, item_id)
+        self.row_order.insert(index, item_id); self.rows[item_id] = values
+        if not self.has_more_items and (self.last_item_id is None or item_id > self.last_item_id): self.last_item_id = item_id
+        self.tree.insert("", index, iid=item_id, values=values)
+    def _update_row(self, values):
+        if self.rows.get(values[1]) != values:
+            self.rows[values[1]] = values; self.tree.item(values[1], values=values)
+    def _delete_row(self, item_id):
+        if item_id not in self.rows: return
+        del self.rows[item_id]; self.row_order.pop(bisect.bisect_left(self.row_order, item_id))
+        self.tree.delete(item_id)
+    def _is_loaded_range(self, item_id):
+        """item_id가 지금까지 불러온 페이지 범위 안에 있는지 확인합니다. (범위 밖 항목은 스크롤 시 불러옵니다)"""
+        return not self.has_more_items or (self.last_item_id is not None and item_id <= self.last_item_id)
+    def _selected_values(self):
+        selection = self.tree.selection()
+        return self.rows.get(selection[0]) if selection else None
     def run_demand_prediction(self):
         if not self.tree.selection(): messagebox.showwarning("선택 없음", "수요를 예측할 항목을 선택하세요.", parent=self.master); return
-        threading.Thread(target=self._demand_prediction_thread, args=(self.tree.selection()[0],), daemon=True).start()
-        messagebox.showinfo("알림", "수요 예측을 시작합니다.\n날씨와 지역 소식 정보를 수집하는 데 시간이 걸릴 수 있습니다.", parent=self.master)
-    def _demand_prediction_thread(self, selected_item):
-        try:
-            item_values = self.tree.item(selected_item)['values']
-            item_name, category = item_values[0], item_values[5]
-            user_location = self.main_app.logged_in_user.get_location()
-            coords = CITY_COORDINATES.get(user_location, {})
-            weather_data = get_kma_weather(coords.get('lat', 0), coords.get('lon', 0))
-            event_data = search_titles(user_location, ["축제", "공연"]) 
-            if "error" in weather_data: messagebox.showerror("오류", f"날씨 정보 수집 실패: {weather_data['error']}", parent=self.master); return
-            result = predict_demand(category, weather_data, event_data, self.main_app.classifier, self.main_app.regressor, self.main_app.model_columns)
+        item_name, category = self._selected_values()[0], self._selected_values()[5]
+        def on_success(result):
             messagebox.showinfo("수요 예측 결과", f"선택한 항목: {item_name}\n카테고리: {category}\n\n예측 결과: {result}", parent=self.master)
-        except Exception as e: messagebox.showerror("예측 오류", f"수요 예측 중 오류가 발생했습니다: {e}", parent=self.master)
+        self.main_app.executor.submit(self._predict_demand_task, category, owner=self.master,
+                                      on_success=on_success, on_error=self._show_prediction_error)
+        messagebox.showinfo("알림", "수요 예측을 시작합니다.\n날씨와 지역 소식 정보를 수집하는 데 시간이 걸릴 수 있습니다.", parent=self.master)
+    def _collect_demand_context(self):
+        """(작업 스레드) 사용자 지역의 날씨와 행사 소식을 수집합니다."""
+        return self.main_app.service.collect_demand_context(self.main_app.logged_in_user.get_location())
+    def _predict_demand_task(self, category):
+        """(작업 스레드) 선택한 항목 하나의 수요를 예측합니다."""
+        weather_data, event_data = self._collect_demand_context()
+        return self.main_app.get_demand_model().predict(category, weather_data, event_data)
+    def _show_prediction_error(self, error):
+        if isinstance(error, ValueError): messagebox.showerror("오류", str(error), parent=self.master)
+        else: messagebox.showerror("예측 오류", f"수요 예측 중 오류가 발생했습니다: {error}", parent=self.master)
+    def run_batch_demand_prediction(self):
+        # 화면에 불러온 페이지뿐 아니라 전체 인벤토리를 대상으로 예측합니다. (전체 조회도 작업 스레드에서 수행)
+        self.main_app.executor.submit(self._batch_prediction_task, owner=self.master,
+                                      on_success=lambda outcome: self._show_batch_prediction(*outcome),
+                                      on_error=self._show_prediction_error)
+        messagebox.showinfo("알림", "전체 항목의 수요 예측을 시작합니다.\n날씨와 지역 소식 정보를 수집하는 데 시간이 걸릴 수 있습니다.", parent=self.master)
+    def _batch_prediction_task(self):
+        """(작업 스레드) 날씨/소식을 한 번만 수집한 뒤 전체 항목을 한 번에 예측하여 (항목 목록, 결과 목록)을 반환합니다."""
+        # 공용 연결 관리자가 작업 스레드별 연결을 재사용하므로 self.inventory를 그대로 사용합니다.
+        items = [(item.name, item.category) for item in self.inventory.iter_items(self.user_id)]
+        if not items: return [], []
+        weather_data, event_data = self._collect_demand_context()
+        return items, self.main_app.get_demand_model().predict_batch([category for _, category in items], weather_data, event_data)
+    def _show_batch_prediction(self, items, results):
+        if not items: messagebox.showwarning("항목 없음", "수요를 예측할 항목이 없습니다.", parent=self.master); return
+        popup = tk.Toplevel(self.master); popup.title("전체 수요 예측 결과"); popup.geometry("600x400")
+        columns = ("name", "category", "result")
+        tree = ttk.Treeview(popup, columns=columns, show="headings")
+        tree.heading("name", text="이름"); tree.heading("category", text="카테고리"); tree.heading("result", text="예측 결과")
+        tree.column("name", width=150, anchor=tk.W); tree.column("category", width=100, anchor=tk.W); tree.column("result", width=300, anchor=tk.W)
+        scrollbar = ttk.Scrollbar(popup, orient="vertical", command=tree.yview); tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side=tk.RIGHT, fill="y"); tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        for (name, category), result in zip(items, results): tree.insert("", "end", values=(name, category, format_prediction(result)))
     def refresh_inventory(self):
-        for row in self.tree.get_children(): self.tree.delete(row)
-        for item in self.inventory.list_items(self.user_id): self.tree.insert("", "end", values=item.to_tuple())
+        """
+        불러온 범위의 최신 데이터를 다시 읽어 현재 행과 비교하고, 추가/수정/삭제된 행만 반영합니다.
+        처음 호출될 때는 첫 페이지를 불러옵니다.
+        """
+        if not hasattr(self, "rows"):
+            self.rows, self.row_order = {}, []
+            self.last_item_id, self.has_more_items, self.page_load_pending = None, True, False
+            self.load_next_page(); return
+        # 아직 불러오지 않은 페이지가 남아 있다면 마지막으로 불러온 키까지만 비교합니다.
+        upper = self.last_item_id if self.has_more_items else None
+        latest, after_item_id = {}, None
+        while True:
+            page = self.inventory.list_items_page(self.user_id, after_item_id, INVENTORY_PAGE_SIZE)
+            latest.update((item.item_id, item.to_tuple()) for item in page if upper is None or item.item_id <= upper)
+            if len(page) < INVENTORY_PAGE_SIZE or (upper is not None and page[-1].item_id >= upper): break
+            after_item_id = page[-1].item_id
+        for item_id in [item_id for item_id in self.row_order if item_id not in latest]: self._delete_row(item_id)
+        for item_id, values in latest.items():
+            if item_id in self.rows: self._update_row(values)
+            else: self._insert_row(values)
+    def import_items_popup(self):
+        path = filedialog.askopenfilename(parent=self.master, title="가져올 파일 선택", filetypes=[("CSV / JSON Lines", "*.csv *.jsonl *.ndjson")])
+        if path: self._run_bulk_io(import_items, path, "가져오기")
+    def export_items_popup(self):
+        path = filedialog.asksaveasfilename(parent=self.master, title="내보낼 파일 선택", defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")])
+        if path: self._run_bulk_io(export_items, path, "내보내기")
+    def _run_bulk_io(self, operation, path, label):
+        def on_done(result):
+            if operation is import_items: self.refresh_inventory()
+            messagebox.showinfo("완료", f"{label} 완료: {result}", parent=self.master)
+        def on_error(e): messagebox.showerror("오류", f"{label} 중 오류가 발생했습니다: {e}", parent=self.master)
+        self.main_app.executor.submit(self._bulk_io_task, operation, path, owner=self.master, on_success=on_done, on_error=on_error)
+    def _bulk_io_task(self, operation, path):
+        """(작업 스레드) 대량 가져오기/내보내기를 수행합니다. (연결은 공용 연결 관리자가 작업 스레드별로 재사용합니다)"""
+        return operation(self.inventory, self.user_id, path)
     def add_item_popup(self): self._item_popup(mode="add")
     def edit_item_popup(self):
         if not self.tree.selection(): messagebox.showwarning("경고", "수정할 항목을 선택하세요."); return
-        self._item_popup(mode="edit", values=self.tree.item(self.tree.selection()[0])['values'])
+        self._item_popup(mode="edit", values=self._selected_values())
     def delete_item(self):
         if not self.tree.selection(): messagebox.showwarning("경고", "삭제할 항목을 선택하세요."); return
-        item_id, item_name = self.tree.item(self.tree.selection()[0])['values'][1], self.tree.item(self.tree.selection()[0])['values'][0]
-        if messagebox.askyesno("확인", f"'{item_name}'({item_id}) 항목을 정말 삭제하시겠습니까?"): self.inventory.delete_item(self.user_id, item_id); self.refresh_inventory()
+        item_name, item_id = self._selected_values()[:2]
+        if messagebox.askyesno("확인", f"'{item_name}'({item_id}) 항목을 정말 삭제하시겠습니까?"): self.inventory.delete_item(self.user_id, item_id); self._delete_row(item_id)
     def _item_popup(self, mode="add", values=None):
         popup = tk.Toplevel(self.master); popup.title("항목 추가" if mode == "add" else "항목 수정")
         fields, entries = ["이름", "수량", "가격", "원가"], {}
@@ -365,19 +439,26 @@ class InventoryUI:
                 category = category_combobox.get()
                 if not category: messagebox.showerror("오류", "카테고리를 선택하세요.", parent=popup); return
                 if mode == "add":
-                    self.inventory.add_item(self.user_id, Item(name=name, quantity=quantity, price=price, cost=cost, category=category))
+                    item = Item(name=name, quantity=quantity, price=price, cost=cost, category=category)
+                    self.inventory.add_item(self.user_id, item); new_values = item.to_tuple()
                 else: 
-                    new_item_id = hashlib.sha256(name.encode('utf-8')).hexdigest()[:16]
+                    new_item_id = generate_item_id(name)
                     self.inventory.update_item(self.user_id, original_item_id, item_id=new_item_id, name=name, quantity=quantity, price=price, cost=cost, category=category)
-                popup.destroy(); self.refresh_inventory()
+                    new_values = (name, new_item_id, quantity, price, cost, category)
+                    if new_item_id != original_item_id: self._delete_row(original_item_id)
+                # DB를 다시 조회하지 않고 변경된 한 행만 화면에 반영합니다.
+                if new_values[1] in self.rows: self._update_row(new_values)
+                elif self._is_loaded_range(new_values[1]): self._insert_row(new_values)
+                popup.destroy()
             except ValueError: messagebox.showerror("오류", "수량, 가격, 원가는 숫자로 입력해야 합니다.", parent=popup)
             except Exception as e: messagebox.showerror("오류", str(e), parent=popup)
         tk.Button(popup, text="확인", command=on_submit).grid(row=len(fields) + 1, columnspan=2, pady=10)
 
 # --- 5. 신규 메일함 UI 클래스 ---
 class MailboxUI:
-    def __init__(self, master, account_manager, user):
+    def __init__(self, master, account_manager, user, on_change=None):
         self.master = master; self.account_manager = account_manager; self.user = user
+        self.on_change = on_change
         self.mailbox = self.account_manager.mailbox; self.frame = tk.Frame(master)
         self.frame.pack(fill=tk.BOTH, expand=True); self.draw_mailbox()
     def draw_mailbox(self):
@@ -387,32 +468,81 @@ class MailboxUI:
         self.tree = ttk.Treeview(list_frame, columns=columns, show="headings")
         self.tree.heading("sender_name", text="보낸 사람"); self.tree.heading("timestamp", text="보낸 시각")
         self.tree.column("sender_name", width=150); self.tree.column("timestamp", width=200)
+        self.tree.tag_configure("unread", font=("Arial", 10, "bold"))
         self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set); scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll); self.scrollbar.pack(side=tk.RIGHT, fill="y")
         self.tree.bind("<Double-1>", self.on_mail_double_click)
         btn_frame = tk.Frame(self.frame); btn_frame.pack(fill=tk.X, padx=10, pady=10)
         tk.Button(btn_frame, text="새로고침 🔄", command=self.refresh_mailbox).pack(side=tk.LEFT)
         tk.Button(btn_frame, text="새 메일 작성 ✏️", command=self.show_send_mail_popup).pack(side=tk.RIGHT)
-        self.refresh_mailbox()
+        # 화면에 불러온 메일(mail_map)과 가장 오래된 메일의 페이지 키
+        self.mail_map = {}; self.oldest_key = None; self.has_more_mails = True; self.page_load_pending = False
+        self.load_next_page()
+    def _on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if self.has_more_mails and float(last) >= 0.95 and not self.page_load_pending:
+            self.page_load_pending = True; self.tree.after_idle(self.load_next_page)
+    def load_next_page(self):
+        """다음 페이지(MAIL_PAGE_SIZE개)의 더 오래된 메일을 키셋 페이지네이션으로 불러와 목록 끝에 추가합니다."""
+        self.page_load_pending = False
+        if not self.has_more_mails: return
+        page = self.mailbox.get_mails_for_user(self.user.get_id(), before=self.oldest_key, limit=MAIL_PAGE_SIZE, include_body=False)
+        for mail in page:
+            iid = str(mail.mail_id)
+            if iid in self.mail_map: continue
+            self.tree.insert("", tk.END, iid=iid, values=mail.to_list_tuple(), tags=self._tags(mail)); self.mail_map[iid] = mail
+        if page: self.oldest_key = page[-1].page_key
+        self.has_more_mails = len(page) == MAIL_PAGE_SIZE
+    @staticmethod
+    def _tags(mail):
+        return () if mail.is_read else ("unread",)
     def on_mail_double_click(self, event):
         if not self.tree.selection(): return
         selected_item_id = self.tree.selection()[0]
         mail_obj = self.mail_map.get(selected_item_id)
-        if mail_obj: messagebox.showinfo(f"From: {mail_obj.sender_name} ({mail_obj.timestamp})", mail_obj.message, parent=self.master)
+        if not mail_obj: return
+        # 목록에는 본문을 불러오지 않으므로 열 때 한 번만 읽어옵니다.
+        if mail_obj.message is None: mail_obj.message = self.mailbox.get_mail_body(mail_obj.mail_id) or ""
+        if not mail_obj.is_read:
+            self.mailbox.mark_read(mail_obj.mail_id); mail_obj.is_read = True
+            self.tree.item(selected_item_id, tags=())
+            if self.on_change: self.on_change()
+        messagebox.showinfo(f"From: {mail_obj.sender_name} ({mail_obj.timestamp})", mail_obj.message, parent=self.master)
     def refresh_mailbox(self):
-        for row in self.tree.get_children(): self.tree.delete(row)
-        received_mails = self.mailbox.get_mails_for_user(self.user.get_id())
-        self.mail_map = {}
-        for mail in received_mails:
-            item_id = self.tree.insert("", "end", values=mail.to_list_tuple())
-            self.mail_map[item_id] = mail
+        """
+        이미 불러온 범위(가장 최근 ~ oldest_key)의 메일만 다시 읽어 mail_id 기준으로 현재 화면과 비교하고,
+        새로 온/사라진/읽음 상태가 바뀐 메일만 반영합니다.
+        """
+        latest = {}
+        before = None
+        while True:
+            page = self.mailbox.get_mails_for_user(self.user.get_id(), before=before, limit=MAIL_PAGE_SIZE, include_body=False)
+            for mail in page:
+                if self.has_more_mails and self.oldest_key and mail.page_key < self.oldest_key: break
+                latest[str(mail.mail_id)] = mail
+            else:
+                if len(page) == MAIL_PAGE_SIZE:
+                    before = page[-1].page_key; continue
+                # 마지막 페이지까지 읽었다면 더 불러올 메일이 없습니다.
+                self.has_more_mails = False
+                if page: self.oldest_key = page[-1].page_key
+            break
+        for iid in [iid for iid in self.mail_map if iid not in latest]:
+            self.tree.delete(iid); del self.mail_map[iid]
+        for index, (iid, mail) in enumerate(latest.items()):
+            if iid not in self.mail_map: self.tree.insert("", index, iid=iid, values=mail.to_list_tuple(), tags=self._tags(mail))
+            else:
+                old = self.mail_map[iid]
+                if old.to_list_tuple() != mail.to_list_tuple(): self.tree.item(iid, values=mail.to_list_tuple())
+                if old.is_read != mail.is_read: self.tree.item(iid, tags=self._tags(mail))
+            self.mail_map[iid] = mail
+        if self.on_change: self.on_change()
     def show_send_mail_popup(self):
         popup = tk.Toplevel(self.master); popup.title("새 메일 작성"); popup.geometry("450x350")
         popup.transient(self.master); popup.grab_set()
         tk.Label(popup, text="수신자:").grid(row=0, column=0, padx=10, pady=5, sticky='w')
-        users = self.account_manager.get_all_users(exclude_user_id=self.user.get_id())
-        self.recipient_map = {f"{name} ({username})": user_id for user_id, name, username, _ in users}
+        self.recipient_map = {label: user_id for label, (user_id, _, _, _) in self.account_manager.get_user_choices(exclude_user_id=self.user.get_id()).items()}
         recipient_cb = ttk.Combobox(popup, values=list(self.recipient_map.keys()), state="readonly", width=40)
         recipient_cb.grid(row=0, column=1, padx=10, pady=5, sticky='ew')
         if recipient_cb['values']: recipient_cb.current(0)
@@ -429,7 +559,7 @@ class MailboxUI:
             receiver_id = self.recipient_map[recipient_display]
             try:
                 self.mailbox.send_mail(self.user.get_name(), self.user.get_id(), receiver_id, message)
+                # 보낸 메일은 받은 메일함에 표시되지 않으므로 목록을 다시 불러올 필요가 없습니다.
                 messagebox.showinfo("성공", "메일이 성공적으로 전송되었습니다.", parent=popup); popup.destroy()
-                self.refresh_mailbox()
             except Exception as e: messagebox.showerror("전송 실패", str(e), parent=popup)
         tk.Button(popup, text="보내기", command=on_send).grid(row=2, columnspan=2, pady=10)
@@ -1,5 +1,17 @@
 import sqlite3
 import hashlib
+from datetime import datetime
+
+from storage import ManagedDatabase
+
+# 인벤토리 목록을 한 번에 불러오는 기본 행 수 (키셋 페이지네이션)
+INVENTORY_PAGE_SIZE = 200
+# 대량 가져오기 시 executemany 한 번에 넘기는 행 수
+BULK_BATCH_SIZE = 5000
+
+def generate_item_id(name):
+    """이름을 SHA256으로 해싱하여 고유 ID로 사용합니다. (16자리로 축약)"""
+    return hashlib.sha256(name.encode('utf-8')).hexdigest()[:16]
 
 class Item:
     """
@@ -21,7 +33,7 @@ class Item:
     
     def _generate_id(self, name):
         """이름을 SHA256으로 해싱하여 고유 ID로 사용합니다. (16자리로 축약)"""
-        return hashlib.sha256(name.encode('utf-8')).hexdigest()[:16]
+        return generate_item_id(name)
 
     @classmethod
     def from_db(cls, name, item_id, quantity, price, cost, category):
@@ -40,12 +52,16 @@ class Item:
         # 반환하는 튜플에 description 대신 category를 포함합니다.
         return (self.name, self.item_id, self.quantity, self.price, self.cost, self.category)
 
-class Inventory:
-    """인벤토리 데이터베이스 관리를 담당하는 클래스"""
-    def __init__(self, db_path="inventory.db"):
-        self.conn = sqlite3.connect(db_path)
-        self.cursor = self.conn.cursor()
-        self._create_table()
+class Inventory(ManagedDatabase):
+    """
+    인벤토리 데이터베이스 관리를 담당하는 클래스
+    - context_provider: 수량 변경 시점의 날씨/행사 정보를 dict로 반환하는 함수 (재고 이력 기록용)
+    """
+    def __init__(self, db_path="inventory.db", context_provider=None):
+        self.db_path = db_path
+        self.context_provider = context_provider
+        # 연결은 공용 연결 관리자에서 스레드별로 재사용하며, 스키마 확인은 프로세스당 한 번만 수행합니다.
+        self._ensure_schema(self._create_table)
 
     def _create_table(self):
         self.cursor.execute("""
@@ -59,7 +75,21 @@ class Inventory:
             category TEXT,
             PRIMARY KEY (owner_id, item_id)
         )""")
-        self.conn.commit()
+        # 수량 변경 이력과 당시의 날씨/행사 정보를 기록합니다. (실데이터 재학습용)
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stock_history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            owner_id TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            category TEXT,
+            quantity_change INTEGER NOT NULL,
+            temperature REAL,
+            is_raining INTEGER,
+            has_festival INTEGER,
+            has_concert INTEGER,
+            timestamp TEXT NOT NULL
+        )""")
+        self._commit()
 
     def add_item(self, owner_id, item: Item):
         try:
@@ -67,7 +97,7 @@ class Inventory:
                 "INSERT INTO items (owner_id, item_id, name, quantity, price, cost, category) VALUES (?, ?, ?, ?, ?, ?, ?)",
                 (owner_id, item.item_id, item.name, item.quantity, item.price, item.cost, item.category)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.IntegrityError:
             raise ValueError(f"'{item.name}' 이름의 아이템이 이미 존재합니다.")
 
@@ -75,24 +105,102 @@ class Inventory:
         fields = [f"{key} = ?" for key in kwargs]
         values = list(kwargs.values())
         if not fields: return
+        previous = None
+        if "quantity" in kwargs:
+            self.cursor.execute("SELECT quantity, category FROM items WHERE owner_id = ? AND item_id = ?", (owner_id, original_item_id))
+            previous = self.cursor.fetchone()
         values.extend([owner_id, original_item_id])
         query = f"UPDATE items SET {', '.join(fields)} WHERE owner_id = ? AND item_id = ?"
         try:
             self.cursor.execute(query, tuple(values))
-            self.conn.commit()
+            if previous and previous[0] is not None and int(kwargs["quantity"]) != previous[0]:
+                self._record_stock_change(owner_id, kwargs.get("item_id", original_item_id),
+                                          kwargs.get("category", previous[1]), int(kwargs["quantity"]) - previous[0])
+            self._commit()
         except sqlite3.IntegrityError:
+            self._rollback()
             raise ValueError("변경하려는 이름의 아이템이 이미 존재합니다.")
 
+    def _record_stock_change(self, owner_id, item_id, category, quantity_change):
+        """수량 변동을 당시의 날씨/행사 정보와 함께 stock_history에 기록합니다."""
+        context = (self.context_provider() if self.context_provider else None) or {}
+        self.cursor.execute(
+            "INSERT INTO stock_history (owner_id, item_id, category, quantity_change, temperature, is_raining, has_festival, has_concert, timestamp) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (owner_id, item_id, category, quantity_change, context.get("temperature"), context.get("is_raining"),
+             context.get("has_festival"), context.get("has_concert"), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        )
+
+    def bulk_upsert(self, owner_id, rows, batch_size=BULK_BATCH_SIZE):
+        """
+        (name, quantity, price, cost, category) 튜플을 스트리밍으로 받아 하나의 트랜잭션 안에서 일괄 저장합니다.
+        같은 이름(item_id)의 아이템이 이미 있으면 수량/가격/원가/카테고리를 갱신합니다.
+        가져오기는 카탈로그/초기 재고를 옮겨 오는 작업이라 판매에 따른 수요 변동이 아니므로,
+        수량이 바뀌어도 재고 이력(stock_history)에는 기록하지 않습니다. (재학습 데이터가 왜곡되지 않도록)
+
+        Returns:
+            int: 처리한 행 수
+        """
+        upsert = ("INSERT INTO items (owner_id, item_id, name, quantity, price, cost, category) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                  "ON CONFLICT(owner_id, item_id) DO UPDATE SET name = excluded.name, quantity = excluded.quantity, "
+                  "price = excluded.price, cost = excluded.cost, category = excluded.category")
+        count, batch = 0, []
+        try:
+            for name, quantity, price, cost, category in rows:
+                if not name:
+                    raise ValueError("아이템 이름은 비어있을 수 없습니다.")
+                batch.append((name, quantity, price, cost, category or "기타"))
+                if len(batch) >= batch_size:
+                    count += self._upsert_batch(upsert, owner_id, batch); batch = []
+            if batch:
+                count += self._upsert_batch(upsert, owner_id, batch)
+            self._commit()
+        except Exception:
+            self._rollback()
+            raise
+        return count
+
+    def _upsert_batch(self, query, owner_id, batch):
+        # item_id는 배치 단위로 한 번에 계산합니다.
+        item_ids = map(generate_item_id, (row[0] for row in batch))
+        self.cursor.executemany(query, [(owner_id, item_id, *row) for item_id, row in zip(item_ids, batch)])
+        return len(batch)
+
     def delete_item(self, owner_id, item_id):
         self.cursor.execute("DELETE FROM items WHERE owner_id = ? AND item_id = ?", (owner_id, item_id))
-        self.conn.commit()
+        self._commit()
+
+    def get_item(self, owner_id, item_id):
+        """아이템 하나를 불러옵니다. 없으면 None을 반환합니다."""
+        self.cursor.execute("SELECT name, item_id, quantity, price, cost, category FROM items WHERE owner_id = ? AND item_id = ?",
+                            (owner_id, item_id))
+        row = self.cursor.fetchone()
+        return Item.from_db(*row) if row else None
+
+    def list_items_page(self, owner_id, after_item_id=None, limit=INVENTORY_PAGE_SIZE):
+        """
+        (owner_id, item_id) 기본 키 순서로 after_item_id 다음부터 최대 limit개의 아이템을 불러옵니다.
+        OFFSET 없이 키셋 페이지네이션을 사용하므로 페이지 위치와 관계없이 비용이 일정합니다.
+        """
+        if after_item_id is None:
+            self.cursor.execute("SELECT name, item_id, quantity, price, cost, category FROM items WHERE owner_id = ? "
+                                "ORDER BY item_id LIMIT ?", (owner_id, limit))
+        else:
+            self.cursor.execute("SELECT name, item_id, quantity, price, cost, category FROM items WHERE owner_id = ? AND item_id > ? "
+                                "ORDER BY item_id LIMIT ?", (owner_id, after_item_id, limit))
+        return [Item.from_db(*row) for row in self.cursor.fetchall()]
+
+    def iter_items(self, owner_id, page_size=INVENTORY_PAGE_SIZE):
+        """특정 사용자의 아이템을 페이지 단위로 조회하며 하나씩 반환합니다. (메모리 사용량은 페이지 크기에 비례)"""
+        after_item_id = None
+        while True:
+            page = self.list_items_page(owner_id, after_item_id, page_size)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_item_id = page[-1].item_id
 
     def list_items(self, owner_id):
         """특정 사용자의 모든 아이템 목록을 불러옵니다."""
-        self.cursor.execute("SELECT name, item_id, quantity, price, cost, category FROM items WHERE owner_id = ?", (owner_id,))
-        rows = self.cursor.fetchall()
-        return [Item.from_db(*row) for row in rows]
-
-    def close(self):
-        self.conn.close()
+        return list(self.iter_items(owner_id))
 
@@ -1,26 +1,87 @@
-import sqlite3
+import hashlib
+import time
 from datetime import datetime
 
+from storage import ManagedDatabase
+
+# 메일함 목록을 한 번에 불러오는 메일 수
+MAIL_PAGE_SIZE = 100
+
 class Mail:
     """메일 한 건의 데이터를 담는 클래스입니다."""
-    def __init__(self, mail_id, sender_name, sender_id, receiver_id, message, timestamp):
+    def __init__(self, mail_id, sender_name, sender_id, receiver_id, message, timestamp, created_at=None, is_read=0):
         self.mail_id = mail_id
         self.sender_name = sender_name
         self.sender_id = sender_id
         self.receiver_id = receiver_id
         self.message = message
         self.timestamp = timestamp
+        self.created_at = created_at
+        self.is_read = bool(is_read)
+
+    @property
+    def page_key(self):
+        """다음 페이지를 요청할 때 before로 넘기는 (created_at, mail_id) 키입니다."""
+        return (self.created_at, self.mail_id)
 
     def to_list_tuple(self):
         """메일 목록(Treeview)에 표시하기 위한 튜플을 반환합니다."""
         return (self.sender_name, self.timestamp)
 
-class Mailbox:
+# PRAGMA user_version으로 관리하는 메일함 스키마 변경 목록 (순서대로 한 번씩 적용)
+# 1: 정수(epoch) 시각 created_at, 읽음 여부 is_read, (receiver_id, created_at, id) 인덱스,
+#    트리거로 유지되는 수신자별 전체/안 읽은 메일 수(mail_counters)
+MAILBOX_MIGRATIONS = [
+    [
+        "ALTER TABLE mails ADD COLUMN created_at INTEGER",
+        "ALTER TABLE mails ADD COLUMN is_read INTEGER NOT NULL DEFAULT 0",
+        # 기존 timestamp는 로컬 시각 문자열이므로 UTC epoch로 변환합니다.
+        "UPDATE mails SET created_at = CAST(strftime('%s', timestamp, 'utc') AS INTEGER)",
+        "CREATE INDEX IF NOT EXISTS idx_mails_receiver_created ON mails (receiver_id, created_at, id)",
+        '''CREATE TABLE IF NOT EXISTS mail_counters (
+            receiver_id TEXT PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0,
+            unread INTEGER NOT NULL DEFAULT 0
+        )''',
+        '''INSERT INTO mail_counters (receiver_id, total, unread)
+           SELECT receiver_id, COUNT(*), SUM(is_read = 0) FROM mails GROUP BY receiver_id''',
+        '''CREATE TRIGGER IF NOT EXISTS mails_count_insert AFTER INSERT ON mails BEGIN
+            INSERT INTO mail_counters (receiver_id, total, unread) VALUES (NEW.receiver_id, 1, NEW.is_read = 0)
+            ON CONFLICT (receiver_id) DO UPDATE SET total = total + 1, unread = unread + excluded.unread;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS mails_count_delete AFTER DELETE ON mails BEGIN
+            UPDATE mail_counters SET total = total - 1, unread = unread - (OLD.is_read = 0)
+            WHERE receiver_id = OLD.receiver_id;
+        END''',
+        '''CREATE TRIGGER IF NOT EXISTS mails_count_read AFTER UPDATE OF is_read ON mails BEGIN
+            UPDATE mail_counters SET unread = unread + (NEW.is_read = 0) - (OLD.is_read = 0)
+            WHERE receiver_id = NEW.receiver_id;
+        END''',
+    ],
+    # 2: 같은 본문을 여러 수신자에게 보낼 때 본문은 내용 해시로 한 번만 저장(mail_bodies)하고
+    #    mails에는 body_hash만 가진 가벼운 배달 행을 추가합니다. (이때 mails.message는 빈 문자열)
+    [
+        '''CREATE TABLE IF NOT EXISTS mail_bodies (
+            hash TEXT PRIMARY KEY,
+            message TEXT NOT NULL
+        )''',
+        "ALTER TABLE mails ADD COLUMN body_hash TEXT",
+    ],
+]
+
+MAIL_LIST_COLUMNS = "m.id, m.sender_name, m.sender_id, m.receiver_id, NULL, m.timestamp, m.created_at, m.is_read"
+MAIL_COLUMNS = "m.id, m.sender_name, m.sender_id, m.receiver_id, COALESCE(b.message, m.message), m.timestamp, m.created_at, m.is_read"
+MAIL_BODY_JOIN = "LEFT JOIN mail_bodies b ON b.hash = m.body_hash"
+
+def body_hash(message):
+    """메일 본문의 내용 해시(SHA-256)를 반환합니다."""
+    return hashlib.sha256(message.encode("utf-8")).hexdigest()
+
+class Mailbox(ManagedDatabase):
     """메일 데이터베이스 관리를 담당하는 클래스입니다."""
     def __init__(self, db_path="mailbox.db"):
-        self.conn = sqlite3.connect(db_path)
-        self.cursor = self.conn.cursor()
-        self._create_table()
+        self.db_path = db_path
+        self._ensure_schema(self._create_table)
 
     def _create_table(self):
         self.cursor.execute('''
@@ -32,30 +93,106 @@ class Mailbox:
                 message TEXT NOT NULL,
                 timestamp TEXT NOT NULL
             )''')
-        self.conn.commit()
+        self._commit()
+        self._migrate()
+
+    def _migrate(self):
+        """아직 적용되지 않은 스키마 변경을 버전 순서대로 각각 하나의 트랜잭션으로 적용합니다."""
+        conn = self.conn
+        for version, statements in enumerate(MAILBOX_MIGRATIONS, 1):
+            # 다른 프로세스가 동시에 마이그레이션하지 않도록 쓰기 잠금을 먼저 잡고 버전을 확인합니다.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    conn.rollback()
+                    continue
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.commit()
+                print(f"메일함 데이터베이스를 버전 {version}으로 변경했습니다.")
+            except Exception:
+                conn.rollback()
+                raise
 
     def send_mail(self, sender_name, sender_id, receiver_id, message):
         """새로운 메일을 데이터베이스에 저장합니다."""
         if not all([sender_name, sender_id, receiver_id, message]):
             raise ValueError("메일 정보가 불완전합니다.")
         
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
         
         self.cursor.execute(
-            "INSERT INTO mails (sender_name, sender_id, receiver_id, message, timestamp) VALUES (?, ?, ?, ?, ?)",
-            (sender_name, sender_id, receiver_id, message, timestamp)
+            "INSERT INTO mails (sender_name, sender_id, receiver_id, message, timestamp, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (sender_name, sender_id, receiver_id, message, timestamp, int(now))
         )
-        self.conn.commit()
+        self._commit()
 
-    def get_mails_for_user(self, user_id):
-        """특정 사용자가 받은 모든 메일을 시간순으로 정렬하여 반환합니다."""
-        self.cursor.execute(
-            "SELECT * FROM mails WHERE receiver_id = ? ORDER BY timestamp DESC",
-            (user_id,)
-        )
+    def send_bulk(self, sender_name, sender_id, receiver_ids, message):
+        """
+        같은 본문의 메일을 여러 수신자에게 한 번의 트랜잭션으로 보내고, 전송한 메일 수를 반환합니다.
+        본문은 내용 해시로 mail_bodies에 한 번만 저장되고, 수신자마다 배달 행만 추가됩니다.
+        """
+        receiver_ids = [receiver_id for receiver_id in receiver_ids if receiver_id]
+        if not all([sender_name, sender_id, message]):
+            raise ValueError("메일 정보가 불완전합니다.")
+        if not receiver_ids:
+            return 0
+
+        now = time.time()
+        timestamp = datetime.fromtimestamp(now).strftime('%Y-%m-%d %H:%M:%S')
+        digest = body_hash(message)
+        with self.transaction():
+            self.cursor.execute("INSERT OR IGNORE INTO mail_bodies (hash, message) VALUES (?, ?)", (digest, message))
+            self.cursor.executemany(
+                "INSERT INTO mails (sender_name, sender_id, receiver_id, message, timestamp, created_at, body_hash) VALUES (?, ?, ?, '', ?, ?, ?)",
+                [(sender_name, sender_id, receiver_id, timestamp, int(now), digest) for receiver_id in receiver_ids]
+            )
+        return len(receiver_ids)
+
+    def get_mails_for_user(self, user_id, before=None, limit=MAIL_PAGE_SIZE, include_body=True):
+        """
+        특정 사용자가 받은 메일을 최신순으로 최대 limit개 반환합니다.
+        before에 이전 페이지 마지막 메일의 page_key를 넘기면 그보다 오래된 메일부터 이어서 반환합니다.
+        (receiver_id, created_at, id) 인덱스를 역순으로 읽으므로 전체 메일 수와 관계없이 페이지 크기만큼만 읽습니다.
+        include_body가 False이면 본문을 읽지 않으며 (Mail.message는 None), 필요할 때 get_mail_body로 가져옵니다.
+        """
+        columns, join = (MAIL_COLUMNS, MAIL_BODY_JOIN) if include_body else (MAIL_LIST_COLUMNS, "")
+        if before is None:
+            self.cursor.execute(
+                f"SELECT {columns} FROM mails m {join} WHERE m.receiver_id = ? "
+                "ORDER BY m.created_at DESC, m.id DESC LIMIT ?",
+                (user_id, limit)
+            )
+        else:
+            self.cursor.execute(
+                f"SELECT {columns} FROM mails m {join} WHERE m.receiver_id = ? AND (m.created_at, m.id) < (?, ?) "
+                "ORDER BY m.created_at DESC, m.id DESC LIMIT ?",
+                (user_id, before[0], before[1], limit)
+            )
         rows = self.cursor.fetchall()
         return [Mail(*row) for row in rows]
 
-    def close(self):
-        """데이터베이스 연결을 닫습니다."""
-        self.conn.close()
+    def get_mail_body(self, mail_id):
+        """메일 한 건의 본문을 반환합니다. (공유 본문이면 mail_bodies에서 읽습니다)"""
+        self.cursor.execute(f"SELECT COALESCE(b.message, m.message) FROM mails m {MAIL_BODY_JOIN} WHERE m.id = ?", (mail_id,))
+        row = self.cursor.fetchone()
+        return row[0] if row else None
+
+    def get_mail(self, mail_id):
+        """메일 한 건을 본문과 함께 반환합니다. 없으면 None을 반환합니다."""
+        self.cursor.execute(f"SELECT {MAIL_COLUMNS} FROM mails m {MAIL_BODY_JOIN} WHERE m.id = ?", (mail_id,))
+        row = self.cursor.fetchone()
+        return Mail(*row) if row else None
+
+    def get_mail_counts(self, user_id):
+        """사용자의 (전체 메일 수, 안 읽은 메일 수)를 반환합니다. (트리거로 유지되는 카운터를 읽으므로 O(1))"""
+        self.cursor.execute("SELECT total, unread FROM mail_counters WHERE receiver_id = ?", (user_id,))
+        row = self.cursor.fetchone()
+        return (row[0], row[1]) if row else (0, 0)
+
+    def mark_read(self, mail_id):
+        """메일을 읽음으로 표시합니다."""
+        self.cursor.execute("UPDATE mails SET is_read = 1 WHERE id = ? AND is_read = 0", (mail_id,))
+        self._commit()
@@ -0,0 +1,134 @@
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+
+from mail_box import Mailbox, MAIL_COLUMNS, MAIL_BODY_JOIN
+
+RETENTION_CONFIG_FILE = "retention_config.json"
+
+# 메일 보관 정책 (보관 일수)
+# - senders: 보낸 사람(sender_id)별 보관 일수 (예: 자동 알림봇 메일은 7일만 보관)
+# - users: 받는 사람(receiver_id)별 보관 일수
+# - default_days: 위 정책에 해당하지 않는 메일의 보관 일수 (None이면 삭제하지 않음)
+# 여러 정책에 해당하는 메일은 가장 짧은 보관 일수를 따릅니다.
+DEFAULT_RETENTION_POLICY = {
+    "senders": {"system-notifier": 7},
+    "users": {},
+    "default_days": None,
+}
+ARCHIVE_DIR = "mail_archive"
+ARCHIVE_BATCH_SIZE = 1000
+# 메일 정리 작업의 실행 간격 (초)
+RETENTION_INTERVAL = 6 * 3600
+
+def load_retention_policy():
+    """설정 파일의 정책을 기본 정책 위에 덮어써서 반환합니다."""
+    policy = {key: (dict(value) if isinstance(value, dict) else value) for key, value in DEFAULT_RETENTION_POLICY.items()}
+    if os.path.exists(RETENTION_CONFIG_FILE):
+        with open(RETENTION_CONFIG_FILE, 'r') as f:
+            policy.update(json.load(f))
+    for days in list(policy["senders"].values()) + list(policy["users"].values()) + [policy["default_days"] or 0]:
+        if not isinstance(days, (int, float)) or days < 0:
+            raise ValueError(f"잘못된 메일 보관 일수입니다: {days}")
+    return policy
+
+def _expired_conditions(policy, now):
+    """정책을 만료 조건(WHERE 절 목록과 파라미터)으로 변환합니다."""
+    conditions, params = [], []
+    for sender_id, days in policy["senders"].items():
+        conditions.append("(m.sender_id = ? AND m.created_at < ?)")
+        params += [sender_id, int(now - days * 86400)]
+    for receiver_id, days in policy["users"].items():
+        conditions.append("(m.receiver_id = ? AND m.created_at < ?)")
+        params += [receiver_id, int(now - days * 86400)]
+    if policy["default_days"] is not None:
+        conditions.append("m.created_at < ?")
+        params.append(int(now - policy["default_days"] * 86400))
+    return conditions, params
+
+class RetentionResult:
+    """메일 정리 결과 (보관 처리한 메일 수, 회수한 바이트 수, 보관 파일 경로)를 담는 클래스입니다."""
+    def __init__(self, archived, bytes_reclaimed, archive_path, seconds):
+        self.archived = archived
+        self.bytes_reclaimed = bytes_reclaimed
+        self.archive_path = archive_path
+        self.seconds = seconds
+
+    def __str__(self):
+        target = f", 보관 파일: {self.archive_path}" if self.archive_path else ""
+        return f"메일 {self.archived}건 정리, {self.bytes_reclaimed:,}바이트 회수, {self.seconds:.2f}초{target}"
+
+def _database_bytes(conn):
+    return conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+
+def ensure_incremental_vacuum(conn):
+    """
+    데이터베이스를 auto_vacuum=INCREMENTAL 모드로 전환합니다. (최초 한 번 전체 VACUUM이 필요합니다)
+    이후에는 PRAGMA incremental_vacuum으로 빈 페이지만 조금씩 파일에서 반환할 수 있습니다.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        return
+    conn.commit()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    print("메일함 데이터베이스를 증분 VACUUM 모드로 전환했습니다.")
+
+def run_mail_retention(mailbox=None, policy=None, archive_dir=ARCHIVE_DIR, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    보관 기간이 지난 메일을 batch_size개씩 gzip 압축 JSON Lines 파일로 옮긴 뒤 삭제하고,
+    더 이상 참조되지 않는 공유 본문을 지운 다음 증분 VACUUM으로 빈 공간을 반환합니다.
+    배치마다 커밋하므로 정리 중에도 다른 스레드의 메일 읽기/쓰기가 오래 막히지 않습니다.
+    """
+    started = time.perf_counter()
+    mailbox = mailbox or Mailbox()
+    policy = policy or load_retention_policy()
+    conn = mailbox.conn
+    ensure_incremental_vacuum(conn)
+    bytes_before = _database_bytes(conn)
+
+    conditions, params = _expired_conditions(policy, time.time())
+    archived, archive_path, archive = 0, None, None
+    try:
+        if conditions:
+            query = (f"SELECT {MAIL_COLUMNS} FROM mails m {MAIL_BODY_JOIN} "
+                     f"WHERE ({' OR '.join(conditions)}) ORDER BY m.id LIMIT ?")
+            while True:
+                rows = conn.execute(query, params + [batch_size]).fetchall()
+                if not rows:
+                    break
+                if archive is None:
+                    os.makedirs(archive_dir, exist_ok=True)
+                    archive_path = os.path.join(archive_dir, f"mails-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz")
+                    archive = gzip.open(archive_path, 'at', encoding='utf-8')
+                for mail_id, sender_name, sender_id, receiver_id, message, timestamp, created_at, is_read in rows:
+                    archive.write(json.dumps({
+                        "id": mail_id, "sender_name": sender_name, "sender_id": sender_id,
+                        "receiver_id": receiver_id, "message": message, "timestamp": timestamp,
+                        "created_at": created_at, "is_read": bool(is_read),
+                    }, ensure_ascii=False) + "\n")
+                # 보관 파일에 먼저 기록한 뒤에 삭제를 커밋합니다.
+                archive.flush()
+                with mailbox.transaction():
+                    conn.executemany("DELETE FROM mails WHERE id = ?", [(row[0],) for row in rows])
+                archived += len(rows)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    with mailbox.transaction():
+        conn.execute("DELETE FROM mail_bodies WHERE hash NOT IN (SELECT body_hash FROM mails WHERE body_hash IS NOT NULL)")
+    # execute는 문장을 한 단계만 실행하여 빈 페이지를 하나만 반환하므로, 끝까지 실행하는 executescript를 사용합니다.
+    conn.executescript("PRAGMA incremental_vacuum;")
+    bytes_after = _database_bytes(conn)
+    return RetentionResult(archived, bytes_before - bytes_after, archive_path, time.perf_counter() - started)
+
+def mail_retention_job():
+    """(스케줄러 작업) 작업 스레드 전용 연결로 메일 정리를 실행하고 결과를 출력합니다."""
+    mailbox = Mailbox()
+    try:
+        print(f"메일 정리 완료: {run_mail_retention(mailbox)}")
+    finally:
+        # 작업이 끝나면 이 스레드의 연결을 반환합니다.
+        mailbox.close()
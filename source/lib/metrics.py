@@ -0,0 +1,329 @@
+import bisect
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+METRICS_CONFIG_FILE = "metrics_config.json"
+
+# 계측 설정
+# - enabled: False이면 계측 지점은 플래그 확인만 하고 바로 원래 함수를 실행합니다.
+# - export_file: 주기적으로 지표 스냅샷과 최근 구간(span)을 JSON Lines로 기록하는 파일 (크기 기준으로 교체)
+# - prometheus_port: 지정하면 해당 포트에서 Prometheus 텍스트 형식(/metrics)으로 지표를 제공합니다.
+DEFAULT_METRICS_CONFIG = {
+    "enabled": False,
+    "export_file": "metrics.jsonl",
+    "export_interval": 60,
+    "max_bytes": 5 * 1024 * 1024,
+    "backup_count": 3,
+    "prometheus_host": "127.0.0.1",
+    "prometheus_port": None,
+}
+# 지연 시간 히스토그램의 구간 경계(초)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# 파일로 내보내기 전까지 보관하는 최근 구간 수
+RECENT_SPANS = 1000
+
+def load_metrics_config():
+    """설정 파일의 값을 기본 설정 위에 덮어써서 반환합니다."""
+    config = dict(DEFAULT_METRICS_CONFIG)
+    if os.path.exists(METRICS_CONFIG_FILE):
+        with open(METRICS_CONFIG_FILE, 'r') as f:
+            config.update(json.load(f))
+    return config
+
+# 계측 지점은 이 값을 먼저 확인합니다. (enable/disable로 바꿉니다)
+ENABLED = bool(load_metrics_config()["enabled"])
+
+def enable():
+    global ENABLED
+    ENABLED = True
+
+def disable():
+    global ENABLED
+    ENABLED = False
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+class Counter:
+    """레이블 조합별로 누적되는 카운터입니다."""
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def snapshot(self):
+        with self.lock:
+            return [{"labels": dict(key), "value": value} for key, value in self.values.items()]
+
+    def render(self):
+        with self.lock:
+            return [f"{self.name}{_format_labels(key)} {value}" for key, value in self.values.items()]
+
+class Histogram:
+    """레이블 조합별 지연 시간 분포(구간별 개수, 합계, 최댓값)를 기록하는 히스토그램입니다."""
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                # [구간별 개수(마지막은 +Inf), 개수, 합계, 최댓값]
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0, 0.0, 0.0]
+            entry[0][index] += 1
+            entry[1] += 1
+            entry[2] += value
+            entry[3] = max(entry[3], value)
+
+    def _quantile(self, counts, total, q):
+        """구간 경계로 근사한 분위수입니다. (해당 분위가 속한 구간의 상한)"""
+        target, seen = total * q, 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+    def snapshot(self):
+        with self.lock:
+            return [{"labels": dict(key), "count": total, "sum": value_sum, "max": value_max,
+                     "p50": self._quantile(counts, total, 0.5), "p95": self._quantile(counts, total, 0.95),
+                     "p99": self._quantile(counts, total, 0.99)}
+                    for key, (counts, total, value_sum, value_max) in self.values.items()]
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for key, (counts, total, value_sum, _) in self.values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', le)])} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {value_sum}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {total}")
+        return lines
+
+class Registry:
+    """이름별 지표를 보관하고 Prometheus 텍스트/JSON 스냅샷으로 내보냅니다."""
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.recent_spans = deque(maxlen=RECENT_SPANS)
+
+    def _get(self, cls, name, help_text):
+        metric = self.metrics.get(name)
+        if metric is None:
+            with self.lock:
+                metric = self.metrics.setdefault(name, cls(name, help_text))
+        return metric
+
+    def counter(self, name, help_text=""):
+        return self._get(Counter, name, help_text)
+
+    def histogram(self, name, help_text=""):
+        return self._get(Histogram, name, help_text)
+
+    def snapshot(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return {metric.name: {"type": metric.kind, "values": metric.snapshot()} for metric in metrics}
+
+    def drain_spans(self):
+        """최근 구간 기록을 꺼내 반환합니다."""
+        spans = []
+        while self.recent_spans:
+            try:
+                spans.append(self.recent_spans.popleft())
+            except IndexError:
+                break
+        return spans
+
+    def render_prometheus(self):
+        with self.lock:
+            metrics = sorted(self.metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry()
+SPAN_SECONDS = REGISTRY.histogram("span_duration_seconds", "구간(span)별 실행 시간")
+SPAN_ERRORS = REGISTRY.counter("span_errors_total", "예외로 끝난 구간 수")
+_local = threading.local()
+
+def inc(name, amount=1, **labels):
+    """카운터를 증가시킵니다. (계측이 꺼져 있으면 아무것도 하지 않습니다)"""
+    if ENABLED:
+        REGISTRY.counter(name).inc(amount, **labels)
+
+def observe(name, seconds, **labels):
+    """히스토그램에 값을 기록합니다. (계측이 꺼져 있으면 아무것도 하지 않습니다)"""
+    if ENABLED:
+        REGISTRY.histogram(name).observe(seconds, **labels)
+
+class Span:
+    """
+    with 블록의 실행 시간을 span_duration_seconds{span=이름}에 기록하는 구간입니다.
+    같은 스레드 안에서 중첩된 구간은 부모 구간 이름과 함께 최근 구간 목록에 남아, 느린 작업의 내부 단계를 추적할 수 있습니다.
+    """
+    __slots__ = ("name", "labels", "parent", "started_at", "started")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        self.parent = stack[-1].name if stack else None
+        stack.append(self)
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.started
+        _local.stack.pop()
+        SPAN_SECONDS.observe(duration, span=self.name, **self.labels)
+        if exc_type is not None:
+            SPAN_ERRORS.inc(span=self.name, **self.labels)
+        REGISTRY.recent_spans.append({
+            "span": self.name, "parent": self.parent, "labels": self.labels, "start": self.started_at,
+            "duration": duration, "thread": threading.current_thread().name, "error": exc_type.__name__ if exc_type else None,
+        })
+        return False
+
+class _NullSpan:
+    """계측이 꺼져 있을 때 사용하는, 아무것도 하지 않는 구간입니다."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+def span(name, **labels):
+    """with metrics.span("이름"): 형태로 블록의 실행 시간을 기록합니다."""
+    return Span(name, labels) if ENABLED else _NULL_SPAN
+
+def timed(name, **labels):
+    """함수 실행 전체를 하나의 구간으로 기록하는 데코레이터입니다."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with Span(name, labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class MetricsExporter:
+    """
+    지표 스냅샷과 그동안 끝난 구간을 주기적으로 크기 기준 교체(rotating) 파일에 한 줄씩 기록합니다.
+    prometheus_port가 설정되어 있으면 /metrics 경로로 Prometheus 텍스트 형식도 제공합니다.
+    """
+    def __init__(self, config=None, registry=REGISTRY):
+        self.config = config or load_metrics_config()
+        self.registry = registry
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.server = None
+        self.logger = logging.getLogger("inventory.metrics")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.handler = RotatingFileHandler(self.config["export_file"], maxBytes=int(self.config["max_bytes"]),
+                                           backupCount=int(self.config["backup_count"]), encoding="utf-8")
+        self.handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def start(self):
+        self.logger.addHandler(self.handler)
+        self.thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+        self.thread.start()
+        if self.config.get("prometheus_port"):
+            self.server = start_prometheus_server(self.config["prometheus_host"], int(self.config["prometheus_port"]), self.registry)
+        print(f"성능 지표를 '{self.config['export_file']}'에 기록합니다.")
+
+    def _run(self):
+        while not self.stop_event.wait(float(self.config["export_interval"])):
+            self.export()
+
+    def export(self):
+        """현재 지표와 최근 구간을 파일에 한 줄로 기록합니다."""
+        record = {"time": time.time(), "metrics": self.registry.snapshot(), "spans": self.registry.drain_spans()}
+        try:
+            self.logger.info(json.dumps(record, ensure_ascii=False))
+        except Exception as e:
+            print(f"성능 지표 기록 중 오류 발생: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.export()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+class PrometheusHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_prometheus_server(host, port, registry=REGISTRY):
+    """별도 스레드에서 Prometheus 텍스트 형식 지표를 제공하는 서버를 시작하고 반환합니다."""
+    server = HTTPServer((host, port), PrometheusHandler)
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics-prometheus", daemon=True).start()
+    print(f"Prometheus 지표를 http://{host}:{port}/metrics 에서 제공합니다.")
+    return server
@@ -0,0 +1,152 @@
+import csv
+import math
+import os
+import threading
+
+import numpy as np
+
+# 전국 시·도와 시·군·구 목록 (시·도,시·군·구,위도,경도). 시·군·구가 비어 있는 행은 시·도 자체(청사 위치)입니다.
+REGIONS_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "regions.csv")
+
+# 기상청 동네예보 격자(Lambert 정각원추도법) 변환 상수
+_RE = 6371.00877      # 지구 반경(km)
+_GRID = 5.0           # 격자 간격(km)
+_SLAT1, _SLAT2 = 30.0, 60.0  # 표준 위도
+_OLON, _OLAT = 126.0, 38.0   # 기준점 경도/위도
+_XO, _YO = 43, 136           # 기준점 격자 좌표
+
+def _projection_constants():
+    """투영 상수(re, sn, sf, ro)를 계산합니다. 모듈을 불러올 때 한 번만 실행됩니다."""
+    degrad = math.pi / 180.0
+    re = _RE / _GRID
+    slat1, slat2, olat = _SLAT1 * degrad, _SLAT2 * degrad, _OLAT * degrad
+    sn = math.tan(math.pi * 0.25 + slat2 * 0.5) / math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sn = math.log(math.cos(slat1) / math.cos(slat2)) / math.log(sn)
+    sf = math.tan(math.pi * 0.25 + slat1 * 0.5)
+    sf = math.pow(sf, sn) * math.cos(slat1) / sn
+    ro = math.tan(math.pi * 0.25 + olat * 0.5)
+    ro = re * sf / math.pow(ro, sn)
+    return re, sn, sf, ro
+
+_RE_GRID, _SN, _SF, _RO = _projection_constants()
+_DEGRAD = math.pi / 180.0
+_OLON_RAD = _OLON * _DEGRAD
+
+def dfs_grid_conv_array(lats, lons):
+    """
+    위도/경도 배열을 기상청 격자 좌표 (nx, ny) 정수 배열로 한 번에 변환합니다.
+    투영 상수는 미리 계산해 두므로 좌표마다 삼각함수/로그를 다시 계산하지 않습니다.
+    """
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    ra = _RE_GRID * _SF / np.power(np.tan(math.pi * 0.25 + lats * _DEGRAD * 0.5), _SN)
+    theta = lons * _DEGRAD - _OLON_RAD
+    theta = np.where(theta > math.pi, theta - 2.0 * math.pi, theta)
+    theta = np.where(theta < -math.pi, theta + 2.0 * math.pi, theta)
+    theta *= _SN
+    nx = np.floor(ra * np.sin(theta) + _XO + 0.5).astype(int)
+    ny = np.floor(_RO - ra * np.cos(theta) + _YO + 0.5).astype(int)
+    return nx, ny
+
+def dfs_grid_conv(lat, lon):
+    """위도/경도 한 점을 기상청 격자 좌표 (nx, ny)로 변환합니다."""
+    ra = _RE_GRID * _SF / math.pow(math.tan(math.pi * 0.25 + lat * _DEGRAD * 0.5), _SN)
+    theta = lon * _DEGRAD - _OLON_RAD
+    if theta > math.pi: theta -= 2.0 * math.pi
+    if theta < -math.pi: theta += 2.0 * math.pi
+    theta *= _SN
+    return int(math.floor(ra * math.sin(theta) + _XO + 0.5)), int(math.floor(_RO - ra * math.cos(theta) + _YO + 0.5))
+
+class Region:
+    """지역 하나의 이름, 좌표와 미리 계산된 기상청 격자 좌표를 담는 클래스입니다."""
+    def __init__(self, sido, sigungu, lat, lon, nx, ny):
+        self.sido = sido
+        self.sigungu = sigungu
+        # 시·도는 '서울', 시·군·구는 '서울 종로구'처럼 부릅니다. (뉴스 검색어로도 그대로 사용됩니다)
+        self.name = f"{sido} {sigungu}" if sigungu else sido
+        self.lat = lat
+        self.lon = lon
+        self.grid = (nx, ny)
+
+    def __repr__(self):
+        return f"Region({self.name!r}, grid={self.grid})"
+
+class RegionRegistry:
+    """
+    전국 지역 목록입니다. 불러올 때 모든 지역의 격자 좌표를 벡터 연산으로 한 번에 계산하므로,
+    요청 시에는 이름으로 격자를 찾기만 하면 됩니다.
+    - get(name) / grid(name): 이름으로 지역/격자 조회
+    - nearest(lat, lon): 좌표에서 가장 가까운 지역
+    - sidos() / districts(sido): 계정 생성 화면에서 시·도를 먼저 고르고 그 안의 지역을 고르는 데 사용
+    - regions_by_grid(): 같은 격자를 쓰는 지역끼리 묶은 딕셔너리 (날씨 요청을 격자당 한 번으로 줄이는 데 사용)
+    """
+    def __init__(self, rows):
+        """rows: (시·도, 시·군·구, 위도, 경도) 튜플 목록"""
+        rows = list(rows)
+        self.lats = np.array([row[2] for row in rows], dtype=float)
+        self.lons = np.array([row[3] for row in rows], dtype=float)
+        nx, ny = dfs_grid_conv_array(self.lats, self.lons)
+        self.regions = [Region(sido, sigungu, lat, lon, int(x), int(y))
+                        for (sido, sigungu, lat, lon), x, y in zip(rows, nx, ny)]
+        self.by_name = {}
+        for region in self.regions:
+            if region.name in self.by_name:
+                raise ValueError(f"지역 이름이 중복되었습니다: {region.name}")
+            self.by_name[region.name] = region
+        # 최근접 지역 계산용: 위도에 따라 경도 1도의 거리가 줄어드는 것을 보정한 평면 좌표
+        self.cos_lat = np.cos(np.radians(self.lats))
+        self.is_district = np.array([bool(region.sigungu) for region in self.regions], dtype=bool)
+
+    @classmethod
+    def load(cls, path=REGIONS_DATA_FILE):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            return cls((row["sido"], row["sigungu"], float(row["lat"]), float(row["lon"])) for row in csv.DictReader(f))
+
+    def __len__(self):
+        return len(self.regions)
+
+    def __contains__(self, name):
+        return name in self.by_name
+
+    def get(self, name):
+        return self.by_name.get(name)
+
+    def grid(self, name):
+        """지역의 격자 좌표 (nx, ny)를 반환합니다. 없는 지역이면 None을 반환합니다."""
+        region = self.by_name.get(name)
+        return region.grid if region else None
+
+    def sidos(self):
+        """시·도 이름을 데이터 파일 순서대로 반환합니다."""
+        return [region.name for region in self.regions if not region.sigungu]
+
+    def districts(self, sido):
+        """시·도 자체와 그 안의 시·군·구 이름을 반환합니다. (예: ['서울', '서울 종로구', ...])"""
+        return [region.name for region in self.regions if region.sido == sido]
+
+    def nearest(self, lat, lon, include_sido=False):
+        """좌표에서 가장 가까운 지역을 반환합니다. 기본적으로 시·군·구 중에서 찾습니다."""
+        distances = (self.lats - lat) ** 2 + ((self.lons - lon) * self.cos_lat) ** 2
+        if not include_sido:
+            distances = np.where(self.is_district, distances, np.inf)
+        return self.regions[int(np.argmin(distances))]
+
+    def regions_by_grid(self, names=None):
+        """{(nx, ny): [지역 이름, ...]} 형태로 같은 격자의 지역을 묶습니다. names가 주어지면 해당 지역만 묶습니다."""
+        groups = {}
+        for name in (self.by_name if names is None else names):
+            region = self.by_name.get(name)
+            if region is not None:
+                groups.setdefault(region.grid, []).append(name)
+        return groups
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """프로세스 전체에서 공유하는 지역 목록을 반환합니다. (처음 호출할 때 데이터 파일을 불러옵니다)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = RegionRegistry.load()
+        return _registry
@@ -0,0 +1,123 @@
+import os
+import json
+import multiprocessing
+import pandas as pd
+
+from Analyze import train_model, SYNTHETIC_COLUMNS
+from storage import connect
+
+# 재학습 파이프라인 상태 및 누적 훈련 데이터 경로
+RETRAIN_STATE_PATH = "retrain_state.json"
+TRAINING_HISTORY_PATH = "training_history.csv"
+# 실데이터가 이 행 수 이상 쌓였을 때만 모델을 교체합니다.
+MIN_TRAINING_ROWS = 200
+# 재학습에 사용하는 최근 이력의 최대 행 수. 누적 훈련 데이터 파일도 이 크기로 유지됩니다.
+TRAINING_WINDOW_ROWS = 200_000
+# 변동 수량이 이 값을 넘으면 수요 증가/감소로 분류합니다. (가상 데이터의 '수요 보통' 범위: -2 ~ +2)
+DEMAND_THRESHOLD = 2
+HISTORY_BATCH_SIZE = 5000
+
+def _load_state():
+    """마지막으로 처리한 재고 이력 id를 불러옵니다."""
+    if os.path.exists(RETRAIN_STATE_PATH):
+        with open(RETRAIN_STATE_PATH, 'r') as f:
+            return json.load(f)
+    return {"last_history_id": 0, "training_rows": 0}
+
+def _save_state(state):
+    with open(RETRAIN_STATE_PATH, 'w') as f:
+        json.dump(state, f)
+
+def _label_demand(quantity_change):
+    """변동 수량을 가상 데이터와 같은 기준의 수요 수준 라벨로 변환합니다."""
+    if quantity_change > DEMAND_THRESHOLD: return "수요 증가"
+    if quantity_change < -DEMAND_THRESHOLD: return "수요 감소"
+    return "수요 보통"
+
+def iter_new_history(db_path, since_id, batch_size=HISTORY_BATCH_SIZE):
+    """
+    since_id 이후에 추가된 재고 이력만 batch_size 단위로 읽어 훈련 데이터 형식의 DataFrame으로 반환합니다.
+    각 배치는 (DataFrame, 배치의 마지막 id, 제외한 행 수) 튜플입니다.
+    날씨 정보(기온)나 카테고리가 없는 행은 모델 특성을 만들 수 없으므로 훈련에서 제외됩니다.
+    (대량 가져오기는 수요 변동이 아니므로 애초에 재고 이력에 기록되지 않습니다. Inventory.bulk_upsert 참고)
+    """
+    conn = connect(db_path)
+    try:
+        last_id = since_id
+        while True:
+            rows = conn.execute(
+                "SELECT id, temperature, is_raining, has_festival, has_concert, category, quantity_change "
+                "FROM stock_history WHERE id > ? ORDER BY id LIMIT ?", (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            records, skipped = [], 0
+            for _, temp, is_raining, has_festival, has_concert, category, quantity_change in rows:
+                if temp is None or category is None:
+                    skipped += 1
+                    continue
+                records.append([temp, int(is_raining or 0), 1 if temp >= 30 else 0, int(has_festival or 0),
+                                int(has_concert or 0), category, _label_demand(quantity_change), quantity_change])
+            yield pd.DataFrame(records, columns=SYNTHETIC_COLUMNS), last_id, skipped
+    finally:
+        conn.close()
+
+def run_retraining(db_path="inventory.db"):
+    """
+    지난 실행 이후 추가된 재고 이력만 누적 훈련 데이터에 덧붙이고,
+    데이터가 충분하면 실데이터로 수요 예측 모델을 다시 훈련합니다.
+    랜덤 포레스트는 증분 학습을 지원하지 않으므로 매번 처음부터 다시 훈련(full refit)하며,
+    훈련 시간이 이력과 함께 계속 늘어나지 않도록 최근 TRAINING_WINDOW_ROWS행만 사용합니다.
+
+    Returns:
+        bool: 모델을 새로 훈련했으면 True
+    """
+    state = _load_state()
+    if not os.path.exists(db_path):
+        print("재고 데이터베이스가 없어 재학습을 건너뜁니다.")
+        return False
+
+    new_rows, skipped_rows = 0, 0
+    for chunk, last_id, skipped in iter_new_history(db_path, state["last_history_id"]):
+        skipped_rows += skipped
+        if not chunk.empty:
+            chunk.to_csv(TRAINING_HISTORY_PATH, mode='a', index=False, header=not os.path.exists(TRAINING_HISTORY_PATH))
+            new_rows += len(chunk)
+        state["last_history_id"] = last_id
+    state["training_rows"] = state.get("training_rows", 0) + new_rows
+    _save_state(state)
+    print(f"새 재고 이력 {new_rows}행을 처리했습니다. (누적 {state['training_rows']}행)")
+    if skipped_rows:
+        print(f"날씨 정보가 없는 재고 이력 {skipped_rows}행은 훈련에서 제외했습니다. (기상청 API 키 설정을 확인하세요)")
+
+    if new_rows == 0:
+        print("새로운 재고 이력이 없어 기존 모델을 유지합니다.")
+        return False
+    if state["training_rows"] < MIN_TRAINING_ROWS:
+        print("실데이터가 충분하지 않아 기존 모델을 유지합니다.")
+        return False
+
+    train_model(df=load_training_window(TRAINING_WINDOW_ROWS))
+    return True
+
+def load_training_window(window=TRAINING_WINDOW_ROWS):
+    """누적 훈련 데이터에서 최근 window행을 불러오고, 파일도 그 크기로 줄여 둡니다."""
+    df = pd.read_csv(TRAINING_HISTORY_PATH)
+    if len(df) > window:
+        df = df.tail(window).reset_index(drop=True)
+        df.to_csv(TRAINING_HISTORY_PATH, index=False)
+    return df
+
+def _retraining_entry(db_path):
+    # 자식 프로세스의 종료 코드로 모델 교체 여부를 알립니다. (0: 교체됨, 1: 유지)
+    raise SystemExit(0 if run_retraining(db_path) else 1)
+
+def start_retraining_process(db_path="inventory.db"):
+    """
+    GUI와 타이머 스레드를 막지 않도록 별도 프로세스에서 재학습을 시작합니다.
+    반환된 Process의 exitcode가 0이면 새 모델이 저장된 것입니다.
+    """
+    process = multiprocessing.get_context("spawn").Process(target=_retraining_entry, args=(db_path,), daemon=True)
+    process.start()
+    return process
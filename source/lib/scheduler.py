@@ -0,0 +1,336 @@
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import metrics
+
+SCHEDULER_CONFIG_FILE = "scheduler_config.json"
+SCHEDULER_STATE_FILE = "scheduler_state.json"
+# 이전 Timer가 사용하던 설정 파일 (뉴스 알림 간격의 기본값으로 사용)
+LEGACY_TIMER_CONFIG_FILE = "timer_config.json"
+# 작업을 실행하는 스레드 수 (동시에 실행되는 작업 수의 상한)
+SCHEDULER_WORKERS = 4
+
+def load_legacy_interval(default=3600):
+    """이전 timer_config.json의 interval 값을 불러옵니다. 없으면 기본값(3600초)을 반환합니다."""
+    if os.path.exists(LEGACY_TIMER_CONFIG_FILE):
+        with open(LEGACY_TIMER_CONFIG_FILE, 'r') as f:
+            return json.load(f).get("interval", default)
+    return default
+
+def _load_json(path):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {}
+
+def _save_json(path, data):
+    """임시 파일에 쓴 뒤 교체하여, 저장 중에 종료되어도 이전 내용이 깨지지 않도록 합니다."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+class CronExpression:
+    """
+    '분 시 일 월 요일' 5개 필드로 된 cron 표현식입니다. (예: '0 3 * * *' = 매일 03:00)
+    각 필드는 *, 숫자, 범위(1-5), 목록(1,15), 간격(*/10, 0-30/5)을 지원하며 요일은 0(일)~6(토)입니다.
+    일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행합니다. (표준 cron 규칙)
+    """
+    FIELDS = [("분", 0, 59), ("시", 0, 23), ("일", 1, 31), ("월", 1, 12), ("요일", 0, 7)]
+
+    def __init__(self, expression):
+        parts = expression.split()
+        if len(parts) != 5:
+            raise ValueError(f"cron 표현식은 5개 필드여야 합니다: '{expression}'")
+        self.expression = expression
+        self.minutes, self.hours, self.days, self.months, weekdays = [
+            self._parse_field(part, name, low, high) for part, (name, low, high) in zip(parts, self.FIELDS)
+        ]
+        # 7도 일요일로 취급합니다.
+        self.weekdays = {0 if day == 7 else day for day in weekdays}
+        self.day_restricted = parts[2] != "*"
+        self.weekday_restricted = parts[4] != "*"
+
+    @staticmethod
+    def _parse_field(field, name, low, high):
+        values = set()
+        try:
+            for part in field.split(","):
+                step = 1
+                if "/" in part:
+                    part, step = part.split("/", 1)
+                    step = int(step)
+                if part == "*":
+                    start, end = low, high
+                elif "-" in part:
+                    start, end = (int(value) for value in part.split("-", 1))
+                else:
+                    start = int(part)
+                    end = high if step > 1 else start
+                if step < 1 or not low <= start <= end <= high:
+                    raise ValueError
+                values.update(range(start, end + 1, step))
+        except ValueError:
+            raise ValueError(f"cron 표현식의 '{name}' 필드가 올바르지 않습니다: '{field}'")
+        return values
+
+    def _day_matches(self, dt):
+        day_ok = dt.day in self.days
+        weekday_ok = dt.isoweekday() % 7 in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, dt):
+        """dt 이후(dt 제외)의 가장 가까운 실행 시각을 반환합니다."""
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"'{self.expression}'에 해당하는 실행 시각이 없습니다.")
+
+class Job:
+    """스케줄러에 등록된 작업 하나의 실행 주기와 실행 통계를 담는 클래스입니다."""
+    def __init__(self, name, fn, interval=None, cron=None, jitter=0.0, run_immediately=False):
+        if (interval is None) == (cron is None):
+            raise ValueError(f"'{name}' 작업에는 interval과 cron 중 하나만 지정해야 합니다.")
+        if interval is not None and interval <= 0:
+            raise ValueError(f"'{name}' 작업의 실행 간격은 0보다 커야 합니다.")
+        self.name = name
+        self.fn = fn
+        self.interval = interval
+        self.cron = CronExpression(cron) if cron else None
+        self.jitter = jitter
+        self.run_immediately = run_immediately
+        # scheduled_at: 지터를 더하기 전의 예정 시각 (다음 주기는 이 값을 기준으로 계산합니다)
+        # due_at: 지터를 더한 실제 실행 시각
+        self.scheduled_at = None
+        self.due_at = None
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_duration = 0.0
+        self.last_duration = 0.0
+        self.last_run = None
+        self.last_slot = None
+        self.last_error = None
+
+    def schedule(self, scheduled_at):
+        self.scheduled_at = scheduled_at
+        self.due_at = scheduled_at + (random.uniform(0, self.jitter) if self.jitter else 0)
+
+    def next_slot(self, after):
+        """after(epoch) 이후의 다음 예정 시각을 반환합니다."""
+        if self.cron:
+            return self.cron.next_after(datetime.fromtimestamp(after)).timestamp()
+        return after + self.interval
+
+    def restore(self, state):
+        """저장된 실행 상태와 통계를 복원합니다."""
+        for key in ("runs", "failures", "skipped", "total_duration", "last_duration", "last_run", "last_slot", "last_error"):
+            if key in state:
+                setattr(self, key, state[key])
+
+    def to_state(self):
+        return {"runs": self.runs, "failures": self.failures, "skipped": self.skipped,
+                "total_duration": self.total_duration, "last_duration": self.last_duration,
+                "last_run": self.last_run, "last_slot": self.last_slot, "last_error": self.last_error}
+
+    def to_dict(self):
+        stats = self.to_state()
+        stats.update(
+            schedule=self.cron.expression if self.cron else f"{self.interval}초마다",
+            avg_duration=self.total_duration / self.runs if self.runs else 0.0,
+            next_run=self.due_at, running=self.running,
+        )
+        return stats
+
+class Scheduler:
+    """
+    이름이 붙은 여러 주기 작업을 실행하는 스케줄러입니다.
+    - 각 작업은 실행 간격(interval, 초) 또는 cron 표현식으로 주기를 지정합니다.
+    - 고정 비율(fixed-rate) 방식: 다음 실행 시각은 작업이 끝난 시각이 아니라 이전 예정 시각을 기준으로 계산합니다.
+    - jitter를 주면 예정 시각에 0~jitter초의 임의 지연을 더해 여러 작업/프로세스가 같은 순간에 몰리지 않게 합니다.
+    - 이전 실행이 아직 끝나지 않은 작업은 이번 차례를 건너뜁니다. (겹쳐 실행하지 않음)
+    - 작업은 최대 max_workers개의 스레드 풀에서 실행되며, 마지막 실행 상태와 통계는 파일에 저장됩니다.
+    - 설정 파일(scheduler_config.json)에 {"작업 이름": {"interval": 초} 또는 {"cron": "..."}}로 주기를 덮어쓸 수 있습니다.
+    """
+    def __init__(self, max_workers=SCHEDULER_WORKERS, state_path=SCHEDULER_STATE_FILE, config_path=SCHEDULER_CONFIG_FILE):
+        self.max_workers = max_workers
+        self.state_path = state_path
+        self.config_path = config_path
+        self.config = _load_json(config_path)
+        self.state = _load_json(state_path)
+        self.jobs = {}
+        self.condition = threading.Condition()
+        self.pool = None
+        self.thread = None
+        self.stopped = False
+
+    def add_job(self, name, fn, interval=None, cron=None, jitter=0.0, run_immediately=False):
+        """작업을 등록합니다. 설정 파일에 같은 이름의 주기가 있으면 그 값을 사용합니다."""
+        override = self.config.get(name, {})
+        if "cron" in override:
+            interval, cron = None, override["cron"]
+        elif "interval" in override:
+            interval, cron = override["interval"], None
+        job = Job(name, fn, interval, cron, override.get("jitter", jitter), run_immediately)
+        job.restore(self.state.get(name, {}))
+        with self.condition:
+            if name in self.jobs:
+                raise ValueError(f"'{name}' 작업이 이미 등록되어 있습니다.")
+            self.jobs[name] = job
+            if self.thread is not None:
+                self._initial_schedule(job, time.time())
+                self.condition.notify_all()
+        return job
+
+    def _initial_schedule(self, job, now):
+        """시작 시 첫 실행 시각을 정합니다. 저장된 마지막 예정 시각이 있으면 그 주기를 이어갑니다."""
+        if job.run_immediately:
+            job.schedule(now)
+        elif job.cron:
+            job.schedule(job.next_slot(now))
+        elif job.last_slot is not None:
+            # 꺼져 있는 동안 실행 시각이 지났다면 바로 한 번 실행합니다.
+            job.schedule(max(now, job.last_slot + job.interval))
+        else:
+            job.schedule(now + job.interval)
+
+    def start(self):
+        with self.condition:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.stopped = False
+            self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scheduler")
+            now = time.time()
+            for job in self.jobs.values():
+                self._initial_schedule(job, now)
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        print(f"스케줄러가 시작되었습니다. (작업 {len(self.jobs)}개)")
+
+    def stop(self):
+        """스케줄러를 중지합니다. 실행 중인 작업은 기다리지 않습니다."""
+        with self.condition:
+            if self.thread is None:
+                return
+            self.stopped = True
+            self.condition.notify_all()
+        self.thread.join(timeout=2)
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        with self.condition:
+            self.thread = None
+            self._save_state()
+        print("스케줄러가 중지되었습니다.")
+
+    def _run(self):
+        with self.condition:
+            while not self.stopped:
+                now = time.time()
+                for job in self.jobs.values():
+                    if job.due_at is not None and job.due_at <= now:
+                        self._fire(job, now)
+                next_due = min((job.due_at for job in self.jobs.values() if job.due_at is not None), default=None)
+                self.condition.wait(None if next_due is None else max(0.0, next_due - time.time()))
+
+    def _fire(self, job, now):
+        """(잠금을 잡은 상태에서 호출) 작업을 풀에 넣고 다음 예정 시각을 계산합니다."""
+        slot = job.scheduled_at
+        if job.running:
+            job.skipped += 1
+            metrics.inc("job_runs_total", job=job.name, result="skipped")
+            print(f"'{job.name}' 작업이 아직 실행 중이므로 이번 차례를 건너뜁니다.")
+        else:
+            job.running = True
+            self.pool.submit(self._execute, job, slot)
+        self._advance(job, slot, now)
+
+    def _advance(self, job, slot, now):
+        if job.cron:
+            job.schedule(job.next_slot(max(slot, now)))
+            return
+        next_slot = slot + job.interval
+        if next_slot <= now:
+            # 밀린 차례는 몰아서 실행하지 않고 건너뛴 것으로 기록합니다.
+            missed = int((now - next_slot) // job.interval) + 1
+            job.skipped += missed
+            next_slot += missed * job.interval
+        job.schedule(next_slot)
+
+    def _execute(self, job, slot):
+        started_at, started = time.time(), time.perf_counter()
+        error = None
+        try:
+            # 작업 안에서 기록되는 구간(DB, HTTP, 모델)은 이 구간을 부모로 남습니다.
+            with metrics.span("job", job=job.name):
+                job.fn()
+        except Exception as e:
+            error = e
+            print(f"'{job.name}' 작업 실행 중 오류 발생: {e}")
+        duration = time.perf_counter() - started
+        metrics.inc("job_runs_total", job=job.name, result="error" if error else "ok")
+        with self.condition:
+            job.running = False
+            job.runs += 1
+            job.failures += 1 if error else 0
+            job.total_duration += duration
+            job.last_duration = duration
+            job.last_run = started_at
+            job.last_slot = slot if slot is not None else job.last_slot
+            job.last_error = str(error) if error else None
+            self._save_state()
+
+    def _save_state(self):
+        self.state.update({name: job.to_state() for name, job in self.jobs.items()})
+        try:
+            _save_json(self.state_path, self.state)
+        except OSError as e:
+            print(f"스케줄러 상태 저장 중 오류 발생: {e}")
+
+    def run_now(self, name):
+        """작업을 즉시 한 번 실행합니다. 이미 실행 중이면 False를 반환합니다. (다음 예정 시각은 바뀌지 않습니다)"""
+        with self.condition:
+            job = self.jobs[name]
+            if job.running or self.pool is None or self.stopped:
+                return False
+            job.running = True
+            self.pool.submit(self._execute, job, None)
+            return True
+
+    def set_interval(self, name, seconds):
+        """작업의 실행 간격을 바꾸고 설정 파일에 저장합니다. (다음 실행은 새 간격으로 다시 계산됩니다)"""
+        if seconds <= 0:
+            raise ValueError("실행 간격은 0보다 커야 합니다.")
+        with self.condition:
+            job = self.jobs[name]
+            job.interval, job.cron = seconds, None
+            if self.thread is not None:
+                job.schedule(max(time.time(), (job.last_slot or time.time()) + seconds))
+                self.condition.notify_all()
+            self.config[name] = {"interval": seconds}
+            _save_json(self.config_path, self.config)
+        print(f"'{name}' 작업의 실행 간격이 {seconds}초로 설정되었습니다.")
+
+    def get_interval(self, name):
+        return self.jobs[name].interval
+
+    def stats(self):
+        """작업별 실행 횟수, 실패 횟수, 건너뛴 횟수, 소요 시간 통계의 스냅샷을 반환합니다."""
+        with self.condition:
+            return {name: job.to_dict() for name, job in self.jobs.items()}
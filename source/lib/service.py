@@ -0,0 +1,194 @@
+import threading
+from datetime import datetime
+
+from account_management import AccountManager
+from Localinfo import search_titles, search_titles_multi, is_error
+from mail_retention import mail_retention_job, RETENTION_INTERVAL
+from Analyze import load_model_async, demand_context
+from retrain import start_retraining_process
+from scheduler import Scheduler, load_legacy_interval
+from storage import close_all_connections
+import metrics
+from weather import get_region_weather, get_grid_weather
+from regions import get_registry
+
+# 이산 특성 공간 전체를 미리 계산한 예측 테이블 사용 여부 (컴파일 모드)
+USE_COMPILED_PREDICTION = True
+# 예약 작업 주기 (scheduler_config.json으로 덮어쓸 수 있습니다)
+# - 뉴스 알림: timer_config.json의 간격을 기본값으로 사용합니다.
+# - 날씨: 초단기예보가 매시 갱신되므로 매시 10분에 미리 받아 둡니다.
+# - 재학습: 매일 새벽 3시
+NEWS_JOB_JITTER = 30
+WEATHER_PREFETCH_CRON = "10 * * * *"
+WEATHER_JOB_JITTER = 60
+RETRAINING_CRON = "0 3 * * *"
+# 수요 예측에 사용하는 지역 소식 키워드
+DEMAND_EVENT_KEYWORDS = ["축제", "공연"]
+
+def successful_results(results):
+    """{키워드: 제목 목록}에서 검색에 실패한 키워드를 뺍니다. (실패 안내 문구가 소식이나 행사로 취급되지 않도록)"""
+    return {keyword: titles for keyword, titles in results.items() if not is_error(titles)}
+
+class AppService:
+    """
+    화면(Tk)과 상관없이 동작하는 애플리케이션 백엔드입니다.
+    계정/메일함, 수요 예측 모델(프로세스당 하나), 지역별 상황 정보, 예약 작업(스케줄러)을 한곳에서 관리하며
+    Tk 화면(MainApp)과 로컬 JSON API 서버(api_server)가 같은 인스턴스를 함께 사용합니다.
+    데이터베이스 연결은 공용 연결 관리자가 스레드별로 관리하므로 여러 요청 스레드에서 동시에 호출할 수 있습니다.
+    """
+    def __init__(self, enable_metrics=False):
+        # 데이터베이스 연결을 열기 전에 켜야 SQLite 호출도 계측됩니다.
+        if enable_metrics:
+            metrics.enable()
+        self.account_manager = AccountManager()
+        # 모델 로딩(필요 시 훈련)은 백그라운드에서 진행합니다.
+        self.model_future = load_model_async(compiled=USE_COMPILED_PREDICTION)
+        # 지역별 최근 날씨/행사 정보 (재고 이력 기록 시 함께 저장됩니다)
+        self.demand_contexts = {}
+        self.retrain_process = None
+        self.retrain_lock = threading.Lock()
+        # 자동 알림 메일을 보낸 뒤 호출할 함수 목록 (예: 화면의 안 읽은 메일 수 갱신)
+        self.mail_listeners = []
+        # 성능 지표를 파일(과 Prometheus 엔드포인트)로 내보내는 작업 (계측이 켜져 있을 때만)
+        self.metrics_exporter = None
+
+        # 주기 작업: 뉴스 알림 메일, 날씨 미리 받기, 메일함 정리(보관/공간 회수), 수요 예측 모델 재학습
+        self.scheduler = Scheduler()
+        self.scheduler.add_job("news", self.send_periodic_news, interval=load_legacy_interval(), jitter=NEWS_JOB_JITTER)
+        self.scheduler.add_job("weather", self.prefetch_weather, cron=WEATHER_PREFETCH_CRON, jitter=WEATHER_JOB_JITTER, run_immediately=True)
+        self.scheduler.add_job("mail_maintenance", mail_retention_job, interval=RETENTION_INTERVAL, run_immediately=True)
+        self.scheduler.add_job("retraining", self.run_scheduled_retraining, cron=RETRAINING_CRON)
+
+    def start(self):
+        if metrics.ENABLED and self.metrics_exporter is None:
+            self.metrics_exporter = metrics.MetricsExporter()
+            self.metrics_exporter.start()
+        self.scheduler.start()
+
+    def close(self):
+        self.scheduler.stop()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+        # 모든 스레드의 데이터베이스 연결을 한 번에 정리합니다.
+        close_all_connections()
+
+    def get_demand_model(self):
+        """(작업 스레드에서 호출) 모델 로딩이 끝날 때까지 기다린 뒤 DemandModel을 반환합니다."""
+        return self.model_future.result()
+
+    def model_ready(self):
+        return self.model_future.done() and self.model_future.exception() is None
+
+    def reload_model(self):
+        """새 모델이 저장되었으므로 백그라운드에서 다시 불러옵니다."""
+        self.model_future = load_model_async(compiled=USE_COMPILED_PREDICTION)
+        print("재학습된 수요 예측 모델을 불러옵니다.")
+
+    def remember_demand_context(self, location, weather_data=None, event_data=None):
+        """최근에 수집한 날씨/행사 정보를 지역별로 보관합니다. (어느 스레드에서든 호출 가능)"""
+        context = dict(self.demand_contexts.get(location, {}))
+        latest = demand_context(weather_data or {}, event_data or {})
+        if weather_data and 'error' not in weather_data and '온도' in weather_data:
+            context.update(temperature=latest["temperature"], is_raining=latest["is_raining"])
+        if event_data is not None:
+            context.update(has_festival=latest["has_festival"], has_concert=latest["has_concert"])
+        self.demand_contexts[location] = context
+
+    def collect_demand_context(self, location):
+        """(작업 스레드) 지역의 날씨와 행사 소식을 수집하여 (weather_data, event_data)를 반환합니다."""
+        weather_data = get_region_weather(location)
+        event_data = successful_results(search_titles(location, DEMAND_EVENT_KEYWORDS))
+        self.remember_demand_context(location, weather_data, event_data)
+        if "error" in weather_data: raise ValueError(f"날씨 정보 수집 실패: {weather_data['error']}")
+        return weather_data, event_data
+
+    def predict_demand(self, location, categories):
+        """(작업 스레드) 지역의 현재 날씨/소식으로 여러 카테고리의 수요를 한 번에 예측합니다."""
+        weather_data, event_data = self.collect_demand_context(location)
+        return self.get_demand_model().predict_batch(categories, weather_data, event_data)
+
+    def start_retraining(self):
+        """재학습 프로세스를 시작하고 반환합니다. 이미 진행 중이면 None을 반환합니다."""
+        with self.retrain_lock:
+            if self.retrain_process and self.retrain_process.is_alive():
+                return None
+            self.retrain_process = start_retraining_process()
+            return self.retrain_process
+
+    def run_scheduled_retraining(self):
+        """(스케줄러에서 실행됨) 재학습 프로세스를 실행하고, 새 모델이 저장되면 다시 불러옵니다."""
+        process = self.start_retraining()
+        if process is None:
+            print("이미 재학습이 진행 중이므로 예약된 재학습을 건너뜁니다."); return
+        process.join()
+        if process.exitcode == 0:
+            self.reload_model()
+
+    def active_locations(self):
+        """사용자가 한 명 이상 있는 지역 목록입니다. (전국 지역 중 실제로 날씨/소식을 받아야 하는 지역)"""
+        return sorted({row[3] for row in self.account_manager.get_directory().all()})
+
+    def prefetch_weather(self):
+        """(스케줄러에서 실행됨) 사용자가 있는 지역의 날씨를 격자당 한 번씩 미리 받아 캐시와 수요 예측용 상황 정보를 갱신합니다."""
+        for grid, locations in get_registry().regions_by_grid(self.active_locations()).items():
+            weather = get_grid_weather(*grid)
+            if 'error' in weather:
+                print(f"{', '.join(locations)} 날씨를 미리 받지 못했습니다: {weather['error']}"); continue
+            for location in locations:
+                self.remember_demand_context(location, weather_data=weather)
+
+    def send_periodic_news(self):
+        """(스레드에서 실행됨) 주기적으로 모든 사용자의 지역 소식을 수집하여 메일로 보냅니다."""
+        print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 자동 뉴스 알림 작업을 실행합니다.")
+
+        # 1. 모든 지역의 뉴스를 미리 한 번만 스크래핑하여 캐시에 저장합니다.
+        #    모든 (지역, 키워드) 조합은 속도 제한 하에서 동시에 수집됩니다.
+        #    전국 지역 중 사용자가 있는 지역만 수집합니다.
+        locations = self.active_locations()
+        print(f"{len(locations)}개 지역의 뉴스를 수집합니다...")
+        news_cache = {location: successful_results(results)
+                      for location, results in search_titles_multi(locations, ["축제", "행사", "사고", "공연"]).items()}
+        for location, news_results in news_cache.items():
+            self.remember_demand_context(location, event_data=news_results)
+        print("모든 지역의 뉴스 수집 완료.")
+
+        try:
+            # 2. 지역별로 메시지 본문을 한 번만 만들고, 같은 지역의 사용자에게 한꺼번에 보냅니다.
+            #    본문은 지역당 한 번만 저장되므로 데이터베이스 증가량은 사용자 수가 아닌 지역 수에 비례합니다.
+            #    지역별 사용자 목록은 메모리의 사용자 디렉터리에서 가져오므로 데이터베이스를 읽지 않습니다.
+            recipients_by_location = {
+                location: [user_id for user_id, _, _, _ in users]
+                for location, users in self.account_manager.users_by_location().items() if location in news_cache
+            }
+
+            with self.account_manager.mailbox.transaction():
+                for location, receiver_ids in recipients_by_location.items():
+                    news_results = news_cache[location]
+                
+                    message_body = f"'{location}' 지역의 최신 소식을 자동으로 알려드립니다.\n\n"
+                    has_news = False
+                
+                    for keyword, titles in news_results.items():
+                        if titles:
+                            has_news = True
+                            message_body += f"📌 {keyword} 관련 소식\n"
+                            for i, title in enumerate(titles[:3], 1):
+                                message_body += f"  - {title}\n"
+                            message_body += "\n"
+                
+                    if has_news:
+                        try:
+                            sent = self.account_manager.mailbox.send_bulk(
+                                sender_name="자동 알림봇", sender_id="system-notifier",
+                                receiver_ids=receiver_ids, message=message_body
+                            )
+                            print(f"'{location}' 지역 사용자 {sent}명에게 지역 소식 메일을 전송했습니다.")
+                        except Exception as e:
+                            print(f"'{location}' 지역에 메일 전송 중 오류 발생: {e}")
+        except Exception as e:
+            print(f"자동 뉴스 알림 작업 중 오류 발생: {e}")
+
+        print("자동 뉴스 알림 작업을 완료했습니다.")
+        for listener in list(self.mail_listeners):
+            listener()
@@ -0,0 +1,286 @@
+import sqlite3
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+
+STORAGE_CONFIG_FILE = "storage_config.json"
+
+# 모든 데이터베이스에 적용되는 기본 내구성/성능 설정
+# - journal_mode: WAL이면 쓰기 중에도 다른 스레드가 읽을 수 있습니다.
+# - synchronous: WAL 모드에서 NORMAL은 커밋마다 fsync하지 않고 체크포인트 시점에만 동기화합니다.
+# - busy_timeout: 다른 연결이 잠금을 잡고 있을 때 기다리는 시간(ms)
+# - cache_size: 음수이면 KiB 단위의 페이지 캐시 크기
+# - mmap_size: 메모리 매핑으로 읽을 최대 바이트 수
+DEFAULT_STORAGE_CONFIG = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -8000,
+    "mmap_size": 64 * 1024 * 1024,
+}
+_VALID_JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+_VALID_SYNCHRONOUS = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+def load_storage_config():
+    """설정 파일의 값을 기본 설정 위에 덮어써서 반환합니다."""
+    config = dict(DEFAULT_STORAGE_CONFIG)
+    if os.path.exists(STORAGE_CONFIG_FILE):
+        with open(STORAGE_CONFIG_FILE, 'r') as f:
+            config.update(json.load(f))
+    return config
+
+def apply_pragmas(conn, config=None):
+    """연결에 저장소 설정(PRAGMA)을 적용합니다."""
+    config = config or load_storage_config()
+    journal_mode = str(config["journal_mode"]).upper()
+    synchronous = str(config["synchronous"]).upper()
+    if journal_mode not in _VALID_JOURNAL_MODES or synchronous not in _VALID_SYNCHRONOUS:
+        raise ValueError(f"잘못된 저장소 설정입니다: journal_mode={journal_mode}, synchronous={synchronous}")
+    conn.execute(f"PRAGMA journal_mode = {journal_mode}")
+    conn.execute(f"PRAGMA synchronous = {synchronous}")
+    conn.execute(f"PRAGMA busy_timeout = {int(config['busy_timeout'])}")
+    conn.execute(f"PRAGMA cache_size = {int(config['cache_size'])}")
+    conn.execute(f"PRAGMA mmap_size = {int(config['mmap_size'])}")
+    return conn
+
+class Connection(sqlite3.Connection):
+    """작업 단위의 중첩 깊이를 함께 보관하는 SQLite 연결입니다."""
+    uow_depth = 0
+    db_name = None
+
+# 지표 레이블에 쓰는 SQL 문 종류 (그 외는 OTHER로 묶어 레이블 수를 제한합니다)
+_STATEMENT_KINDS = {"SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH", "PRAGMA", "CREATE", "ALTER", "DROP", "BEGIN", "VACUUM"}
+DB_SECONDS = metrics.REGISTRY.histogram("db_query_seconds", "SQLite 문 실행/결과 읽기 시간")
+
+def _statement_kind(sql):
+    words = sql.split(None, 1)
+    kind = words[0].upper() if words else ""
+    return kind if kind in _STATEMENT_KINDS else "OTHER"
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """실행 시간을 db_query_seconds{db, op}에 기록하는 커서입니다."""
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            DB_SECONDS.observe(time.perf_counter() - started, db=self.connection.db_name, op=_statement_kind(sql))
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            DB_SECONDS.observe(time.perf_counter() - started, db=self.connection.db_name, op=_statement_kind(sql) + "_MANY")
+
+    def executescript(self, sql_script):
+        started = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            DB_SECONDS.observe(time.perf_counter() - started, db=self.connection.db_name, op="SCRIPT")
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            DB_SECONDS.observe(time.perf_counter() - started, db=self.connection.db_name, op="FETCHALL")
+
+class InstrumentedConnection(Connection):
+    """
+    계측이 켜져 있을 때 사용하는 연결입니다. 모든 문 실행과 커밋 시간을 기록합니다.
+    계측이 꺼져 있으면 connect가 일반 Connection을 사용하므로 추가 비용이 없습니다.
+    """
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        return self.cursor().executescript(sql_script)
+
+    def commit(self):
+        started = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            DB_SECONDS.observe(time.perf_counter() - started, db=self.db_name, op="COMMIT")
+
+def connect(db_path, config=None, **kwargs):
+    """저장소 설정이 적용된 SQLite 연결을 엽니다. (계측이 켜져 있으면 실행 시간을 기록하는 연결을 엽니다)"""
+    config = config or load_storage_config()
+    factory = InstrumentedConnection if metrics.ENABLED else Connection
+    conn = sqlite3.connect(db_path, timeout=int(config["busy_timeout"]) / 1000, factory=factory, **kwargs)
+    conn.db_name = os.path.basename(db_path)
+    return apply_pragmas(conn, config)
+
+# 데이터베이스 파일별로 동시에 열어둘 수 있는 최대 연결 수 (스레드당 하나)
+MAX_CONNECTIONS_PER_DB = 16
+POOL_WAIT_TIMEOUT = 10.0
+
+class ConnectionManager:
+    """
+    데이터베이스 파일별로 스레드마다 하나의 연결을 재사용하도록 관리합니다.
+    - 같은 스레드의 모든 Inventory/Mailbox/AccountManager 인스턴스는 하나의 연결을 공유합니다.
+    - 종료된 스레드의 연결은 회수되며, 파일별 연결 수는 max_per_db를 넘지 않습니다.
+    - 스키마 생성/확인은 프로세스당 한 번만 수행합니다.
+    """
+    def __init__(self, max_per_db=MAX_CONNECTIONS_PER_DB, config=None):
+        self.max_per_db = max_per_db
+        self.config = config
+        self.pools = {}
+        self.initialized = set()
+        self.schema_lock = threading.Lock()
+        self.condition = threading.Condition()
+        self.closed = False
+
+    def _prune(self, pool):
+        """종료된 스레드가 남긴 연결을 닫습니다."""
+        for thread in [t for t in pool if not t.is_alive()]:
+            pool.pop(thread)[0].close()
+
+    def get(self, db_path):
+        """현재 스레드에서 사용할 연결을 반환합니다. 없으면 새로 엽니다."""
+        thread = threading.current_thread()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("데이터베이스 연결 관리자가 이미 종료되었습니다.")
+            pool = self.pools.setdefault(db_path, {})
+            entry = pool.get(thread)
+            if entry:
+                return entry[0]
+            self._prune(pool)
+            if len(pool) >= self.max_per_db:
+                if not self.condition.wait_for(lambda: (self._prune(pool), len(pool) < self.max_per_db)[1], POOL_WAIT_TIMEOUT):
+                    raise RuntimeError(f"'{db_path}' 데이터베이스 연결 수가 한도({self.max_per_db})에 도달했습니다.")
+            # 연결은 소유 스레드만 사용하지만, 회수/종료는 다른 스레드에서 할 수 있도록 합니다.
+            conn = connect(db_path, self.config, check_same_thread=False)
+            pool[thread] = (conn, conn.cursor())
+            return conn
+
+    def cursor(self, db_path):
+        """현재 스레드 연결의 공용 커서를 반환합니다."""
+        self.get(db_path)
+        with self.condition:
+            return self.pools[db_path][threading.current_thread()][1]
+
+    def ensure_schema(self, db_path, create):
+        """create(스키마 생성 함수)를 데이터베이스 파일별로 한 번만 실행합니다."""
+        with self.schema_lock:
+            if db_path not in self.initialized:
+                create()
+                self.initialized.add(db_path)
+
+    def release(self, db_path):
+        """현재 스레드의 연결을 닫고 풀에서 제거합니다."""
+        with self.condition:
+            entry = self.pools.get(db_path, {}).pop(threading.current_thread(), None)
+            if entry:
+                entry[0].close()
+                self.condition.notify_all()
+
+    def release_thread(self):
+        """현재 스레드가 연 모든 데이터베이스 연결을 닫고 풀에서 제거합니다."""
+        thread = threading.current_thread()
+        with self.condition:
+            entries = [pool.pop(thread) for pool in self.pools.values() if thread in pool]
+            for conn, _ in entries:
+                conn.close()
+            if entries:
+                self.condition.notify_all()
+
+    def close_all(self):
+        """모든 연결을 닫습니다. (애플리케이션 종료 시 호출)"""
+        with self.condition:
+            for pool in self.pools.values():
+                for conn, _ in pool.values():
+                    conn.close()
+            self.pools.clear()
+            self.closed = True
+            self.condition.notify_all()
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_connection_manager():
+    """프로세스 전체에서 공유하는 ConnectionManager를 반환합니다."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = ConnectionManager()
+        return _manager
+
+def close_all_connections():
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close_all()
+
+class Transactional:
+    """
+    여러 변경 작업을 하나의 커밋으로 묶는 작업 단위(unit of work)를 제공하는 믹스인입니다.
+    사용하는 클래스는 self.conn을 가져야 하며, 변경 후 conn.commit() 대신 self._commit()을 호출합니다.
+    작업 단위의 깊이는 연결에 기록되므로, 같은 연결을 공유하는 인스턴스끼리도 하나의 커밋으로 묶입니다.
+
+    예:
+        with inventory.transaction():
+            inventory.add_item(...)
+            inventory.update_item(...)
+    """
+    def in_transaction(self):
+        return getattr(self.conn, "uow_depth", 0) > 0
+
+    @contextmanager
+    def transaction(self):
+        """블록 안의 모든 변경을 한 번에 커밋합니다. 예외가 발생하면 모두 되돌립니다. (중첩 가능)"""
+        conn = self.conn
+        conn.uow_depth += 1
+        try:
+            yield self
+        except BaseException:
+            conn.uow_depth -= 1
+            if conn.uow_depth == 0:
+                conn.rollback()
+            raise
+        else:
+            conn.uow_depth -= 1
+            if conn.uow_depth == 0:
+                conn.commit()
+
+    def _commit(self):
+        """작업 단위 밖에서만 즉시 커밋합니다."""
+        if not self.in_transaction():
+            self.conn.commit()
+
+    def _rollback(self):
+        """작업 단위 밖에서만 즉시 되돌립니다. (작업 단위 안에서는 블록 종료 시 처리)"""
+        if not self.in_transaction():
+            self.conn.rollback()
+
+class ManagedDatabase(Transactional):
+    """
+    공용 ConnectionManager에서 현재 스레드의 연결과 커서를 가져오는 데이터 클래스의 기반 클래스입니다.
+    하위 클래스는 self.db_path를 설정해야 합니다.
+    """
+    @property
+    def conn(self):
+        return get_connection_manager().get(self.db_path)
+
+    @property
+    def cursor(self):
+        return get_connection_manager().cursor(self.db_path)
+
+    def _ensure_schema(self, create):
+        get_connection_manager().ensure_schema(self.db_path, create)
+
+    def close(self):
+        """현재 스레드의 연결을 반환합니다. (다른 스레드의 연결과 공유 캐시는 유지됩니다)"""
+        get_connection_manager().release(self.db_path)
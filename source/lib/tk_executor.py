@@ -0,0 +1,114 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+# 백그라운드 작업 스레드 수와 결과 큐를 확인하는 간격(ms)
+TK_EXECUTOR_WORKERS = 4
+TK_POLL_INTERVAL_MS = 50
+
+class Task:
+    """TkExecutor에 제출된 작업 하나입니다. cancel()로 취소하면 결과 콜백이 호출되지 않습니다."""
+    def __init__(self, fn, args, kwargs, on_success, on_error, owner):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_success = on_success
+        self.on_error = on_error
+        self.owner = owner
+        self.future = None
+        self.cancelled = False
+
+    def cancel(self):
+        """아직 시작하지 않은 작업은 실행하지 않고, 실행 중인 작업은 결과를 버립니다."""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+class TkExecutor:
+    """
+    Tk 화면에서 오래 걸리는 작업(네트워크, bcrypt, 대량 DB 작업, 모델 예측)을 실행하는 백그라운드 실행기입니다.
+    - 작업은 크기가 제한된 스레드 풀에서 실행되고, 결과는 큐에 쌓였다가 UI 스레드에서 master.after로 꺼내
+      on_success/on_error 콜백을 호출합니다. 따라서 콜백 안에서는 위젯을 안전하게 다룰 수 있습니다.
+    - owner 위젯(예: 팝업 창)을 지정하면, 그 위젯이 닫힐 때 남은 작업이 취소되고 결과도 버려집니다.
+    - 작업 스레드에서는 위젯을 직접 다루지 말고 call_in_ui로 UI 스레드에 넘겨야 합니다.
+    """
+    def __init__(self, master, max_workers=TK_EXECUTOR_WORKERS, poll_interval=TK_POLL_INTERVAL_MS):
+        self.master = master
+        self.poll_interval = poll_interval
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tk-task")
+        self.results = queue.SimpleQueue()
+        self.owner_tasks = {}
+        self.closed = False
+        self.after_id = self.master.after(self.poll_interval, self._drain)
+
+    def submit(self, fn, *args, on_success=None, on_error=None, owner=None, **kwargs):
+        """fn(*args, **kwargs)를 작업 스레드에서 실행하고 Task를 반환합니다. (UI 스레드에서 호출)"""
+        task = Task(fn, args, kwargs, on_success, on_error, owner)
+        if owner is not None:
+            self._track(owner, task)
+        task.future = self.pool.submit(self._run, task)
+        return task
+
+    def call_in_ui(self, fn, *args):
+        """(어느 스레드에서든 호출 가능) fn(*args)를 UI 스레드에서 실행하도록 예약합니다."""
+        if not self.closed:
+            self.results.put((fn, args))
+
+    def _track(self, owner, task):
+        key = str(owner)
+        if key not in self.owner_tasks:
+            self.owner_tasks[key] = set()
+            # 자식 위젯의 <Destroy> 이벤트도 전달되므로 owner 자신이 파괴될 때만 처리합니다.
+            owner.bind("<Destroy>", lambda event: event.widget is owner and self.cancel_owner(owner), add="+")
+        self.owner_tasks[key].add(task)
+
+    def cancel_owner(self, owner):
+        """owner 위젯에 딸린 모든 작업을 취소합니다."""
+        for task in self.owner_tasks.pop(str(owner), ()):
+            task.cancel()
+
+    def _run(self, task):
+        if task.cancelled:
+            return
+        try:
+            result = task.fn(*task.args, **task.kwargs)
+        except Exception as e:
+            self.results.put((self._deliver, (task, None, e)))
+        else:
+            self.results.put((self._deliver, (task, result, None)))
+
+    def _drain(self):
+        """(UI 스레드) 완료된 작업의 결과를 꺼내 콜백을 호출합니다."""
+        while True:
+            try:
+                callback, args = self.results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"백그라운드 작업 결과 처리 중 오류 발생: {e}")
+        if not self.closed:
+            self.after_id = self.master.after(self.poll_interval, self._drain)
+
+    def _deliver(self, task, result, error):
+        if task.owner is not None:
+            tasks = self.owner_tasks.get(str(task.owner))
+            if tasks is not None:
+                tasks.discard(task)
+            if not task.owner.winfo_exists():
+                task.cancelled = True
+        if task.cancelled:
+            return
+        if error is None:
+            if task.on_success:
+                task.on_success(result)
+        elif task.on_error:
+            task.on_error(error)
+        else:
+            print(f"백그라운드 작업 중 오류 발생: {error}")
+
+    def close(self):
+        """대기 중인 작업을 취소하고 결과 확인을 멈춥니다. (애플리케이션 종료 시 호출)"""
+        self.closed = True
+        self.master.after_cancel(self.after_id)
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta
+
+from cache import TTLCache, SingleFlight
+import http_client
+import metrics
+from regions import get_registry, dfs_grid_conv
+
+KMA_API_KEY = "여기에 api key가 필요" 
+# 기상청 초단기예보 조회 주소 (벤치마크에서는 로컬 스텁 서버 주소로 바꿔서 사용합니다)
+KMA_FORECAST_URL = "http://apis.data.go.kr/1360000/VilageFcstInfoService_2.0/getUltraSrtFcst"
+# (nx, ny, base_date, base_time)별 초단기예보 캐시. 항목은 다음 예보 시각에 만료됩니다.
+WEATHER_CACHE_SIZE = 1024
+weather_cache = TTLCache(ttl=3600, maxsize=WEATHER_CACHE_SIZE)
+_weather_flight = SingleFlight()
+
+def _next_forecast_time(now):
+    """요청에 쓰이는 base_time이 바뀌는(다음 예보가 반영되는) 시각을 반환합니다. (매 정시)"""
+    return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+def _fetch_kma_weather(nx, ny, base_date, base_time):
+    params = {"serviceKey": KMA_API_KEY, "pageNo": "1", "numOfRows": "100", "dataType": "JSON",
+              "base_date": base_date, "base_time": base_time, "nx": str(nx), "ny": str(ny)}
+    try:
+        with metrics.span("weather.fetch"):
+            response = http_client.get_client().get(KMA_FORECAST_URL, params=params, timeout=10); response.raise_for_status()
+        data = response.json()
+        if data['response']['header']['resultCode'] != '00': return {"error": f"API 오류: {data['response']['header']['resultMsg']}"}
+        items = data['response']['body']['items']['item']; weather_info = {}
+        category_map = {'T1H': '온도', 'RN1': '강수량', 'REH': '습도', 'PTY': '강수형태'}
+        pty_map = {'0': '없음', '1': '비', '2': '비/눈', '3': '눈', '5': '빗방울', '6': '빗방울눈날림', '7': '눈날림'}
+        for item in items:
+            cat, value = item['category'], item.get('fcstValue')
+            if cat in category_map and value:
+                weather_info[category_map[cat]] = pty_map.get(value, value) if cat == 'PTY' else value
+        weather_info['is_raining'] = weather_info.get('강수형태', '없음') in ['비', '비/눈', '빗방울', '빗방울눈날림']
+        # 다음 예보 시각까지는 같은 격자/기준시각 요청에 이 결과를 재사용합니다. (오류는 캐시하지 않음)
+        weather_cache.set((nx, ny, base_date, base_time), weather_info, expires_at=_next_forecast_time(datetime.now()).timestamp())
+        return weather_info
+    except Exception as e: return {"error": f"날씨 정보 처리 중 오류: {e}"}
+
+def get_kma_weather(lat, lon):
+    return get_grid_weather(*dfs_grid_conv(lat, lon))
+
+def get_region_weather(location):
+    """지역 이름으로 날씨를 조회합니다. 미리 계산된 격자를 사용하며, 같은 격자의 지역은 하나의 요청 결과를 공유합니다."""
+    grid = get_registry().grid(location)
+    if grid is None: return {"error": f"'{location}'에 대한 좌표 정보가 없습니다."}
+    return get_grid_weather(*grid)
+
+def get_grid_weather(nx, ny):
+    if not KMA_API_KEY or '여기에' in KMA_API_KEY: return {"error": "기상청 API 키를 설정해주세요."}
+    now = datetime.now() - timedelta(hours=1)
+    key = (nx, ny, now.strftime('%Y%m%d'), now.strftime('%H00'))
+    cached = weather_cache.get(key)
+    metrics.inc("weather_cache_total", result="miss" if cached is None else "hit")
+    if cached is None:
+        # 같은 키를 동시에 요청하는 호출자들은 하나의 API 요청 결과를 공유합니다.
+        cached = _weather_flight.do(key, lambda: _fetch_kma_weather(*key))
+    return dict(cached)
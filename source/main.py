@@ -1,7 +1,61 @@
-import tkinter as tk
-from lib.interface import MainApp
+import argparse
+import os
+import sys
+import threading
 
-if __name__ == "__main__":
+# lib 모듈은 서로를 평면(flat) 임포트하므로 lib 디렉터리를 경로에 추가합니다. (inventory_io.py와 같은 방식)
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib")
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+from service import AppService
+from api_server import ApiServer, API_HOST, API_PORT
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="재고 관리 프로그램")
+    parser.add_argument("--headless", action="store_true", help="화면 없이 예약 작업과 JSON API 서버만 실행합니다.")
+    parser.add_argument("--api", action="store_true", help="화면과 함께 JSON API 서버도 실행합니다.")
+    parser.add_argument("--host", default=API_HOST, help=f"API 서버 주소 (기본값: {API_HOST})")
+    parser.add_argument("--metrics", action="store_true", help="성능 지표를 수집합니다. (metrics_config.json의 enabled와 같음)")
+    parser.add_argument("--port", type=int, default=API_PORT, help=f"API 서버 포트 (기본값: {API_PORT})")
+    return parser.parse_args()
+
+def run_headless(service, host, port):
+    server = ApiServer(service, host, port)
+    service.start()
+    print(f"JSON API 서버를 http://{host}:{port} 에서 실행합니다. (종료: Ctrl+C)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("API 서버를 종료합니다.")
+    finally:
+        server.server_close()
+        service.close()
+
+def run_gui(service, api, host, port):
+    import tkinter as tk
+    from interface import MainApp
+
+    server = None
+    if api:
+        server = ApiServer(service, host, port)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"JSON API 서버를 http://{host}:{port} 에서 실행합니다.")
     root = tk.Tk()
-    app = MainApp(root)
-    root.mainloop()
+    MainApp(root, service)
+    service.start()
+    try:
+        root.mainloop()
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+        service.close()
+
+if __name__ == "__main__":
+    args = parse_args()
+    service = AppService(enable_metrics=args.metrics)
+    if args.headless:
+        run_headless(service, args.host, args.port)
+    else:
+        run_gui(service, args.api, args.host, args.port)
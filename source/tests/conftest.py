@@ -0,0 +1,33 @@
+import os
+import sys
+
+import pytest
+
+# lib 모듈은 서로를 평면(flat) 임포트하므로 lib 디렉터리를 경로에 추가합니다. (benchmarks/harness.py와 같은 방식)
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "lib")
+if LIB_DIR not in sys.path:
+    sys.path.insert(0, LIB_DIR)
+
+import storage
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """
+    lib 모듈은 현재 폴더에 데이터베이스/설정/모델 파일을 만들므로, 테스트마다 빈 임시 폴더에서 실행합니다.
+    공용 연결 관리자도 테스트마다 새로 만들고 끝나면 모든 연결을 닫습니다.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(storage, "_manager", None)
+    yield tmp_path
+    storage.close_all_connections()
+
+@pytest.fixture(scope="session")
+def trained_model(tmp_path_factory):
+    """작은 가상 데이터로 한 번만 훈련한 (분류기, 회귀 모델, 컬럼) 튜플입니다."""
+    from Analyze import train_model
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("model"))
+    try:
+        return train_model(num_samples=600, seed=7)
+    finally:
+        os.chdir(cwd)
@@ -0,0 +1,90 @@
+import json
+import threading
+
+import pytest
+
+import account_management
+from account_management import AccountManager, hash_rounds, load_bcrypt_rounds
+
+def _stored_hash(manager, username):
+    manager.cursor.execute("SELECT password FROM users WHERE username = ?", (username,))
+    return manager.cursor.fetchone()[0]
+
+def test_bcrypt_rounds_come_from_the_config_file():
+    assert load_bcrypt_rounds() == account_management.DEFAULT_BCRYPT_ROUNDS
+    with open(account_management.AUTH_CONFIG_FILE, "w") as f:
+        json.dump({"bcrypt_rounds": 5}, f)
+    assert load_bcrypt_rounds() == 5
+    with open(account_management.AUTH_CONFIG_FILE, "w") as f:
+        json.dump({"bcrypt_rounds": 2}, f)
+    with pytest.raises(ValueError):
+        load_bcrypt_rounds()
+
+def test_hash_rounds():
+    assert hash_rounds("$2b$12$abcdefghijklmnopqrstuv") == 12
+    assert hash_rounds("plain") is None
+
+def test_login_rehashes_with_the_configured_cost(capsys):
+    AccountManager(bcrypt_rounds=4).create_user("kim", "김", "pw", "서울")
+    manager = AccountManager(bcrypt_rounds=5)
+    assert hash_rounds(_stored_hash(manager, "kim")) == 4
+    user = manager.login("kim", "pw")
+    assert user.get_username() == "kim" and hash_rounds(user.password_hash) == 5
+    assert hash_rounds(_stored_hash(manager, "kim")) == 5
+    assert "작업 비용 5" in capsys.readouterr().out
+    # 이미 설정된 비용이면 다시 해싱하지 않습니다.
+    manager.login("kim", "pw")
+    assert "작업 비용" not in capsys.readouterr().out
+
+def test_wrong_password_does_not_rehash():
+    AccountManager(bcrypt_rounds=4).create_user("kim", "김", "pw", "서울")
+    manager = AccountManager(bcrypt_rounds=5)
+    assert manager.login("kim", "wrong") is None
+    assert manager.login("nobody", "pw") is None
+    assert hash_rounds(_stored_hash(manager, "kim")) == 4
+
+def test_directory_is_loaded_once_and_written_through():
+    manager = AccountManager(bcrypt_rounds=4)
+    manager.create_user("kim", "김", "pw", "서울")
+    directory = manager.get_directory()
+    assert directory.loaded
+    manager.create_user("lee", "이", "pw", "대구")
+    manager.create_user("park", "박", "pw", "대구")
+    # 디렉터리를 불러온 뒤에는 데이터베이스를 읽지 않습니다.
+    manager.cursor.execute("DELETE FROM users WHERE username = 'park'"); manager.conn.commit()
+    assert sorted(row[2] for row in manager.get_all_users()) == ["kim", "lee", "park"]
+    assert manager.delete_user("lee")
+    assert directory.get_by_username("lee") is None
+    assert {location: [row[2] for row in rows] for location, rows in manager.users_by_location().items()} == \
+        {"서울": ["kim"], "대구": ["park"]}
+    directory.invalidate()
+    assert [row[2] for row in manager.get_all_users()] == ["kim"]
+
+def test_users_created_while_loading_are_not_lost():
+    manager = AccountManager(bcrypt_rounds=4)
+    manager.create_user("kim", "김", "pw", "서울")
+    committed = threading.Event()
+    def commit_and_signal(original=manager._commit):
+        original(); committed.set()
+    def fetch_rows():
+        rows = manager.cursor.execute("SELECT id, name, username, location FROM users").fetchall()
+        # 목록을 읽은 직후 다른 스레드에서 계정이 생성(커밋)됩니다.
+        manager._commit = commit_and_signal
+        worker.start()
+        assert committed.wait(5)
+        return rows
+    worker = threading.Thread(target=manager.create_user, args=("lee", "이", "pw", "대구"))
+    manager.directory.load(fetch_rows)
+    worker.join(5)
+    assert manager.directory.get_by_username("lee") is not None
+
+def test_admin_and_the_current_user_are_excluded():
+    manager = AccountManager(bcrypt_rounds=4)
+    manager.create_user("kim", "김", "pw", "서울")
+    manager.create_user("lee", "이", "pw", "서울")
+    kim_id = manager.get_directory().get_by_username("kim")[0]
+    assert list(manager.get_user_choices()) == ["김 (kim)", "이 (lee)"]
+    assert list(manager.get_user_choices(exclude_user_id=kim_id)) == ["이 (lee)"]
+    assert [row[2] for row in manager.users_by_location(exclude_user_id=kim_id)["서울"]] == ["lee"]
+    with pytest.raises(ValueError):
+        manager.delete_user("admin")
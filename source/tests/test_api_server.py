@@ -0,0 +1,145 @@
+import http.client
+import json
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+import storage
+from account_management import AccountManager
+from api_server import ApiServer
+from scheduler import Scheduler
+from service import AppService
+
+class Client:
+    """keep-alive 연결 하나로 JSON 요청을 보내는 테스트 클라이언트입니다."""
+    def __init__(self, port, token=None):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        self.token = token
+
+    def request(self, method, path, body=None):
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        self.conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = self.conn.getresponse()
+        return response.status, json.loads(response.read())
+
+    def login(self, username, password):
+        status, data = self.request("POST", "/api/login", {"username": username, "password": password})
+        assert status == 200
+        self.token = data["token"]
+        return data["user"]
+
+    def close(self):
+        self.conn.close()
+
+@pytest.fixture
+def service():
+    # 모델을 불러오지 않는 최소한의 AppService (API가 사용하는 속성만 채웁니다)
+    service = AppService.__new__(AppService)
+    service.account_manager = AccountManager(bcrypt_rounds=4)
+    service.account_manager.create_user("kim", "김", "pw", "서울")
+    service.account_manager.create_user("lee", "이", "pw", "대구")
+    service.demand_contexts, service.mail_listeners = {}, []
+    service.model_future = Future()
+    service.scheduler = Scheduler()
+    yield service
+    service.scheduler.stop()
+
+@pytest.fixture
+def server(service):
+    server = ApiServer(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client(server):
+    clients = []
+    def connect(username=None):
+        client = Client(server.server_address[1])
+        if username:
+            client.login(username, "admin" if username == "admin" else "pw")
+        clients.append(client)
+        return client
+    yield connect
+    for client in clients:
+        client.close()
+
+def test_login_is_required(client):
+    anonymous = client()
+    assert anonymous.request("GET", "/api/me")[0] == 401
+    assert anonymous.request("POST", "/api/login", {"username": "kim", "password": "wrong"})[0] == 401
+    assert anonymous.request("GET", "/api/health") == (200, {"model_ready": False, "jobs": {}})
+    assert anonymous.request("GET", "/api/nothing")[0] == 404
+    kim = client("kim")
+    assert kim.request("GET", "/api/me")[1]["username"] == "kim"
+    assert kim.request("POST", "/api/logout")[0] == 200
+    assert kim.request("GET", "/api/me")[0] == 401
+
+def test_inventory_crud_and_paging(client):
+    kim = client("kim")
+    for i in range(5):
+        assert kim.request("POST", "/api/inventory", {"name": f"item-{i}", "quantity": i, "price": 1000, "cost": 500})[0] == 201
+    assert kim.request("POST", "/api/inventory", {"name": "item-0", "quantity": 1, "price": 1, "cost": 1})[0] == 400
+    status, page = kim.request("GET", "/api/inventory?limit=3")
+    assert status == 200 and len(page["items"]) == 3 and page["next"]
+    rest = kim.request("GET", f"/api/inventory?limit=3&after={page['next']}")[1]
+    assert len(rest["items"]) == 2 and rest["next"] is None
+
+    item_id = page["items"][0]["item_id"]
+    assert kim.request("PUT", f"/api/inventory/{item_id}", {"quantity": 50})[0] == 200
+    assert kim.request("PUT", "/api/inventory/00ff", {"quantity": 1})[0] == 404
+    assert kim.request("PUT", f"/api/inventory/{item_id}", {"quantity": "많이"})[0] == 400
+    assert kim.request("DELETE", f"/api/inventory/{item_id}")[0] == 200
+    assert len(kim.request("GET", "/api/inventory")[1]["items"]) == 4
+
+def test_other_inventories_are_admin_only(client):
+    client("kim").request("POST", "/api/inventory", {"name": "콜라", "quantity": 1, "price": 1, "cost": 1})
+    assert client("lee").request("GET", "/api/inventory?user=kim")[0] == 403
+    assert [item["name"] for item in client("admin").request("GET", "/api/inventory?user=kim")[1]["items"]] == ["콜라"]
+
+def test_mail(client):
+    kim, lee = client("kim"), client("lee")
+    assert kim.request("POST", "/api/mail", {"to": "lee", "message": "안녕하세요"})[0] == 201
+    assert kim.request("POST", "/api/mail", {"to": "nobody", "message": "안녕하세요"})[0] == 404
+    listing = lee.request("GET", "/api/mail")[1]
+    assert (listing["total"], listing["unread"]) == (1, 1) and "message" not in listing["mails"][0]
+    mail_id = listing["mails"][0]["id"]
+    assert lee.request("GET", f"/api/mail/{mail_id}")[1]["message"] == "안녕하세요"
+    assert lee.request("GET", "/api/mail")[1]["unread"] == 0
+    assert kim.request("GET", f"/api/mail/{mail_id}")[0] == 404
+
+def test_jobs_can_be_run_by_admins(service, client):
+    started, release = threading.Event(), threading.Event()
+    service.scheduler.add_job("news", lambda: (started.set(), release.wait(5)), interval=3600)
+    admin = client("admin")
+    assert admin.request("POST", "/api/jobs/news/run")[0] == 409
+    service.scheduler.start()
+    assert client("kim").request("POST", "/api/jobs/news/run")[0] == 403
+    assert admin.request("POST", "/api/jobs/unknown/run")[0] == 404
+    assert admin.request("POST", "/api/jobs/news/run") == (202, {"started": True})
+    assert started.wait(5)
+    assert admin.request("POST", "/api/jobs/news/run")[0] == 409
+    release.set()
+
+def test_idle_keep_alive_connections_do_not_block_other_clients(client):
+    # 요청을 한 번 보낸 뒤 열어 둔 keep-alive 연결이 많아도 새 클라이언트는 바로 응답을 받습니다.
+    idle = [client() for _ in range(20)]
+    for connection in idle:
+        assert connection.request("GET", "/api/health")[0] == 200
+    assert client("kim").request("GET", "/api/me")[0] == 200
+    # 열어 둔 연결도 계속 사용할 수 있습니다.
+    assert idle[0].request("GET", "/api/health")[0] == 200
+
+def test_keep_alive_clients_do_not_hold_database_connections(monkeypatch, client):
+    # 연결 한도보다 많은 로그인 사용자가 keep-alive 연결을 열어 두고 DB를 쓰는 API를 호출해도 모두 응답을 받습니다.
+    monkeypatch.setattr(storage, "POOL_WAIT_TIMEOUT", 0.5)
+    users = [client("kim") for _ in range(storage.MAX_CONNECTIONS_PER_DB + 4)]
+    for _ in range(2):
+        for user in users:
+            assert user.request("GET", "/api/inventory")[0] == 200
+    assert client().request("POST", "/api/login", {"username": "lee", "password": "pw"})[0] == 200
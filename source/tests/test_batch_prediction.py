@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+
+from Analyze import (CATEGORIES, build_feature_matrix, predict_demand_batch, predict_demand, format_prediction)
+
+WEATHER = {"온도": "31", "is_raining": True}
+EVENTS = {"축제": ["불꽃 축제"], "공연": []}
+
+def _reference_features(category, weather_data, event_data, model_columns):
+    """항목마다 pd.get_dummies로 인코딩하던 이전 방식의 특성 행입니다."""
+    temp = float(weather_data.get('온도', 0))
+    row = pd.DataFrame([{"temperature": temp, "is_raining": 1 if weather_data.get('is_raining') else 0,
+                         "is_hot_wave": 1 if temp >= 30 else 0, "has_festival": 1 if event_data.get('축제') else 0,
+                         "has_concert": 1 if event_data.get('공연') else 0, "category": category}])
+    return pd.get_dummies(row, columns=['category']).reindex(columns=model_columns, fill_value=0).astype(float)
+
+def test_feature_matrix_matches_get_dummies(trained_model):
+    _, _, columns = trained_model
+    matrix = build_feature_matrix(CATEGORIES, WEATHER, EVENTS, columns)
+    assert list(matrix.columns) == columns
+    for i, category in enumerate(CATEGORIES):
+        expected = _reference_features(category, WEATHER, EVENTS, columns)
+        np.testing.assert_array_equal(matrix.iloc[[i]].to_numpy(), expected.to_numpy())
+
+def test_unknown_category_has_no_category_column(trained_model):
+    _, _, columns = trained_model
+    row = build_feature_matrix(["없는 카테고리"], WEATHER, EVENTS, columns).iloc[0]
+    assert all(row[column] == 0 for column in columns if column.startswith("category_"))
+
+def test_batch_matches_single_predictions(trained_model):
+    classifier, regressor, columns = trained_model
+    categories = CATEGORIES + CATEGORIES[:2]
+    results = predict_demand_batch(categories, WEATHER, EVENTS, classifier, regressor, columns)
+    assert len(results) == len(categories)
+    for category, result in zip(categories, results):
+        assert set(result) == {"class", "probability", "quantity"}
+        assert predict_demand(category, WEATHER, EVENTS, classifier, regressor, columns) == format_prediction(result)
+        features = _reference_features(category, WEATHER, EVENTS, columns)
+        assert result["class"] == classifier.predict(features)[0]
+        assert result["quantity"] == regressor.predict(features)[0]
+
+def test_empty_batch(trained_model):
+    assert predict_demand_batch([], WEATHER, EVENTS, *trained_model) == []
+
+def test_format_prediction():
+    text = format_prediction({"class": "수요 증가", "probability": 0.74, "quantity": 12.4})
+    assert text == "70% 확률로 수요 증가 (+12개 예상)"
@@ -0,0 +1,85 @@
+import os
+import sys
+import types
+
+import pytest
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "benchmarks")
+if BENCHMARK_DIR not in sys.path:
+    sys.path.insert(0, BENCHMARK_DIR)
+
+import compare
+import datagen
+import harness
+import Localinfo
+import suites
+import weather
+from harness import BenchmarkResult, load_results, measure, percentile, save_results
+
+def test_percentile_interpolates():
+    values = [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert percentile(values, 0) == 1.0 and percentile(values, 100) == 5.0
+    assert percentile(values, 50) == 3.0
+    assert percentile(values, 95) == pytest.approx(4.8)
+    assert percentile([], 50) == 0.0 and percentile([7.0], 99) == 7.0
+
+def test_result_summary():
+    result = BenchmarkResult("inventory.update_item", {"rows": 1000, "mode": "a"}, [0.003, 0.001, 0.002], ops_per_call=2)
+    assert result.key == "inventory.update_item[mode=a,rows=1000]"
+    data = result.to_dict()
+    assert data["p50_ms"] == pytest.approx(2.0) and data["max_ms"] == pytest.approx(3.0)
+    assert data["ops_per_sec"] == pytest.approx(6 / 0.006)
+
+def test_measure_runs_setup_outside_the_timing(capsys):
+    values = iter(range(100))
+    seen = []
+    result = measure("sample", seen.append, repeat=5, warmup=2, setup=lambda: next(values))
+    assert seen == list(range(7)) and len(result.latencies) == 5
+    assert "sample" in capsys.readouterr().out
+
+def _save(path, p50s, seed=1):
+    results = [BenchmarkResult(name, {}, [p50 / 1000]) for name, p50 in p50s.items()]
+    save_results(results, {"seed": seed, "scale": "quick"}, path)
+
+def test_results_round_trip():
+    _save("base.json", {"a": 1.0, "b": 2.0})
+    info, results = load_results("base.json")
+    assert info["options"] == {"seed": 1, "scale": "quick"} and info["commit"]
+    assert results["b"]["p50_ms"] == pytest.approx(2.0)
+
+@pytest.mark.parametrize("candidate, code", [({"a": 1.05, "b": 1.0}, 0), ({"a": 1.5, "b": 2.0}, 1)])
+def test_compare_exits_non_zero_on_regressions(monkeypatch, capsys, candidate, code):
+    _save("base.json", {"a": 1.0, "b": 2.0})
+    _save("cand.json", dict(candidate, c=1.0))
+    monkeypatch.setattr(sys, "argv", ["compare.py", "base.json", "cand.json"])
+    with pytest.raises(SystemExit) as exit_info:
+        compare.main()
+    assert exit_info.value.code == code
+    output = capsys.readouterr().out
+    assert ("느려짐" in output) == bool(code) and "한쪽 결과에만 있음" in output
+
+def test_generated_data_is_reproducible():
+    first = list(datagen.item_rows(datagen.make_rng(42, "inventory"), 50))
+    assert first == list(datagen.item_rows(datagen.make_rng(42, "inventory"), 50))
+    assert first != list(datagen.item_rows(datagen.make_rng(43, "inventory"), 50))
+    mails = list(datagen.mail_rows(datagen.make_rng(42, "mailbox"), 200, user_count=20))
+    assert [row[5] for row in mails] == sorted(row[5] for row in mails)
+    assert mails == list(datagen.mail_rows(datagen.make_rng(42, "mailbox"), 200, user_count=20))
+
+def test_stub_server_serves_fixtures():
+    import requests
+    with harness.StubServer({"/search.naver": ("naver_view.html", "text/html; charset=utf-8")}) as stub:
+        assert "title_link" in requests.get(stub.base_url + "/search.naver?query=x", timeout=5).text
+        assert requests.get(stub.base_url + "/missing", timeout=5).status_code == 404
+        assert stub.hits == 1
+
+def test_scraping_suite_uses_the_stub_server(monkeypatch):
+    # 스위트가 바꾸는 모듈 설정은 테스트가 끝나면 되돌립니다.
+    for module, names in ((Localinfo, ("NEWS_SEARCH_URL", "HOST_RATE_LIMIT", "HOST_BURST", "_news_cache")),
+                          (weather, ("KMA_FORECAST_URL", "KMA_API_KEY"))):
+        for name in names:
+            monkeypatch.setattr(module, name, getattr(module, name))
+    monkeypatch.setattr(weather, "weather_cache", weather.TTLCache(ttl=3600))
+    results = suites.scraping_suite(types.SimpleNamespace(repeat=2, stub_latency=0.0, seed=1))
+    assert [result.name for result in results][:2] == ["localinfo.search_titles"] * 2
+    assert all(len(result.latencies) == 2 for result in results)
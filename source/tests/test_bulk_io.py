@@ -0,0 +1,43 @@
+import pytest
+
+from bulk_io import detect_format, export_items, import_items, read_items
+from inventory import Inventory, Item
+
+ROWS = [("콜라", 10, 1500, 900, "음료"), ("연필", 30, 500, 200, "문구"), ("빵", 5, 2000, 1200, "")]
+
+def test_bulk_upsert_inserts_and_updates_in_batches():
+    inventory = Inventory()
+    inventory.add_item("kim", Item("콜라", 1, 1000, 800, "음료"))
+    assert inventory.bulk_upsert("kim", iter(ROWS), batch_size=2) == 3
+    items = {item.name: item for item in inventory.list_items("kim")}
+    assert (items["콜라"].quantity, items["콜라"].price) == (10, 1500)
+    assert items["빵"].category == "기타"
+    assert items["연필"].item_id == Item("연필", 0, 0, 0).item_id
+
+def test_bulk_upsert_rolls_back_on_error():
+    inventory = Inventory()
+    with pytest.raises(ValueError):
+        inventory.bulk_upsert("kim", ROWS + [("", 1, 1, 1, "음료")], batch_size=2)
+    assert inventory.list_items("kim") == []
+
+@pytest.mark.parametrize("fmt", ["csv", "jsonl"])
+def test_export_then_import_round_trip(fmt):
+    source = Inventory("source.db")
+    source.bulk_upsert("kim", ROWS)
+    assert export_items(source, "kim", f"items.{fmt}").rows == 3
+    target = Inventory("target.db")
+    assert import_items(target, "lee", f"items.{fmt}").rows == 3
+    assert [item.to_tuple() for item in target.list_items("lee")] == [item.to_tuple() for item in source.list_items("kim")]
+
+def test_invalid_rows_report_the_line_number():
+    with open("items.csv", "w", encoding="utf-8") as f:
+        f.write("name,quantity,price,cost,category\n콜라,10,1500,900,음료\n연필,많이,500,200,문구\n")
+    with pytest.raises(ValueError, match="3번째 행"):
+        list(read_items("items.csv"))
+
+def test_format_detection():
+    assert detect_format("items.CSV") == "csv"
+    assert detect_format("items.ndjson") == "jsonl"
+    assert detect_format("items.txt", "csv") == "csv"
+    with pytest.raises(ValueError):
+        detect_format("items.xlsx")
@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+import storage
+from inventory import Inventory, Item
+from storage import ConnectionManager
+
+def _in_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start(); thread.join(5)
+    return result[0]
+
+def test_one_connection_per_thread():
+    manager = ConnectionManager()
+    conn = manager.get("test.db")
+    assert manager.get("test.db") is conn
+    assert manager.cursor("test.db") is manager.cursor("test.db")
+    assert _in_thread(lambda: manager.get("test.db")) is not conn
+    manager.close_all()
+
+def test_instances_share_the_thread_connection():
+    first, second = Inventory(), Inventory()
+    assert first.conn is second.conn
+    first.add_item("kim", Item("콜라", 1, 1000, 500))
+    # 작업 스레드에서는 그 스레드의 연결로 같은 데이터를 읽습니다.
+    assert _in_thread(lambda: (first.conn is second.conn, len(first.list_items("kim")))) == (True, 1)
+    assert _in_thread(lambda: first.conn) is not first.conn
+
+def test_connections_of_finished_threads_are_reclaimed():
+    manager = ConnectionManager(max_per_db=2)
+    for _ in range(5):
+        _in_thread(lambda: manager.get("test.db"))
+    manager.get("test.db")
+    assert len(manager.pools["test.db"]) <= 2
+    manager.close_all()
+
+def test_limit_is_enforced(monkeypatch):
+    monkeypatch.setattr(storage, "POOL_WAIT_TIMEOUT", 0.1)
+    manager = ConnectionManager(max_per_db=1)
+    manager.get("test.db")
+    errors = []
+    def use():
+        try: manager.get("test.db")
+        except RuntimeError as e: errors.append(e)
+    _in_thread(use)
+    assert len(errors) == 1
+    manager.close_all()
+
+def test_release_and_close_all():
+    manager = ConnectionManager()
+    conn = manager.get("test.db")
+    manager.release("test.db")
+    assert manager.get("test.db") is not conn
+    manager.close_all()
+    with pytest.raises(RuntimeError):
+        manager.get("test.db")
+
+def test_schema_is_created_once():
+    manager = ConnectionManager()
+    calls = []
+    manager.ensure_schema("test.db", lambda: calls.append(1))
+    manager.ensure_schema("test.db", lambda: calls.append(1))
+    assert calls == [1]
+
+def test_release_thread_frees_every_database():
+    manager = ConnectionManager(max_per_db=1)
+    released, done = threading.Event(), threading.Event()
+    def worker():
+        manager.get("a.db"); manager.get("b.db")
+        manager.release_thread()
+        released.set(); done.wait(5)
+    thread = threading.Thread(target=worker)
+    thread.start()
+    assert released.wait(5)
+    # 연결을 돌려준 스레드가 아직 살아 있어도 다른 스레드가 바로 연결을 얻을 수 있습니다.
+    assert manager.pools == {"a.db": {}, "b.db": {}}
+    manager.get("a.db"); manager.get("b.db")
+    done.set(); thread.join(5)
+    manager.close_all()
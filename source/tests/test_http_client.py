@@ -0,0 +1,84 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from http_client import HttpClient
+
+class Handler(BaseHTTPRequestHandler):
+    """server.statuses에서 상태 코드를 하나씩 꺼내 응답하고, 새 연결 수를 셉니다."""
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        body = b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    server.statuses, server.connections = [], 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/"
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def client():
+    client = HttpClient(max_retries=3, backoff_base=0.001, backoff_max=0.01, timeout=2)
+    yield client
+    client.close()
+
+def test_connections_are_reused(server, client):
+    for _ in range(5):
+        assert client.get(server.url).status_code == 200
+    assert server.connections == 1
+    assert client.stats()[f"127.0.0.1:{server.server_address[1]}"]["requests"] == 5
+
+def test_server_errors_are_retried(server, client):
+    server.statuses = [503, 502]
+    assert client.get(server.url).status_code == 200
+    stats = next(iter(client.stats().values()))
+    assert stats["retries"] == 2 and stats["failures"] == 0
+
+def test_last_response_is_returned_when_retries_run_out(server, client):
+    server.statuses = [503] * 10
+    assert client.get(server.url).status_code == 503
+    stats = next(iter(client.stats().values()))
+    assert stats["retries"] == 3 and stats["failures"] == 1
+
+def test_client_errors_are_not_retried(server, client):
+    server.statuses = [404]
+    assert client.get(server.url).status_code == 404
+    assert next(iter(client.stats().values()))["retries"] == 0
+
+def test_connection_errors_are_raised_after_retries(client):
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get("http://127.0.0.1:9/")
+    assert next(iter(client.stats().values()))["retries"] == 3
+
+def test_deadline_stops_retrying(server):
+    client = HttpClient(max_retries=10, backoff_base=1.0, backoff_max=1.0)
+    server.statuses = [503] * 10
+    started = time.monotonic()
+    assert client.get(server.url, deadline=time.monotonic() + 0.3).status_code == 503
+    assert time.monotonic() - started < 1.0
+    client.close()
+
+def test_backoff_is_bounded(client):
+    assert all(0 <= client._backoff(attempt) <= client.backoff_max for attempt in range(20))
@@ -0,0 +1,41 @@
+from inventory import Inventory, Item
+
+def _fill(inventory, owner_id, count):
+    inventory.bulk_upsert(owner_id, ((f"{owner_id}-item-{i}", i, 1000, 500, "음료") for i in range(count)))
+
+def test_pages_follow_item_id_order():
+    inventory = Inventory()
+    _fill(inventory, "kim", 25)
+    first = inventory.list_items_page("kim", limit=10)
+    second = inventory.list_items_page("kim", first[-1].item_id, limit=10)
+    assert len(first) == len(second) == 10
+    ids = [item.item_id for item in first + second]
+    assert ids == sorted(ids) and len(set(ids)) == 20
+    assert len(inventory.list_items_page("kim", second[-1].item_id, limit=10)) == 5
+
+def test_pages_do_not_mix_owners():
+    inventory = Inventory()
+    _fill(inventory, "kim", 7)
+    _fill(inventory, "lee", 4)
+    assert {item.name.split("-")[0] for item in inventory.list_items("kim")} == {"kim"}
+    assert len(inventory.list_items("lee")) == 4
+    assert inventory.list_items("park") == []
+
+def test_iter_items_walks_every_page():
+    inventory = Inventory()
+    _fill(inventory, "kim", 23)
+    for page_size in (1, 5, 23, 100):
+        items = list(inventory.iter_items("kim", page_size=page_size))
+        assert sorted(item.name for item in items) == sorted(f"kim-item-{i}" for i in range(23))
+
+def test_exact_multiple_of_page_size():
+    inventory = Inventory()
+    _fill(inventory, "kim", 10)
+    assert len(list(inventory.iter_items("kim", page_size=5))) == 10
+
+def test_get_item():
+    inventory = Inventory()
+    item = Item("콜라", 3, 1500, 900, "음료")
+    inventory.add_item("kim", item)
+    assert inventory.get_item("kim", item.item_id).to_tuple() == item.to_tuple()
+    assert inventory.get_item("lee", item.item_id) is None
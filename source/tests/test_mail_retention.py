@@ -0,0 +1,60 @@
+import gzip
+import json
+import time
+
+import pytest
+
+import mail_retention
+from mail_box import Mailbox
+from mail_retention import load_retention_policy, run_mail_retention
+
+DAY = 86400
+
+def _age(mailbox, receiver_id, days):
+    """수신자의 메일을 days일 전에 받은 것으로 바꿉니다."""
+    mailbox.conn.execute("UPDATE mails SET created_at = ? WHERE receiver_id = ?", (int(time.time() - days * DAY), receiver_id))
+    mailbox.conn.commit()
+
+@pytest.fixture
+def mailbox():
+    mailbox = Mailbox()
+    mailbox.send_bulk("알림봇", "system-notifier", ["old", "new"], "지역 소식")
+    mailbox.send_mail("lee", "2", "old", "개인 메일")
+    _age(mailbox, "old", 10)
+    return mailbox
+
+def test_expired_mails_are_archived_and_deleted(mailbox):
+    result = run_mail_retention(mailbox, batch_size=1)
+    assert result.archived == 1
+    assert [mail.message for mail in mailbox.get_mails_for_user("old")] == ["개인 메일"]
+    assert len(mailbox.get_mails_for_user("new")) == 1
+    with gzip.open(result.archive_path, "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [(record["receiver_id"], record["message"]) for record in records] == [("old", "지역 소식")]
+    assert mailbox.get_mail_counts("old") == (1, 1)
+
+def test_unreferenced_bodies_are_removed(mailbox):
+    _age(mailbox, "new", 10)
+    result = run_mail_retention(mailbox)
+    assert result.archived == 2
+    assert mailbox.conn.execute("SELECT COUNT(*) FROM mail_bodies").fetchone()[0] == 0
+    assert mailbox.conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+def test_shortest_matching_policy_wins(mailbox):
+    policy = {"senders": {"system-notifier": 30}, "users": {"old": 5}, "default_days": None}
+    assert run_mail_retention(mailbox, policy).archived == 2
+    assert run_mail_retention(mailbox, {"senders": {}, "users": {}, "default_days": 1}).archived == 0
+
+def test_nothing_to_archive_creates_no_file(mailbox):
+    result = run_mail_retention(mailbox, {"senders": {}, "users": {}, "default_days": None})
+    assert result.archived == 0 and result.archive_path is None
+
+def test_policy_file_overrides_defaults():
+    with open(mail_retention.RETENTION_CONFIG_FILE, "w") as f:
+        json.dump({"default_days": 90}, f)
+    policy = load_retention_policy()
+    assert policy["default_days"] == 90 and policy["senders"] == {"system-notifier": 7}
+    with open(mail_retention.RETENTION_CONFIG_FILE, "w") as f:
+        json.dump({"users": {"kim": -1}}, f)
+    with pytest.raises(ValueError):
+        load_retention_policy()
@@ -0,0 +1,74 @@
+import sqlite3
+
+import pytest
+
+from mail_box import Mailbox, MAILBOX_MIGRATIONS
+
+def _legacy_database(path="mailbox.db"):
+    """마이그레이션 이전(user_version 0)의 메일함 데이터베이스를 만듭니다."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE mails (id INTEGER PRIMARY KEY AUTOINCREMENT, sender_name TEXT NOT NULL, sender_id TEXT NOT NULL, "
+                 "receiver_id TEXT NOT NULL, message TEXT NOT NULL, timestamp TEXT NOT NULL)")
+    conn.executemany("INSERT INTO mails (sender_name, sender_id, receiver_id, message, timestamp) VALUES (?, ?, ?, ?, ?)",
+                     [("lee", "2", "1", "오래된 메일", "2024-01-01 09:00:00"), ("lee", "2", "1", "새 메일", "2024-01-02 09:00:00"),
+                      ("kim", "1", "2", "답장", "2024-01-03 09:00:00")])
+    conn.commit(); conn.close()
+
+def test_legacy_database_is_migrated():
+    _legacy_database()
+    mailbox = Mailbox()
+    assert mailbox.conn.execute("PRAGMA user_version").fetchone()[0] == len(MAILBOX_MIGRATIONS)
+    mails = mailbox.get_mails_for_user("1")
+    assert [mail.message for mail in mails] == ["새 메일", "오래된 메일"]
+    assert mails[0].created_at - mails[1].created_at == 86400
+    assert mailbox.get_mail_counts("1") == (2, 2) and mailbox.get_mail_counts("2") == (1, 1)
+
+def test_migrations_are_applied_once(capsys):
+    Mailbox()
+    assert "버전 1" in capsys.readouterr().out
+    Mailbox()._migrate()
+    assert capsys.readouterr().out == ""
+
+def test_pages_are_newest_first_without_gaps():
+    mailbox = Mailbox()
+    for i in range(7):
+        mailbox.send_mail("lee", "2", "1", f"메일 {i}")
+    mailbox.send_mail("lee", "2", "3", "다른 사람")
+    seen, before = [], None
+    while True:
+        page = mailbox.get_mails_for_user("1", before=before, limit=3, include_body=False)
+        seen += page
+        if len(page) < 3: break
+        before = page[-1].page_key
+    assert [mail.mail_id for mail in seen] == sorted((mail.mail_id for mail in seen), reverse=True)
+    assert len(seen) == 7 and all(mail.message is None for mail in seen)
+    assert mailbox.get_mail_body(seen[0].mail_id) == "메일 6"
+
+def test_counters_follow_inserts_reads_and_deletes():
+    mailbox = Mailbox()
+    for i in range(3):
+        mailbox.send_mail("lee", "2", "1", f"메일 {i}")
+    first = mailbox.get_mails_for_user("1")[-1]
+    mailbox.mark_read(first.mail_id)
+    mailbox.mark_read(first.mail_id)
+    assert mailbox.get_mail_counts("1") == (3, 2)
+    mailbox.conn.execute("DELETE FROM mails WHERE id = ?", (first.mail_id,)); mailbox.conn.commit()
+    assert mailbox.get_mail_counts("1") == (2, 2)
+    assert mailbox.get_mail_counts("없는 사용자") == (0, 0)
+
+def test_bulk_mail_stores_the_body_once():
+    mailbox = Mailbox()
+    assert mailbox.send_bulk("알림봇", "system-notifier", ["1", "2", "", "3"], "같은 소식") == 3
+    assert mailbox.send_bulk("알림봇", "system-notifier", ["1"], "같은 소식") == 1
+    assert mailbox.conn.execute("SELECT COUNT(*) FROM mail_bodies").fetchone()[0] == 1
+    assert mailbox.conn.execute("SELECT COUNT(*) FROM mails WHERE message = ''").fetchone()[0] == 4
+    mails = mailbox.get_mails_for_user("1")
+    assert [mail.message for mail in mails] == ["같은 소식", "같은 소식"]
+    assert mailbox.get_mail(mails[0].mail_id).message == "같은 소식"
+    assert mailbox.get_mail_counts("1") == (2, 2) and mailbox.get_mail_counts("3") == (1, 1)
+
+def test_bulk_mail_validation():
+    mailbox = Mailbox()
+    assert mailbox.send_bulk("알림봇", "system-notifier", [], "소식") == 0
+    with pytest.raises(ValueError):
+        mailbox.send_bulk("알림봇", "system-notifier", ["1"], "")
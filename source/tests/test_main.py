@@ -0,0 +1,11 @@
+import os
+import subprocess
+import sys
+
+SOURCE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+def test_main_starts_from_the_source_directory():
+    # 테스트의 sys.path 설정 없이 README의 실행 방법 그대로 모듈을 불러올 수 있어야 합니다.
+    result = subprocess.run([sys.executable, "main.py", "--help"], cwd=SOURCE_DIR, capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert "--headless" in result.stdout
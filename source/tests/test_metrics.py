@@ -0,0 +1,86 @@
+import json
+
+import pytest
+
+import metrics
+import storage
+from metrics import Registry
+
+@pytest.fixture
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    metrics.REGISTRY.drain_spans()
+    yield metrics.REGISTRY
+    metrics.REGISTRY.drain_spans()
+
+def _value(registry, name, **labels):
+    for entry in registry.snapshot()[name]["values"]:
+        if entry["labels"] == labels:
+            return entry
+    return None
+
+def test_counter_and_histogram():
+    registry = Registry()
+    registry.counter("hits_total", "요청 수").inc(result="hit")
+    registry.counter("hits_total").inc(2, result="hit")
+    histogram = registry.histogram("latency_seconds")
+    for value in (0.002, 0.004, 0.2, 3.0):
+        histogram.observe(value, op="get")
+    assert _value(registry, "hits_total", result="hit")["value"] == 3
+    entry = _value(registry, "latency_seconds", op="get")
+    assert (entry["count"], entry["max"]) == (4, 3.0) and entry["sum"] == pytest.approx(3.206)
+    assert (entry["p50"], entry["p99"]) == (0.005, 5.0)
+
+def test_prometheus_text_format():
+    registry = Registry()
+    registry.counter("hits_total", "요청 수").inc(path='a"b')
+    registry.histogram("latency_seconds").observe(0.3)
+    text = registry.render_prometheus()
+    assert '# HELP hits_total 요청 수\n# TYPE hits_total counter\nhits_total{path="a\\"b"} 1\n' in text
+    assert 'latency_seconds_bucket{le="0.25"} 0\nlatency_seconds_bucket{le="0.5"} 1\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1\nlatency_seconds_sum 0.3\nlatency_seconds_count 1\n' in text
+
+def test_disabled_instrumentation_records_nothing(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    metrics.REGISTRY.drain_spans()
+    with metrics.span("ignored"):
+        pass
+    metrics.inc("ignored_total")
+    assert metrics.REGISTRY.drain_spans() == []
+    assert "ignored_total" not in metrics.REGISTRY.snapshot()
+
+def test_nested_spans_record_their_parent(enabled):
+    @metrics.timed("outer")
+    def outer():
+        with metrics.span("inner", kind="test"):
+            pass
+    outer()
+    with pytest.raises(ValueError):
+        with metrics.span("failing"):
+            raise ValueError()
+    spans = {span["span"]: span for span in enabled.drain_spans()}
+    assert spans["inner"]["parent"] == "outer" and spans["inner"]["labels"] == {"kind": "test"}
+    assert spans["outer"]["parent"] is None
+    assert spans["failing"]["error"] == "ValueError"
+    assert _value(enabled, "span_errors_total", span="failing")["value"] >= 1
+
+def test_sqlite_calls_are_timed_when_enabled(enabled):
+    conn = storage.connect("test.db")
+    assert isinstance(conn, storage.InstrumentedConnection)
+    conn.execute("CREATE TABLE t (x)")
+    conn.execute("INSERT INTO t VALUES (1)")
+    conn.commit()
+    assert _value(enabled, "db_query_seconds", db="test.db", op="INSERT")["count"] >= 1
+    assert _value(enabled, "db_query_seconds", db="test.db", op="COMMIT")["count"] >= 1
+    conn.close()
+
+def test_exporter_writes_snapshots(enabled):
+    exporter = metrics.MetricsExporter(dict(metrics.DEFAULT_METRICS_CONFIG, export_file="metrics.jsonl", export_interval=60))
+    exporter.start()
+    with metrics.span("exported"):
+        pass
+    exporter.stop()
+    with open("metrics.jsonl", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [span["span"] for span in records[-1]["spans"]] == ["exported"]
+    assert "span_duration_seconds" in records[-1]["metrics"]
@@ -0,0 +1,55 @@
+import os
+
+import joblib
+import pytest
+
+import Analyze
+from Analyze import (MODEL_BUNDLE_PATH, MODEL_BUNDLE_CHECKSUM_PATH, CLASSIFIER_PATH, REGRESSOR_PATH, COLUMNS_PATH,
+                     DemandModel, load_model_and_columns, load_model_async, load_model_bundle, save_model_bundle)
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_bundle_round_trip(trained_model, mmap):
+    classifier, regressor, columns = trained_model
+    save_model_bundle(classifier, regressor, columns)
+    assert os.path.exists(MODEL_BUNDLE_CHECKSUM_PATH)
+    loaded_classifier, loaded_regressor, loaded_columns = load_model_bundle(mmap=mmap)
+    assert loaded_columns == columns
+    assert list(loaded_classifier.classes_) == list(classifier.classes_)
+    assert loaded_regressor.n_estimators == regressor.n_estimators
+
+@pytest.mark.parametrize("mmap", [False, True])
+def test_checksum_mismatch_is_rejected(trained_model, mmap):
+    save_model_bundle(*trained_model)
+    with open(MODEL_BUNDLE_PATH, "ab") as f:
+        f.write(b"corrupted")
+    with pytest.raises(ValueError):
+        load_model_bundle(mmap=mmap)
+
+def test_unknown_version_is_rejected(trained_model, monkeypatch):
+    monkeypatch.setattr(Analyze, "MODEL_BUNDLE_VERSION", Analyze.MODEL_BUNDLE_VERSION + 1)
+    save_model_bundle(*trained_model)
+    monkeypatch.setattr(Analyze, "MODEL_BUNDLE_VERSION", Analyze.MODEL_BUNDLE_VERSION - 1)
+    with pytest.raises(ValueError):
+        load_model_bundle()
+
+def test_saving_a_bundle_invalidates_the_prediction_table(trained_model):
+    with open(Analyze.PREDICTION_TABLE_PATH, "w") as f:
+        f.write("old table")
+    save_model_bundle(*trained_model)
+    assert not os.path.exists(Analyze.PREDICTION_TABLE_PATH)
+
+def test_legacy_files_are_converted(trained_model):
+    classifier, regressor, columns = trained_model
+    joblib.dump(classifier, CLASSIFIER_PATH)
+    joblib.dump(regressor, REGRESSOR_PATH)
+    joblib.dump(columns, COLUMNS_PATH)
+    assert load_model_and_columns()[2] == columns
+    assert os.path.exists(MODEL_BUNDLE_PATH)
+    assert load_model_bundle()[2] == columns
+
+def test_load_model_async(trained_model):
+    save_model_bundle(*trained_model)
+    model = load_model_async(compiled=True).result(timeout=60)
+    assert isinstance(model, DemandModel)
+    assert model.table is not None
+    assert model.model_columns == trained_model[2]
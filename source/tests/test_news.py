@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+
+import pytest
+import requests
+from urllib.parse import parse_qs, urlsplit
+
+import Localinfo
+import http_client
+from Localinfo import TokenBucket
+from account_management import AccountManager
+from cache import TTLCache
+from service import AppService
+
+PAGE = '<a class="title_link">{region} {keyword} 소식</a><a class="title_link">{region} {keyword} 소식</a>'
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+    def raise_for_status(self):
+        pass
+
+class FakeClient:
+    """요청한 검색어를 제목으로 돌려주는 HTTP 클라이언트입니다. failing에 든 키워드는 오류를 냅니다."""
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.started = threading.Event()
+        self.gate = None
+
+    def get(self, url, headers=None, timeout=None, deadline=None):
+        with self.lock:
+            self.calls += 1
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        region, keyword = parse_qs(urlsplit(url).query)["query"][0].rsplit(" ", 1)
+        if keyword in self.failing:
+            raise requests.exceptions.ConnectionError("연결 실패")
+        return FakeResponse(PAGE.format(region=region, keyword=keyword))
+
+@pytest.fixture
+def localinfo(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(http_client, "get_client", lambda: client)
+    monkeypatch.setattr(Localinfo, "_news_cache", TTLCache(Localinfo.NEWS_CACHE_TTL))
+    monkeypatch.setattr(Localinfo, "_buckets", {})
+    monkeypatch.setattr(Localinfo, "HOST_RATE_LIMIT", 1000.0)
+    monkeypatch.setattr(Localinfo, "HOST_BURST", 1000)
+    Localinfo.client = client
+    return Localinfo
+
+def test_token_bucket_allows_burst_then_limits_rate():
+    bucket = TokenBucket(rate=20.0, capacity=2)
+    started = time.monotonic()
+    assert bucket.acquire(started + 1) and bucket.acquire(started + 1)
+    assert time.monotonic() - started < 0.04
+    assert bucket.acquire(started + 1)
+    assert time.monotonic() - started >= 0.04
+
+def test_token_bucket_gives_up_at_deadline():
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    assert bucket.acquire(time.monotonic() + 1)
+    started = time.monotonic()
+    assert bucket.acquire(time.monotonic() + 0.05) is False
+    assert time.monotonic() - started < 0.05
+
+def test_results_keep_order_and_are_cached(localinfo):
+    result = localinfo.search_titles_multi(["서울", "대구"], ["축제", "공연"])
+    assert list(result) == ["서울", "대구"]
+    assert list(result["대구"]) == ["축제", "공연"]
+    assert result["대구"]["공연"] == ["대구 공연 소식"]
+    assert localinfo.client.calls == 4
+    assert localinfo.search_titles("서울", ["공연", "축제"]) == {"공연": ["서울 공연 소식"], "축제": ["서울 축제 소식"]}
+    assert localinfo.client.calls == 4
+
+def test_each_pair_gets_its_own_deadline(localinfo, monkeypatch):
+    # 초당 20건, 순간 허용량 1건이면 24쌍을 모두 받는 데 1초 이상 걸리지만, 요청마다의 기한(0.5초)은 넘지 않습니다.
+    monkeypatch.setattr(localinfo, "HOST_RATE_LIMIT", 20.0)
+    monkeypatch.setattr(localinfo, "HOST_BURST", 1)
+    regions = [f"지역{i}" for i in range(6)]
+    started = time.monotonic()
+    result = localinfo.search_titles_multi(regions, ["축제", "행사", "사고", "공연"], deadline=0.5)
+    assert time.monotonic() - started > 0.5
+    assert not any(localinfo.is_error(titles) for keywords in result.values() for titles in keywords.values())
+
+def test_errors_are_not_cached(localinfo):
+    localinfo.client.failing.add("사고")
+    result = localinfo.search_titles("서울", ["사고", "축제"])
+    assert localinfo.is_error(result["사고"]) and not localinfo.is_error(result["축제"])
+    localinfo.client.failing.clear()
+    assert localinfo.search_titles("서울", ["사고"]) == {"사고": ["서울 사고 소식"]}
+
+def test_failed_keywords_are_not_mailed_as_news(localinfo):
+    localinfo.client.failing.update({"축제", "행사", "사고"})
+    manager = AccountManager(bcrypt_rounds=4)
+    manager.create_user("kim", "김", "pw", "대구")
+    service = AppService.__new__(AppService)
+    service.account_manager, service.demand_contexts, service.mail_listeners = manager, {}, []
+
+    service.send_periodic_news()
+    user_id = manager.get_directory().get_by_username("kim")[0]
+    mails = manager.mailbox.get_mails_for_user(user_id)
+    assert len(mails) == 1
+    assert "공연 관련 소식" in mails[0].message
+    assert "오류" not in mails[0].message
+    assert service.demand_contexts["대구"]["has_festival"] == 0
+
+    # 모든 키워드가 실패하면 메일을 보내지 않습니다.
+    localinfo.client.failing.add("공연")
+    localinfo.get_news_cache().clear()
+    service.send_periodic_news()
+    assert len(manager.mailbox.get_mails_for_user(user_id)) == 1
+
+def test_news_cache_file_is_created_on_first_use(monkeypatch):
+    monkeypatch.setattr(Localinfo, "_news_cache", None)
+    assert not os.path.exists(Localinfo.NEWS_CACHE_DB_PATH)
+    cache = Localinfo.get_news_cache()
+    try:
+        assert os.path.exists(Localinfo.NEWS_CACHE_DB_PATH)
+        assert Localinfo.get_news_cache() is cache
+    finally:
+        cache.close()
+
+def test_concurrent_misses_share_one_fetch(localinfo):
+    localinfo.client.gate = threading.Event()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(localinfo.search_titles("서울", ["축제"]))) for _ in range(3)]
+    threads[0].start()
+    assert localinfo.client.started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.1)
+    localinfo.client.gate.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [{"축제": ["서울 축제 소식"]}] * 3
+    assert localinfo.client.calls == 1
@@ -0,0 +1,53 @@
+import itertools
+import os
+
+import pytest
+
+from Analyze import (CATEGORIES, PREDICTION_TABLE_PATH, PredictionTable, load_prediction_table, predict_demand_batch)
+
+@pytest.fixture(scope="module")
+def table(trained_model):
+    return PredictionTable.build(*trained_model)
+
+def _context(temp, rain, festival, concert):
+    return {"온도": str(temp), "is_raining": bool(rain)}, {"축제": ["축제"] if festival else [], "공연": ["공연"] if concert else []}
+
+@pytest.mark.parametrize("temp", [0, 17, 29, 30, 35])
+def test_table_matches_model(trained_model, table, temp):
+    for rain, festival, concert in itertools.product([0, 1], repeat=3):
+        weather, events = _context(temp, rain, festival, concert)
+        expected = predict_demand_batch(CATEGORIES, weather, events, *trained_model)
+        for got, want in zip(table.lookup_batch(CATEGORIES, weather, events), expected):
+            assert got["class"] == want["class"]
+            assert got["probability"] == pytest.approx(want["probability"])
+            assert got["quantity"] == pytest.approx(want["quantity"])
+
+def test_values_outside_the_table_fall_back_to_model(trained_model, table):
+    weather, events = _context(21.5, 0, 0, 0)
+    assert table.lookup_batch(CATEGORIES, weather, events) == [None] * len(CATEGORIES)
+    weather, events = _context(36, 0, 0, 0)
+    assert table.lookup_batch(["음료"], weather, events) == [None]
+    weather, events = _context(20, 0, 0, 0)
+    assert table.lookup_batch(["없는 카테고리", "음료"], weather, events)[0] is None
+
+    # 테이블을 사용해도 테이블 밖의 값은 모델로 예측합니다.
+    weather, events = _context(21.5, 1, 0, 1)
+    with_table = predict_demand_batch(CATEGORIES, weather, events, *trained_model, table=table)
+    assert with_table == predict_demand_batch(CATEGORIES, weather, events, *trained_model)
+
+def test_save_and_load(table):
+    table.save("table.joblib")
+    loaded = PredictionTable.load("table.joblib")
+    weather, events = _context(25, 1, 1, 0)
+    assert loaded.lookup_batch(CATEGORIES, weather, events) == table.lookup_batch(CATEGORIES, weather, events)
+
+def test_table_is_rebuilt_when_model_changes(trained_model):
+    first = load_prediction_table(*trained_model)
+    assert os.path.exists(PREDICTION_TABLE_PATH)
+    assert load_prediction_table(*trained_model).fingerprint == first.fingerprint
+
+    # 모델 번들 파일이 바뀌면 저장된 테이블의 지문과 달라져 다시 계산합니다.
+    with open("demand_model.joblib.sha256", "w") as f:
+        f.write("changed")
+    rebuilt = load_prediction_table(*trained_model)
+    assert rebuilt.fingerprint != first.fingerprint
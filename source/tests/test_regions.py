@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from regions import RegionRegistry, dfs_grid_conv, dfs_grid_conv_array, get_registry
+
+def test_array_conversion_matches_single_points():
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(33.0, 38.7, 2000), rng.uniform(124.5, 131.0, 2000)
+    nx, ny = dfs_grid_conv_array(lats, lons)
+    assert list(zip(nx.tolist(), ny.tolist())) == [dfs_grid_conv(lat, lon) for lat, lon in zip(lats, lons)]
+
+def test_known_grids():
+    # 기상청 격자 좌표 (서울시청 60,127 / 부산시청 98,76)
+    assert dfs_grid_conv(37.5665, 126.9780) == (60, 127)
+    assert get_registry().grid("서울") == (60, 127)
+    assert get_registry().grid("부산") == (98, 76)
+    assert get_registry().grid("없는 지역") is None
+
+def test_registry_lookups():
+    registry = get_registry()
+    assert "서울 종로구" in registry and registry.get("서울 종로구").sido == "서울"
+    assert registry.sidos()[0] == "서울" and "서울 종로구" not in registry.sidos()
+    districts = registry.districts("부산")
+    assert districts[0] == "부산" and "부산 해운대구" in districts
+    assert all(name == "부산" or name.startswith("부산 ") for name in districts)
+    assert sum(len(registry.districts(sido)) for sido in registry.sidos()) == len(registry)
+
+@pytest.mark.parametrize("lat, lon, expected", [
+    (37.5720, 126.9794, "서울 종로구"),   # 광화문
+    (35.1587, 129.1604, "부산 해운대구"), # 해운대 해수욕장
+    (35.8580, 128.6310, "대구 수성구"),
+    (33.5000, 126.5300, "제주 제주시"),
+])
+def test_nearest_district(lat, lon, expected):
+    assert get_registry().nearest(lat, lon).name == expected
+
+def test_nearest_scales_longitude_by_latitude():
+    # 위도 60도에서는 경도 1도가 위도 0.5도와 같은 거리입니다.
+    registry = RegionRegistry([("가", "북", 60.6, 10.0), ("가", "동", 60.0, 10.9)])
+    assert registry.nearest(60.0, 10.0).name == "가 동"
+    # 기본적으로 시·도 자체(청사 위치)는 후보에서 빠집니다.
+    registry = RegionRegistry([("가", "", 37.0, 127.0), ("가", "나", 36.0, 127.0)])
+    assert registry.nearest(37.0, 127.0).name == "가 나"
+    assert registry.nearest(37.0, 127.0, include_sido=True).name == "가"
+
+def test_regions_by_grid_groups_shared_grids():
+    registry = RegionRegistry([("가", "", 37.5665, 126.9780), ("가", "나", 37.5670, 126.9785), ("다", "", 35.1796, 129.0756)])
+    assert registry.regions_by_grid() == {(60, 127): ["가", "가 나"], (98, 76): ["다"]}
+    assert registry.regions_by_grid(["다", "없음"]) == {(98, 76): ["다"]}
+
+def test_duplicate_names_are_rejected():
+    with pytest.raises(ValueError):
+        RegionRegistry([("가", "", 37.0, 127.0), ("가", "", 36.0, 127.0)])
@@ -0,0 +1,78 @@
+import os
+import random
+
+import pandas as pd
+
+import retrain
+from Analyze import MODEL_BUNDLE_PATH, demand_context
+from inventory import Inventory, Item
+
+CONTEXT = {"temperature": 31.0, "is_raining": 0, "has_festival": 1, "has_concert": 0}
+
+def _history(db_path="inventory.db"):
+    inventory = Inventory(db_path)
+    return inventory.conn.execute("SELECT item_id, category, quantity_change, temperature, has_festival FROM stock_history ORDER BY id").fetchall()
+
+def test_quantity_changes_are_recorded_with_context():
+    inventory = Inventory(context_provider=lambda: CONTEXT)
+    item = Item("콜라", 10, 1500, 900, "음료")
+    inventory.add_item("owner", item)
+    inventory.update_item("owner", item.item_id, quantity=25)
+    inventory.update_item("owner", item.item_id, price=1600)
+    inventory.update_item("owner", item.item_id, quantity=25)
+    inventory.update_item("owner", item.item_id, quantity=20)
+    assert _history() == [(item.item_id, "음료", 15, 31.0, 1), (item.item_id, "음료", -5, 31.0, 1)]
+
+def test_bulk_import_is_not_recorded():
+    inventory = Inventory(context_provider=lambda: CONTEXT)
+    inventory.bulk_upsert("owner", [("콜라", 10, 1500, 900, "음료")])
+    inventory.bulk_upsert("owner", [("콜라", 50, 1500, 900, "음료")])
+    assert inventory.get_item("owner", Item("콜라", 0, 0, 0).item_id).quantity == 50
+    assert _history() == []
+
+def test_demand_context():
+    weather = {"온도": "28.5", "is_raining": True}
+    assert demand_context(weather, {"축제": [], "공연": ["공연"]}) == \
+        {"temperature": 28.5, "is_raining": 1, "has_festival": 0, "has_concert": 1}
+
+def _fill_history(rows, with_weather=True, seed=0):
+    rng = random.Random(seed)
+    inventory = Inventory(context_provider=lambda: CONTEXT if with_weather else {})
+    for i in range(rows):
+        item = Item(f"item-{seed}-{i}", 0, 1000, 500, rng.choice(["음료", "식품", "문구"]))
+        inventory.add_item("owner", item)
+        inventory.update_item("owner", item.item_id, quantity=rng.randint(-10, 10) or 1)
+
+def test_new_history_is_labelled_and_rows_without_weather_are_counted():
+    _fill_history(5)
+    _fill_history(3, with_weather=False, seed=1)
+    batches = list(retrain.iter_new_history("inventory.db", 0, batch_size=4))
+    assert [(len(df), skipped) for df, _, skipped in batches] == [(4, 0), (1, 3)]
+    df = pd.concat([df for df, _, _ in batches])
+    assert list(df.columns) == retrain.SYNTHETIC_COLUMNS
+    for change, label in zip(df["quantity_change"], df["demand"]):
+        assert label == retrain._label_demand(change)
+    # 이미 처리한 id 이후만 다시 읽습니다.
+    assert list(retrain.iter_new_history("inventory.db", batches[-1][1])) == []
+
+def test_retraining_waits_for_enough_rows(capsys):
+    _fill_history(10)
+    _fill_history(2, with_weather=False, seed=1)
+    assert retrain.run_retraining() is False
+    output = capsys.readouterr().out
+    assert "2행은 훈련에서 제외" in output
+    assert retrain._load_state()["training_rows"] == 10
+    # 같은 이력은 다시 처리하지 않습니다.
+    assert retrain.run_retraining() is False
+    assert len(pd.read_csv(retrain.TRAINING_HISTORY_PATH)) == 10
+
+def test_retraining_uses_a_bounded_window(monkeypatch):
+    monkeypatch.setattr(retrain, "MIN_TRAINING_ROWS", 20)
+    monkeypatch.setattr(retrain, "TRAINING_WINDOW_ROWS", 30)
+    _fill_history(40)
+    assert retrain.run_retraining() is True
+    assert os.path.exists(MODEL_BUNDLE_PATH)
+    assert len(pd.read_csv(retrain.TRAINING_HISTORY_PATH)) == 30
+
+def test_missing_database_skips_retraining():
+    assert retrain.run_retraining("missing.db") is False
@@ -0,0 +1,103 @@
+import json
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+from scheduler import CronExpression, Job, Scheduler
+
+@pytest.mark.parametrize("expression, after, expected", [
+    ("0 3 * * *", datetime(2024, 10, 17, 2, 59), datetime(2024, 10, 17, 3, 0)),
+    ("0 3 * * *", datetime(2024, 10, 17, 3, 0), datetime(2024, 10, 18, 3, 0)),
+    ("10 * * * *", datetime(2024, 12, 31, 23, 30), datetime(2025, 1, 1, 0, 10)),
+    ("*/15 9-10 * * *", datetime(2024, 10, 17, 10, 50), datetime(2024, 10, 18, 9, 0)),
+    ("0 9 * * 1-5", datetime(2024, 10, 18, 12, 0), datetime(2024, 10, 21, 9, 0)),
+    ("0 0 29 2 *", datetime(2024, 3, 1), datetime(2028, 2, 29)),
+    # 일과 요일이 모두 지정되면 둘 중 하나만 맞아도 실행합니다. (2024-10-20은 일요일)
+    ("0 0 1 * 0", datetime(2024, 10, 17), datetime(2024, 10, 20)),
+    ("0 0 * * 7", datetime(2024, 10, 17), datetime(2024, 10, 20)),
+])
+def test_cron_next_after(expression, after, expected):
+    assert CronExpression(expression).next_after(after) == expected
+
+@pytest.mark.parametrize("expression", ["* * * *", "60 * * * *", "* 24 * * *", "*/0 * * * *", "5-1 * * * *", "a * * * *"])
+def test_invalid_cron_is_rejected(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+def test_job_needs_exactly_one_schedule():
+    with pytest.raises(ValueError):
+        Job("news", print)
+    with pytest.raises(ValueError):
+        Job("news", print, interval=60, cron="* * * * *")
+    with pytest.raises(ValueError):
+        Job("news", print, interval=0)
+
+def _read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def _wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("제한 시간 안에 조건을 만족하지 못했습니다.")
+        time.sleep(0.01)
+
+@pytest.fixture
+def scheduler():
+    scheduler = Scheduler()
+    yield scheduler
+    scheduler.stop()
+
+def test_interval_jobs_run_at_a_fixed_rate(scheduler):
+    calls = []
+    scheduler.add_job("tick", lambda: calls.append(time.monotonic()), interval=0.1, run_immediately=True)
+    scheduler.start()
+    _wait_for(lambda: len(calls) >= 4)
+    scheduler.stop()
+    gaps = [b - a for a, b in zip(calls, calls[1:])]
+    assert all(0.05 < gap < 0.2 for gap in gaps)
+    state = _read_json("scheduler_state.json")
+    assert state["tick"]["runs"] >= 4 and state["tick"]["failures"] == 0
+
+def test_overlapping_runs_are_skipped_and_failures_counted(scheduler):
+    release = threading.Event()
+    def slow():
+        release.wait(5)
+        raise RuntimeError("실패")
+    scheduler.add_job("slow", slow, interval=0.05, run_immediately=True)
+    scheduler.start()
+    _wait_for(lambda: scheduler.stats()["slow"]["skipped"] >= 2)
+    assert scheduler.run_now("slow") is False
+    release.set()
+    _wait_for(lambda: scheduler.stats()["slow"]["failures"] >= 1)
+    assert scheduler.stats()["slow"]["last_error"] == "실패"
+
+def test_run_now_does_not_move_the_schedule(scheduler):
+    calls = []
+    scheduler.add_job("daily", lambda: calls.append(1), cron="0 3 * * *")
+    assert scheduler.run_now("daily") is False
+    scheduler.start()
+    next_run = scheduler.stats()["daily"]["next_run"]
+    assert scheduler.run_now("daily") is True
+    _wait_for(lambda: calls == [1] and not scheduler.stats()["daily"]["running"])
+    assert scheduler.stats()["daily"]["next_run"] == next_run
+
+def test_config_file_overrides_the_schedule():
+    with open("scheduler_config.json", "w") as f:
+        json.dump({"news": {"cron": "0 * * * *"}}, f)
+    scheduler = Scheduler()
+    assert scheduler.add_job("news", print, interval=60).cron.expression == "0 * * * *"
+    with pytest.raises(ValueError):
+        scheduler.add_job("news", print, interval=60)
+
+def test_set_interval_is_saved(scheduler):
+    scheduler.add_job("news", print, interval=3600)
+    scheduler.set_interval("news", 120)
+    assert scheduler.get_interval("news") == 120
+    assert _read_json("scheduler_config.json") == {"news": {"interval": 120}}
+    assert Scheduler().add_job("news", print, interval=3600).interval == 120
+    with pytest.raises(ValueError):
+        scheduler.set_interval("news", 0)
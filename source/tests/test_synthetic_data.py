@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from Analyze import CATEGORIES, SYNTHETIC_COLUMNS, generate_synthetic_data, iter_synthetic_data
+
+def test_columns_and_ranges():
+    df = generate_synthetic_data(5000, seed=1)
+    assert list(df.columns) == SYNTHETIC_COLUMNS
+    assert len(df) == 5000
+    assert df["temperature"].between(0, 34).all()
+    assert set(df["category"]) <= set(CATEGORIES)
+    assert ((df["temperature"] >= 30) == (df["is_hot_wave"] == 1)).all()
+    assert set(df["demand"]) <= {"수요 증가", "수요 보통", "수요 감소"}
+
+def test_same_seed_is_reproducible():
+    pd.testing.assert_frame_equal(generate_synthetic_data(1000, seed=3), generate_synthetic_data(1000, seed=3))
+
+def test_category_rules():
+    df = generate_synthetic_data(20000, seed=2)
+    hot_drinks = df[(df["category"] == "음료") & (df["is_hot_wave"] == 1)]
+    assert (hot_drinks["demand"] == "수요 증가").all()
+    assert hot_drinks["quantity_change"].between(15, 29).all()
+
+    rainy_stationery = df[(df["category"] == "문구") & (df["is_raining"] == 1)]
+    assert (rainy_stationery["demand"] == "수요 감소").all()
+    assert rainy_stationery["quantity_change"].between(-8, -2).all()
+
+    # 규칙에 해당하지 않는 전자기기는 항상 '수요 보통'(-2 ~ +2)입니다.
+    electronics = df[df["category"] == "전자기기"]
+    assert (electronics["demand"] == "수요 보통").all()
+    assert electronics["quantity_change"].between(-2, 2).all()
+
+def test_chunks_cover_all_samples():
+    chunks = list(iter_synthetic_data(2500, chunk_size=1000, seed=4))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert all(list(chunk.columns) == SYNTHETIC_COLUMNS for chunk in chunks)
+
+def test_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        next(iter_synthetic_data(10, chunk_size=0))
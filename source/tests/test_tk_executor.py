@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from tk_executor import TkExecutor
+
+class FakeMaster:
+    """master.after로 예약된 콜백을 보관했다가 테스트가 원할 때 실행합니다."""
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+        self.thread = threading.current_thread()
+
+    def after(self, ms, fn):
+        assert threading.current_thread() is self.thread, "after는 UI 스레드에서만 호출해야 합니다."
+        self.next_id += 1
+        self.pending[self.next_id] = fn
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def poll(self):
+        for after_id, fn in list(self.pending.items()):
+            del self.pending[after_id]
+            fn()
+
+class FakeWidget:
+    def __init__(self, name):
+        self.name = name
+        self.exists = True
+        self.handlers = []
+
+    def __str__(self):
+        return self.name
+
+    def bind(self, sequence, handler, add=None):
+        self.handlers.append(handler)
+
+    def winfo_exists(self):
+        return self.exists
+
+    def destroy(self):
+        self.exists = False
+        event = type("Event", (), {"widget": self})()
+        for handler in self.handlers:
+            handler(event)
+
+@pytest.fixture
+def master():
+    return FakeMaster()
+
+@pytest.fixture
+def executor(master):
+    executor = TkExecutor(master, max_workers=2)
+    yield executor
+    executor.close()
+
+def _poll_until(master, condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "제한 시간 안에 결과가 전달되지 않았습니다."
+        master.poll()
+        time.sleep(0.01)
+
+def test_callbacks_run_on_the_ui_thread(master, executor):
+    results, errors, threads = [], [], []
+    executor.submit(lambda x: (threads.append(threading.current_thread()), x * 2)[1], 21,
+                    on_success=lambda value: results.append((value, threading.current_thread())))
+    executor.submit(lambda: 1 / 0, on_error=errors.append)
+    _poll_until(master, lambda: results and errors)
+    assert results == [(42, threading.current_thread())]
+    assert threads[0] is not threading.current_thread()
+    assert isinstance(errors[0], ZeroDivisionError)
+
+def test_results_for_a_destroyed_owner_are_dropped(master, executor):
+    popup, results = FakeWidget(".popup"), []
+    started, release = threading.Event(), threading.Event()
+    def slow():
+        started.set(); release.wait(5)
+        return "done"
+    executor.submit(slow, owner=popup, on_success=results.append)
+    assert started.wait(5)
+    popup.destroy()
+    release.set()
+    executor.submit(lambda: None, on_success=lambda _: results.append("other"))
+    _poll_until(master, lambda: "other" in results)
+    assert results == ["other"]
+    assert executor.owner_tasks == {}
+
+def test_call_in_ui_from_a_worker(master, executor):
+    calls = []
+    thread = threading.Thread(target=lambda: executor.call_in_ui(calls.append, threading.current_thread()))
+    thread.start(); thread.join(5)
+    assert calls == []
+    master.poll()
+    assert calls == [thread]
+
+def test_close_stops_polling(master):
+    executor = TkExecutor(master)
+    executor.close()
+    assert master.pending == {}
+    executor.call_in_ui(print, "무시됨")
+    assert executor.results.empty()
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+import storage
+from inventory import Inventory, Item
+from mail_box import Mailbox
+
+def test_default_profile_is_applied():
+    conn = storage.connect("test.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    conn.close()
+
+def test_profile_can_be_overridden_from_the_config_file():
+    with open(storage.STORAGE_CONFIG_FILE, "w") as f:
+        json.dump({"journal_mode": "delete", "synchronous": "full"}, f)
+    conn = storage.connect("test.db")
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    conn.close()
+
+def test_invalid_profile_is_rejected():
+    with pytest.raises(ValueError):
+        storage.connect("test.db", dict(storage.DEFAULT_STORAGE_CONFIG, synchronous="SOMETIMES"))
+
+def _names(inventory):
+    return sorted(item.name for item in inventory.list_items("kim"))
+
+def test_unit_of_work_commits_once():
+    inventory = Inventory()
+    with inventory.transaction():
+        inventory.add_item("kim", Item("콜라", 1, 1000, 500))
+        assert inventory.in_transaction()
+        # 작업 단위 안의 변경은 다른 연결에서 아직 보이지 않습니다.
+        other = storage.connect("inventory.db")
+        assert other.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+        other.close()
+    assert not inventory.in_transaction()
+    assert _names(inventory) == ["콜라"]
+
+def test_unit_of_work_rolls_back_everything():
+    inventory = Inventory()
+    inventory.add_item("kim", Item("기존", 1, 1000, 500))
+    with pytest.raises(ValueError):
+        with inventory.transaction():
+            inventory.add_item("kim", Item("콜라", 1, 1000, 500))
+            with inventory.transaction():
+                inventory.add_item("kim", Item("빵", 1, 1000, 500))
+            inventory.add_item("kim", Item("콜라", 2, 1000, 500))
+    assert _names(inventory) == ["기존"]
+
+def test_instances_sharing_a_connection_share_the_unit_of_work():
+    first, second = Inventory(), Inventory()
+    with pytest.raises(RuntimeError):
+        with first.transaction():
+            second.add_item("kim", Item("콜라", 1, 1000, 500))
+            raise RuntimeError("중단")
+    assert _names(first) == []
+
+def test_mailbox_supports_units_of_work():
+    mailbox = Mailbox()
+    with mailbox.transaction():
+        mailbox.send_mail("lee", 2, 1, "첫 번째")
+        mailbox.send_mail("lee", 2, 1, "두 번째")
+    assert len(mailbox.get_mails_for_user(1)) == 2
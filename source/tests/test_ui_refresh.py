@@ -0,0 +1,111 @@
+import pytest
+
+import interface
+from interface import InventoryUI, MailboxUI
+from inventory import Inventory, Item
+from mail_box import Mailbox
+
+class FakeTree:
+    """Treeview 대신 행 순서와 값, 호출된 변경 작업을 기록합니다."""
+    def __init__(self):
+        self.order, self.values, self.tags = [], {}, {}
+        self.ops = []
+
+    def insert(self, parent, index, iid, values, tags=()):
+        self.order.insert(len(self.order) if index == "end" else index, iid)
+        self.values[iid], self.tags[iid] = values, tags
+        self.ops.append(("insert", iid))
+
+    def item(self, iid, values=None, tags=None):
+        if values is not None:
+            self.values[iid] = values
+        if tags is not None:
+            self.tags[iid] = tags
+        self.ops.append(("item", iid))
+
+    def delete(self, iid):
+        self.order.remove(iid)
+        del self.values[iid], self.tags[iid]
+        self.ops.append(("delete", iid))
+
+class FakeUser:
+    def __init__(self, user_id):
+        self.user_id = user_id
+    def get_id(self):
+        return self.user_id
+
+@pytest.fixture
+def inventory_ui(monkeypatch):
+    monkeypatch.setattr(interface, "INVENTORY_PAGE_SIZE", 5)
+    ui = InventoryUI.__new__(InventoryUI)
+    ui.inventory, ui.user_id, ui.tree = Inventory(), "kim", FakeTree()
+    return ui
+
+def _add(inventory, name, quantity=1):
+    item = Item(name, quantity, 1000, 500, "음료")
+    inventory.add_item("kim", item)
+    return item.item_id
+
+def test_first_refresh_loads_one_page(inventory_ui):
+    ids = sorted(_add(inventory_ui.inventory, f"item-{i}") for i in range(12))
+    inventory_ui.refresh_inventory()
+    assert inventory_ui.tree.order == ids[:5] and inventory_ui.has_more_items
+    inventory_ui.load_next_page(); inventory_ui.load_next_page()
+    assert inventory_ui.tree.order == ids and not inventory_ui.has_more_items
+
+def test_refresh_applies_only_changes(inventory_ui):
+    inventory = inventory_ui.inventory
+    ids = [_add(inventory, f"item-{i}") for i in range(4)]
+    inventory_ui.refresh_inventory()
+    inventory_ui.tree.ops.clear()
+
+    inventory.update_item("kim", ids[0], quantity=99)
+    inventory.delete_item("kim", ids[1])
+    new_id = _add(inventory, "new")
+    inventory_ui.refresh_inventory()
+    assert sorted(inventory_ui.tree.ops) == sorted([("item", ids[0]), ("delete", ids[1]), ("insert", new_id)])
+    assert inventory_ui.tree.order == sorted(set(ids + [new_id]) - {ids[1]})
+    assert inventory_ui.tree.values[ids[0]][2] == 99
+
+    # 바뀐 것이 없으면 아무 작업도 하지 않습니다.
+    inventory_ui.tree.ops.clear()
+    inventory_ui.refresh_inventory()
+    assert inventory_ui.tree.ops == []
+
+def test_refresh_keeps_to_the_loaded_range(inventory_ui):
+    inventory = inventory_ui.inventory
+    ids = sorted(_add(inventory, f"item-{i}") for i in range(8))
+    inventory_ui.refresh_inventory()
+    inventory_ui.refresh_inventory()
+    assert inventory_ui.tree.order == ids[:5]
+    # 불러오지 않은 범위의 항목은 스크롤할 때 불러옵니다.
+    inventory_ui.load_next_page()
+    assert inventory_ui.tree.order == ids
+
+@pytest.fixture
+def mailbox_ui(monkeypatch):
+    monkeypatch.setattr(interface, "MAIL_PAGE_SIZE", 3)
+    ui = MailboxUI.__new__(MailboxUI)
+    ui.mailbox, ui.user, ui.tree, ui.on_change = Mailbox(), FakeUser(1), FakeTree(), None
+    ui.mail_map, ui.oldest_key, ui.has_more_mails, ui.page_load_pending = {}, None, True, False
+    return ui
+
+def test_mailbox_refresh_applies_only_changes(mailbox_ui):
+    mailbox = mailbox_ui.mailbox
+    for i in range(2):
+        mailbox.send_mail("lee", 2, 1, f"메일 {i}")
+    mailbox_ui.load_next_page()
+    first, second = mailbox_ui.tree.order[1], mailbox_ui.tree.order[0]
+    mailbox_ui.tree.ops.clear()
+
+    mailbox.mark_read(int(first))
+    mailbox.send_mail("lee", 2, 1, "새 메일")
+    mailbox_ui.refresh_mailbox()
+    new = max(mailbox_ui.tree.order, key=int)
+    assert mailbox_ui.tree.order == [new, second, first]
+    assert sorted(mailbox_ui.tree.ops) == [("insert", new), ("item", first)]
+    assert mailbox_ui.tree.tags[first] == () and mailbox_ui.tree.tags[new] == ("unread",)
+
+    mailbox_ui.tree.ops.clear()
+    mailbox_ui.refresh_mailbox()
+    assert mailbox_ui.tree.ops == []
@@ -0,0 +1,87 @@
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+import http_client
+import weather
+from cache import TTLCache
+
+def _forecast(temperature="21", pty="0"):
+    items = [{"category": "T1H", "fcstValue": temperature}, {"category": "PTY", "fcstValue": pty},
+             {"category": "REH", "fcstValue": "60"}]
+    return {"response": {"header": {"resultCode": "00", "resultMsg": "NORMAL_SERVICE"}, "body": {"items": {"item": items}}}}
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+    def raise_for_status(self):
+        pass
+    def json(self):
+        return self.data
+
+class FakeClient:
+    """격자 좌표를 기록하고 초단기예보 응답을 돌려주는 HTTP 클라이언트입니다."""
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.delay = 0
+        self.fail = False
+
+    def get(self, url, params=None, headers=None, timeout=None, deadline=None):
+        with self.lock:
+            self.calls.append((params["nx"], params["ny"]))
+        time.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("연결 실패")
+        return FakeResponse(_forecast(pty="1" if params["nx"] == "1" else "0"))
+
+@pytest.fixture
+def client(monkeypatch):
+    client = FakeClient()
+    monkeypatch.setattr(http_client, "get_client", lambda: client)
+    monkeypatch.setattr(weather, "KMA_API_KEY", "test")
+    monkeypatch.setattr(weather, "weather_cache", TTLCache(ttl=3600))
+    return client
+
+def test_missing_api_key_is_reported(monkeypatch):
+    monkeypatch.setattr(weather, "KMA_API_KEY", "여기에 api key가 필요")
+    assert "error" in weather.get_grid_weather(60, 127)
+
+def test_forecast_is_parsed_and_cached_per_grid(client):
+    assert weather.get_grid_weather(1, 1) == {"온도": "21", "강수형태": "비", "습도": "60", "is_raining": True}
+    assert weather.get_grid_weather(60, 127)["is_raining"] is False
+    weather.get_grid_weather(1, 1)
+    assert client.calls == [("1", "1"), ("60", "127")]
+
+def test_cached_result_is_a_copy(client):
+    weather.get_grid_weather(60, 127)["온도"] = "99"
+    assert weather.get_grid_weather(60, 127)["온도"] == "21"
+
+def test_errors_are_not_cached(client):
+    client.fail = True
+    assert "error" in weather.get_grid_weather(60, 127)
+    client.fail = False
+    assert weather.get_grid_weather(60, 127)["온도"] == "21"
+    assert len(client.calls) == 2
+
+def test_entries_expire_at_the_next_forecast_hour():
+    assert weather._next_forecast_time(datetime(2024, 10, 17, 14, 35, 12)) == datetime(2024, 10, 17, 15, 0)
+    assert weather._next_forecast_time(datetime(2024, 12, 31, 23, 0)) == datetime(2025, 1, 1, 0, 0)
+
+def test_concurrent_misses_share_one_request(client):
+    client.delay = 0.2
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(weather.get_grid_weather(60, 127))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert len(results) == 5 and all(result["온도"] == "21" for result in results)
+    assert client.calls == [("60", "127")]
+
+def test_regions_on_the_same_grid_share_a_request(client):
+    assert "error" in weather.get_region_weather("없는 지역")
+    assert weather.get_region_weather("서울 종로구") == weather.get_region_weather("서울 중구")
+    assert len(client.calls) == 1